@@ -0,0 +1,154 @@
+import argparse
+import random
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+import requests
+
+from src.converters.html_to_pdf_converter import HTMLToPDFConverter, BROWSER_HEADERS
+from src.utils.asset_fetcher import AssetFetcher
+
+
+class AssetServer:
+    """Local stand-in for an asset host: /img/N.png, /mirror/N.png (same bytes) and 404s."""
+
+    def __init__(self, assets: int = 40, asset_size: int = 50_000, delay: float = 0.05):
+        self.assets = assets
+        self.asset_size = asset_size
+        self.delay = delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def content(self, index: int) -> bytes:
+        return random.Random(index).randbytes(self.asset_size)
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server.delay)
+                parts = self.path.strip('/').split('/')
+                if len(parts) == 2 and parts[0] in ('img', 'mirror') and parts[1].endswith('.png'):
+                    index = int(parts[1][:-4])
+                    if index < server.assets:
+                        return self._send(200, server.content(index), 'image/png')
+                self._send(404, b"not found", 'text/plain')
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def write_pages(page_dir: Path, base_url: str, pages: int, images_per_page: int, assets: int) -> list:
+    """Write HTML pages that share images (some through a mirror URL, some broken)."""
+    rng = random.Random(0)
+    paths = []
+    for index in range(pages):
+        images = []
+        for _ in range(images_per_page):
+            asset = rng.randrange(assets)
+            folder = 'mirror' if rng.random() < 0.2 else 'img'
+            images.append(f"<img src='{base_url}/{folder}/{asset}.png'>")
+        images.append(f"<img src='{base_url}/img/{assets + index % 3}.png'>")
+        path = page_dir / f"page-{index}.html"
+        path.write_text(f"<html><head><title>{index}</title></head><body>{''.join(images)}</body></html>", encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def legacy_process(converter: HTMLToPDFConverter, html_path: Path, resource_dir: Path) -> None:
+    """Original behaviour: one sequential requests.get per image reference."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_path.read_text(encoding='utf-8'), 'html.parser')
+    for img in soup.find_all('img'):
+        url = img['src']
+        try:
+            response = requests.get(url, headers=BROWSER_HEADERS, timeout=10)
+            if response.status_code == 200:
+                (resource_dir / converter._get_safe_filename(url)).write_bytes(response.content)
+        except Exception as e:
+            print(f"Error downloading {url}: {e}")
+
+
+def run_fetcher(converter: HTMLToPDFConverter, paths: list, resource_dir: Path, label: str, server: AssetServer) -> None:
+    """Prefetch the batch and process every page, as convert_batch does before calling wkhtmltopdf."""
+    converter.asset_fetcher.reset_stats()
+    server.requests = 0
+    start = time.perf_counter()
+    converter.prefetch_resources(paths)
+    for path in paths:
+        converter._process_html(path.read_text(encoding='utf-8'), resource_dir)
+    seconds = time.perf_counter() - start
+    print(f"\n{label}: {seconds:.2f} s, {server.requests} HTTP requests")
+    converter.asset_fetcher.print_report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the asset fetcher against a local asset server")
+    parser.add_argument('--pages', type=int, default=30)
+    parser.add_argument('--images-per-page', type=int, default=10)
+    parser.add_argument('--assets', type=int, default=40)
+    parser.add_argument('--asset-size', type=int, default=50_000)
+    parser.add_argument('--delay', type=float, default=0.05, help="server latency per request in seconds")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    asset_server = AssetServer(args.assets, args.asset_size, args.delay)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), asset_server.make_handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            page_dir = tmp_dir / 'pages'
+            resource_dir = tmp_dir / 'resources'
+            page_dir.mkdir()
+            resource_dir.mkdir()
+            paths = write_pages(page_dir, base_url, args.pages, args.images_per_page, args.assets)
+            references = args.pages * (args.images_per_page + 1)
+            print(f"{args.pages} pages, {references} image references, {args.assets} distinct assets")
+
+            converter = HTMLToPDFConverter()
+            asset_server.requests = 0
+            start = time.perf_counter()
+            for path in paths:
+                legacy_process(converter, path, resource_dir)
+            print(f"\nLegacy (sequential requests.get): {time.perf_counter() - start:.2f} s, "
+                  f"{asset_server.requests} HTTP requests")
+
+            fetcher = AssetFetcher(tmp_dir / 'asset_cache', max_workers=args.workers, headers=BROWSER_HEADERS)
+            converter = HTMLToPDFConverter(asset_fetcher=fetcher)
+            run_fetcher(converter, paths, resource_dir, "Asset fetcher, cold cache", asset_server)
+            run_fetcher(converter, paths, resource_dir, "Asset fetcher, warm cache", asset_server)
+            print(f"\nCached blobs: {fetcher.blobs.total_size() / 1024:.0f} KiB "
+                  f"(mirror URLs share the blobs of the originals)")
+
+            fetcher.max_cache_bytes = fetcher.blobs.total_size() // 2
+            fetcher.evict()
+            print(f"After eviction to {fetcher.max_cache_bytes / 1024:.0f} KiB: "
+                  f"{fetcher.blobs.total_size() / 1024:.0f} KiB")
+            run_fetcher(converter, paths, resource_dir, "Asset fetcher, after eviction", asset_server)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
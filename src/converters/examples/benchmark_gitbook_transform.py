@@ -0,0 +1,71 @@
+import sys
+import time
+from pathlib import Path
+
+from src.utils.file_utils import read_file_content
+from src.utils.gitbook_transform import GitBookTransformer
+from src.utils.regex_utils import (
+    convert_relative_links,
+    convert_html_table,
+    convert_gitbook_hints,
+    convert_images,
+    clean_markdown,
+    HTML_TABLE_PATTERN
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+DOCS_DIR = PROJECT_ROOT / 'data' / 'raw' / 'vngcloud_docs'
+
+
+def multipass_transform(md_text: str, md_file_path: Path) -> str:
+    """Previous GitBookMarkdownConverter._process_markdown (one full-text pass per construct), for comparison."""
+    md_text = convert_images(md_text)
+    md_text = HTML_TABLE_PATTERN.sub(lambda m: convert_html_table(m.group(0)), md_text)
+    md_text = convert_gitbook_hints(md_text)
+    md_text = convert_relative_links(md_text, str(md_file_path))
+    return clean_markdown(md_text)
+
+
+def run(name: str, transform, documents: list) -> list:
+    """Transform every document and print files/sec and the slowest file."""
+    outputs = []
+    worst = (0.0, None)
+    start = time.perf_counter()
+    for path, text in documents:
+        file_start = time.perf_counter()
+        outputs.append(transform(text, path))
+        worst = max(worst, (time.perf_counter() - file_start, path))
+    seconds = time.perf_counter() - start
+    worst_name = worst[1].name if worst[1] else '-'
+    print(f"{name:12} {len(documents) / seconds:12.1f} {seconds:10.2f} {worst[0] * 1000:12.1f}  {worst_name}")
+    return outputs
+
+
+def main():
+    # Optional argument: directory of GitBook markdown files
+    docs_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DOCS_DIR
+    documents = [(path, read_file_content(path)) for path in sorted(docs_dir.rglob('*.md'))]
+    if not documents:
+        print(f"❌ No markdown files found in {docs_dir}")
+        return
+
+    # Unclosed constructs make the lazy DOTALL patterns rescan the rest of the document
+    stress = ("<table><mark>{% hint style=\"info\" %}\n" + "text " * 20 + "\n") * 200
+    print(f"{len(documents)} files from {docs_dir}")
+    print(f"{'engine':12} {'files/sec':>12} {'total s':>10} {'worst ms':>12}  worst file")
+    expected = run("multipass", multipass_transform, documents)
+    outputs = run("single-pass", GitBookTransformer().transform, documents)
+
+    mismatches = [path for (path, _), output, reference in zip(documents, outputs, expected) if output != reference]
+    if mismatches:
+        print(f"❌ {len(mismatches)} files differ, e.g. {mismatches[0]}")
+    else:
+        print("✅ Output is byte-identical for all files")
+
+    print("\nUnclosed-tag stress document")
+    run("multipass", multipass_transform, [(DOCS_DIR / 'stress.md', stress)])
+    run("single-pass", GitBookTransformer().transform, [(DOCS_DIR / 'stress.md', stress)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.utils.file_utils import read_file_content
+from src.utils.regex_utils import convert_html_elements, HTML_TABLE_PATTERN
+from src.utils.table_utils import html_table_to_markdown
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+DOCS_DIR = PROJECT_ROOT / 'data' / 'raw' / 'vngcloud_docs'
+LARGEST_TABLES = 10
+ROUNDS = 5
+
+
+def legacy_convert_html_table(html: str) -> str:
+    """Previous regex_utils.convert_html_table (re-parses every cell with BeautifulSoup), for comparison."""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table')
+    if not table:
+        return ""
+    headers = [th.text.strip() for th in table.find_all('th')]
+    if not headers:
+        return ""
+    header_row = "| " + " | ".join(headers) + " |"
+    separator = "| " + " | ".join(["---"] * len(headers)) + " |"
+    rows = []
+    for tr in table.find_all('tr')[1:]:
+        row_data = [convert_html_elements(str(td)) for td in tr.find_all('td')]
+        rows.append("| " + " | ".join(row_data) + " |")
+    return "\n".join([header_row, separator] + rows)
+
+
+def run(name: str, convert, tables: list) -> None:
+    """Convert every table ROUNDS times and print throughput."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for table in tables:
+            convert(table)
+    seconds = time.perf_counter() - start
+    input_bytes = sum(len(table) for table in tables) * ROUNDS
+    print(f"{name:10} {len(tables) * ROUNDS / seconds:12.1f} {input_bytes / seconds / 1024 / 1024:10.2f} "
+          f"{seconds / (len(tables) * ROUNDS) * 1000:10.2f}")
+
+
+def main():
+    # Optional argument: directory of GitBook markdown files
+    docs_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DOCS_DIR
+    tables = [
+        match.group(0)
+        for path in sorted(docs_dir.rglob('*.md'))
+        for match in HTML_TABLE_PATTERN.finditer(read_file_content(path))
+    ]
+    if not tables:
+        print(f"❌ No HTML tables found in {docs_dir}")
+        return
+
+    largest = sorted(tables, key=len, reverse=True)[:LARGEST_TABLES]
+    for label, selection in [(f"{len(largest)} largest tables", largest), (f"all {len(tables)} tables", tables)]:
+        print(f"\n{label} ({sum(len(table) for table in selection):,d} bytes), {ROUNDS} rounds")
+        print(f"{'engine':10} {'tables/sec':>12} {'MB/sec':>10} {'ms/table':>10}")
+        run("legacy", legacy_convert_html_table, selection)
+        run("lxml", html_table_to_markdown, selection)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from src.converters.gitbook_markdown_converter import GitBookMarkdownConverter
 
@@ -9,11 +10,8 @@ def main():
     input_folder = Path("./data/vngcloud_docs")
     output_folder = Path("./preprocessed_docs/vngcloud_docs")
     
-    # Get all markdown files recursively
-    markdown_files = list(input_folder.rglob("*.md"))
-    
-    # Convert all files
-    converted_files = converter.convert_batch(markdown_files, output_folder)
+    # Convert new and changed files, mirroring the source tree (one worker process per core)
+    converted_files = converter.convert_tree(input_folder, output_folder, workers=os.cpu_count())
     
     # Print summary
     print(f"🎉 Markdown conversion completed for {len(converted_files)} files.")
@@ -1,8 +1,15 @@
+import re
 from pathlib import Path
-from typing import Union, List
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
-from base_converter import BaseConverter
-from src.utils.file_utils import ensure_dir, get_output_path
+from .base_converter import BaseConverter
+from ..utils.file_utils import ensure_dir, get_output_path
+
+# Markdown heading line and the fence of a code block (headings inside code blocks are not sections)
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+# GitBook headings carry <a> anchors
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
 
 
 class GitBookConverter(BaseConverter):
@@ -12,21 +19,146 @@ class GitBookConverter(BaseConverter):
         self.summary_file = "SUMMARY.md"
         self.config_file = "book.json"
     
-    def _parse_summary(self, summary_content: str) -> List[dict]:
-        """Parse SUMMARY.md to get the structure of the GitBook."""
-        pages = []
-        for line in summary_content.split('\n'):
-            if line.strip().startswith('*') or line.strip().startswith('-'):
+    def _iter_summary(self, lines: Iterable[str]) -> Iterator[dict]:
+        """
+        Walk the lines of SUMMARY.md lazily and yield its pages in reading order.
+        
+        The indentation of the list items gives the nesting, so every page carries the titles
+        of its parent pages (and of the "## Part" heading it is listed under).
+        
+        Args:
+            lines: Lines of SUMMARY.md
+            
+        Yields:
+            dict: Page with title, path and title_path (titles from the root to the page)
+        """
+        parents: List[Tuple[int, str]] = []  # (indentation, title) of the enclosing pages
+        part: List[str] = []
+        for line in lines:
+            stripped = line.strip()
+            heading = HEADING_PATTERN.match(stripped)
+            if heading and len(heading.group(1)) > 1:
+                part = [heading.group(2)]
+                parents = []
+                continue
+            if stripped.startswith('*') or stripped.startswith('-'):
                 # Extract markdown link format: [Title](path/to/file.md)
-                parts = line.strip()[1:].strip().split('](')
+                parts = stripped[1:].strip().split('](')
                 if len(parts) == 2:
                     title = parts[0][1:]  # Remove leading [
                     path = parts[1][:-1]  # Remove trailing )
-                    pages.append({
+                    indent = len(line) - len(line.lstrip())
+                    while parents and parents[-1][0] >= indent:
+                        parents.pop()
+                    parents.append((indent, title))
+                    yield {
                         'title': title,
-                        'path': path
-                    })
-        return pages
+                        'path': path,
+                        'title_path': part + [parent_title for _, parent_title in parents]
+                    }
+    
+    def _parse_summary(self, summary_content: str) -> List[dict]:
+        """Parse SUMMARY.md to get the structure of the GitBook."""
+        return list(self._iter_summary(summary_content.split('\n')))
+    
+    def _summary_path(self, input_path: Path) -> Path:
+        """Validate a GitBook directory and return the path of its SUMMARY.md."""
+        if not input_path.is_dir():
+            raise ValueError("Input path must be a GitBook directory")
+        summary_path = input_path / self.summary_file
+        if not summary_path.exists():
+            raise ValueError(f"Could not find {self.summary_file} in GitBook directory")
+        return summary_path
+    
+    def _iter_page_contents(self, input_path: Path, summary_path: Path) -> Iterator[Tuple[dict, Path, str]]:
+        """Yield the pages listed in SUMMARY.md with their content, reading one page at a time."""
+        with open(summary_path, 'r', encoding='utf-8') as summary:
+            for page in self._iter_summary(summary):
+                page_path = input_path / page['path']
+                if page_path.exists():
+                    yield page, page_path, page_path.read_text(encoding='utf-8')
+    
+    def _iter_sections(self, content: str) -> Iterator[Tuple[List[str], str]]:
+        """
+        Split the content of a page at its headings.
+        
+        Args:
+            content: Markdown content of a page
+            
+        Yields:
+            Tuple[List[str], str]: Headings enclosing the section (empty for the text before the first
+            heading) and the section text including its heading line
+        """
+        headings: List[Tuple[int, str]] = []  # (level, title) of the enclosing headings
+        section_headings: List[str] = []
+        lines: List[str] = []
+        in_code = False
+        for line in content.split('\n'):
+            if FENCE_PATTERN.match(line):
+                in_code = not in_code
+            heading = None if in_code else HEADING_PATTERN.match(line)
+            if heading:
+                yield section_headings, '\n'.join(lines)
+                level = len(heading.group(1))
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, HTML_TAG_PATTERN.sub('', heading.group(2)).strip()))
+                section_headings = [title for _, title in headings]
+                lines = []
+            lines.append(line)
+        yield section_headings, '\n'.join(lines)
+    
+    def iter_records(
+        self,
+        input_path: Union[str, Path],
+        split_sections: bool = True,
+        combined_output_path: Union[str, Path] = None
+    ) -> Iterator[Dict[str, object]]:
+        """
+        Stream a GitBook directory as one record per page section, for chunking and embedding.
+        
+        SUMMARY.md is walked lazily and pages are read one at a time, so the combined book is
+        never built in memory.
+        
+        Args:
+            input_path: Path to the GitBook directory
+            split_sections: Whether to split pages at their headings (one record per page if False)
+            combined_output_path: Optional path to write the combined markdown to incrementally
+                                  (same content as convert_to_markdown)
+            
+        Yields:
+            Dict[str, object]: Record with title_path (page titles from the root followed by the section
+            headings), source (path of the page), page_title, section_index and text
+        """
+        input_path = Path(input_path)
+        summary_path = self._summary_path(input_path)
+        combined: Optional[TextIO] = None
+        if combined_output_path:
+            combined = open(combined_output_path, 'w', encoding='utf-8')
+        try:
+            pages = self._iter_page_contents(input_path, summary_path)
+            for page_index, (page, page_path, content) in enumerate(pages):
+                if combined is not None:
+                    # Pages are joined with a blank line, as in convert_to_markdown
+                    separator = '\n' if page_index else ''
+                    combined.write(f"{separator}# {page['title']}\n\n{content}\n\n")
+                sections = self._iter_sections(content) if split_sections else [([], content)]
+                for section_index, (headings, text) in enumerate(sections):
+                    if not text.strip():
+                        continue
+                    if headings and headings[0] == page['title']:
+                        # The page heading repeats the title from SUMMARY.md
+                        headings = headings[1:]
+                    yield {
+                        'title_path': page['title_path'] + headings,
+                        'source': str(page_path),
+                        'page_title': page['title'],
+                        'section_index': section_index,
+                        'text': text
+                    }
+        finally:
+            if combined is not None:
+                combined.close()
     
     def convert_to_markdown(self, input_path: Union[str, Path], output_path: Union[str, Path] = None) -> str:
         """
@@ -37,33 +169,19 @@ class GitBookConverter(BaseConverter):
             output_path: Optional path to save the combined markdown output
         """
         input_path = Path(input_path)
-        if not input_path.is_dir():
-            raise ValueError("Input path must be a GitBook directory")
-        
-        # Read SUMMARY.md to get the structure
-        summary_path = input_path / self.summary_file
-        if not summary_path.exists():
-            raise ValueError(f"Could not find {self.summary_file} in GitBook directory")
-        
-        summary_content = summary_path.read_text(encoding='utf-8')
-        pages = self._parse_summary(summary_content)
-        
-        # Combine all markdown files
-        combined_content = []
-        for page in pages:
-            page_path = input_path / page['path']
-            if page_path.exists():
-                content = page_path.read_text(encoding='utf-8')
-                combined_content.append(f"# {page['title']}\n\n{content}\n\n")
-        
-        markdown_content = '\n'.join(combined_content)
         
         if output_path:
-            output_path = Path(output_path)
-            output_path.write_text(markdown_content, encoding='utf-8')
+            # Stream the pages to the output file instead of combining them in memory
+            for _ in self.iter_records(input_path, split_sections=False, combined_output_path=output_path):
+                pass
             return ""
         
-        return markdown_content
+        # Combine all markdown files
+        combined_content = [
+            f"# {page['title']}\n\n{content}\n\n"
+            for page, _, content in self._iter_page_contents(input_path, self._summary_path(input_path))
+        ]
+        return '\n'.join(combined_content)
     
     def convert_batch(self, input_paths: List[Union[str, Path]], output_dir: Union[str, Path]) -> List[Path]:
         """
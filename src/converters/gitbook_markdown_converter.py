@@ -1,126 +1,58 @@
 import base64
-import re
+import json
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Union, List
-
-import requests
-from bs4 import BeautifulSoup
+from typing import Any, Dict, List, Tuple, Union
 
 from .base_converter import BaseConverter
+from ..utils.asset_fetcher import AssetFetcher
+from ..utils.cache_utils import atomic_write_bytes, build_cache_key, compute_file_hash
 from ..utils.file_utils import ensure_dir, get_output_path, read_file_content, write_file_content
-from ..utils.regex_utils import (
-    convert_relative_links,
-    convert_html_table,
-    convert_gitbook_hints,
-    convert_images,
-    clean_markdown,
-    HTML_TABLE_PATTERN
-)
+from ..utils.gitbook_transform import GitBookTransformer
+from ..utils.link_index import LinkResolutionIndex
+from ..utils.table_utils import html_table_to_markdown
 
 
 class GitBookMarkdownConverter(BaseConverter):
     """Converter for GitBook markdown to pure Markdown format."""
     
-    def __init__(self, github_assets_base_url: str = None):
+    # Bump when the conversion output changes, so incremental runs reconvert everything
+    CONVERTER_VERSION = 2
+    
+    def __init__(self, github_assets_base_url: str = None, asset_fetcher: AssetFetcher = None):
         """
         Initialize the converter.
         
         Args:
             github_assets_base_url: Base URL for GitHub assets. If None, will use default VNG docs URL.
+            asset_fetcher: Optional shared AssetFetcher for downloading images. If None, one is created on first use.
         """
         self.github_assets_base_url = github_assets_base_url or "https://github.com/vngcloud/docs/blob/main/Vietnamese/.gitbook/assets"
+        self.transformer = GitBookTransformer(self.github_assets_base_url)
+        self.asset_fetcher = asset_fetcher
 
     def _download_and_encode_image(self, url: str) -> str:
-        """Download an image from a URL and encode it as base64."""
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            img_base64 = base64.b64encode(response.content).decode("utf-8")
-            return f"![Image](data:image/png;base64,{img_base64})"
+        """Download an image from a URL (through the asset cache) and encode it as base64."""
+        if self.asset_fetcher is None:
+            self.asset_fetcher = AssetFetcher()
+        asset = self.asset_fetcher.fetch(url)
+        if asset is not None:
+            content_type = asset["content_type"] or ""
+            mime_type = content_type.split(';', 1)[0] if content_type.startswith('image/') else 'image/png'
+            img_base64 = base64.b64encode(asset["data"]).decode("utf-8")
+            return f"![Image](data:{mime_type};base64,{img_base64})"
         return f"![Failed to load]({url})"
 
-    def _process_html_tag(self, tag) -> str:
-        """Convert individual HTML elements to Markdown format."""
-        # Process strong tags
-        for strong in tag.find_all("strong"):
-            strong.insert_before(f"**{strong.text.strip()}**")
-            strong.decompose()
-
-        # Process code tags
-        for code in tag.find_all("code"):
-            code.insert_before(f"{code.text.strip()}")
-            code.decompose()
-
-        # Process anchor tags
-        for a in tag.find_all("a"):
-            link_text = a.text.strip()
-            link_href = a.get("href", "#")
-            a.insert_before(f"[{link_text}]({link_href})")
-            a.decompose()
-
-        return tag.get_text(separator=" ").strip()
-
-    def _convert_html_to_markdown(self, tag) -> str:
-        """Convert an HTML fragment to Markdown while preserving lists, bold text, and links."""
-        markdown_text = []
-        
-        # Process unordered lists
-        for ul in tag.find_all("ul"):
-            for li in ul.find_all("li"):
-                text = self._process_html_tag(li)
-                markdown_text.append(f"- {text}")
-            ul.decompose()
-
-        # Process remaining text
-        remaining_text = self._process_html_tag(tag)
-        if remaining_text:
-            markdown_text.append(remaining_text)
-
-        return " <br> ".join(markdown_text).strip()
-
     def _convert_html_table_to_markdown(self, html: str) -> str:
         """Convert an HTML table to Markdown format."""
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table")
-        if not table:
-            return ""
-
-        # Extract headers
-        headers = [th.text.strip() for th in table.find_all("th")]
-        if not headers:
-            return ""
-
-        # Create table structure
-        header_row = "| " + " | ".join(headers) + " |"
-        separator = "| " + " | ".join(["---"] * len(headers)) + " |"
-
-        # Extract and convert rows
-        rows = []
-        for tr in table.find_all("tr")[1:]:
-            row_data = [self._convert_html_to_markdown(td) for td in tr.find_all("td")]
-            rows.append("| " + " | ".join(row_data) + " |")
-
-        return "\n".join([header_row, separator] + rows)
+        return html_table_to_markdown(html)
 
     def _process_markdown(self, md_text: str, md_file_path: Union[str, Path]) -> str:
         """Convert GitBook Markdown with HTML elements to pure Markdown."""
-        # Convert images
-        md_text = convert_images(md_text, self.github_assets_base_url)
-        
-        # Convert HTML tables
-        md_text = re.sub(HTML_TABLE_PATTERN, 
-                        lambda m: convert_html_table(m.group(0)), 
-                        md_text, flags=re.DOTALL)
-        
-        # Convert GitBook hints
-        md_text = convert_gitbook_hints(md_text)
-        
-        # Convert relative links
-        md_text = convert_relative_links(md_text, str(md_file_path))
-        
-        # Clean up markdown
-        md_text = clean_markdown(md_text)
-        
-        return md_text
+        # Images, tables, hints, relative links and cleanup are rewritten in one scan
+        return self.transformer.transform(md_text, md_file_path)
 
     def convert_to_markdown(self, input_path: Union[str, Path], output_path: Union[str, Path] = None) -> str:
         """
@@ -150,25 +82,232 @@ class GitBookMarkdownConverter(BaseConverter):
             
         return converted_content
 
-    def convert_batch(self, input_paths: List[Union[str, Path]], output_dir: Union[str, Path]) -> List[Path]:
+    def _convert_batch_job(self, job: Tuple[Path, Path]) -> Dict[str, Any]:
+        """
+        Convert one file of a batch, capturing errors so a bad file does not abort the batch.
+        
+        Args:
+            job: Input path and output path
+            
+        Returns:
+            Dict[str, Any]: Job result with status, timing and error message
+        """
+        input_path, output_path = job
+        start = time.perf_counter()
+        error = None
+        try:
+            self.convert_to_markdown(input_path, output_path)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        
+        link_index = self.transformer.link_index
+        return {
+            "source": str(input_path),
+            "output": None if error else str(output_path),
+            "status": "failed" if error else "done",
+            "seconds": round(time.perf_counter() - start, 4),
+            "error": error,
+            "links": link_index.pop_links(input_path) if link_index is not None else [],
+        }
+
+    def _run_batch_jobs(self, jobs: List[Tuple[Path, Path]], workers: int = 1, chunksize: int = None) -> List[Dict[str, Any]]:
+        """
+        Convert (input, output) jobs sequentially or in a process pool, keeping the job order.
+        
+        Args:
+            jobs: Input and output paths of every file
+            workers: Number of worker processes (1 converts sequentially in this process)
+            chunksize: Number of files per task sent to a worker
+                       (default: spread the files over about 4 chunks per worker)
+            
+        Returns:
+            List[Dict[str, Any]]: Job results in job order
+        """
+        if workers <= 1 or len(jobs) < 2:
+            return [self._convert_batch_job(job) for job in jobs]
+        
+        chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._convert_batch_job, jobs, chunksize=chunksize))
+
+    def convert_batch(
+        self,
+        input_paths: List[Union[str, Path]],
+        output_dir: Union[str, Path],
+        workers: int = 1,
+        chunksize: int = None,
+        base_dir: Union[str, Path] = None
+    ) -> List[Path]:
         """
         Convert multiple GitBook markdown files to pure markdown.
         
+        With several workers the files are converted in a process pool and submitted
+        in chunks, so the per-task overhead is paid once per chunk instead of per file.
+        Results keep the input order either way, and a file that fails to convert is
+        reported instead of aborting the batch. The per-file report of the last batch
+        is kept in `self.last_report`.
+        
         Args:
             input_paths: List of paths to GitBook markdown files
             output_dir: Directory to save the converted files
+            workers: Number of worker processes (1 converts sequentially in this process)
+            chunksize: Number of files per task sent to a worker
+                       (default: spread the files over about 4 chunks per worker)
+            base_dir: Optional source root whose directory structure is mirrored in output_dir
+                      (by default all outputs are written directly into output_dir)
             
         Returns:
-            List[Path]: List of paths to the converted files
+            List[Path]: List of paths to the converted files, in input order
         """
         output_dir = ensure_dir(output_dir)
-        converted_files = []
-        
-        for input_path in input_paths:
-            input_path = Path(input_path)
-            if input_path.suffix.lower() == '.md':
-                output_path = get_output_path(input_path, output_dir)
-                self.convert_to_markdown(input_path, output_path)
-                converted_files.append(output_path)
-                
-        return converted_files 
\ No newline at end of file
+        jobs = [
+            (Path(input_path), get_output_path(input_path, output_dir, base_dir=base_dir))
+            for input_path in input_paths
+            if Path(input_path).suffix.lower() == '.md'
+        ]
+        
+        start = time.perf_counter()
+        self.last_report = self._run_batch_jobs(jobs, workers, chunksize)
+        elapsed = time.perf_counter() - start
+        
+        failed = [record for record in self.last_report if record["status"] == "failed"]
+        for record in failed:
+            print(f"❌ Failed to convert {record['source']}: {record['error']}")
+        if jobs:
+            print(f"📊 Converted {len(jobs) - len(failed)} of {len(jobs)} files in {elapsed:.2f}s "
+                  f"({len(jobs) / max(elapsed, 1e-9):.1f} files/sec, {max(workers, 1)} worker(s))")
+        
+        return [Path(record["output"]) for record in self.last_report if record["status"] == "done"]
+
+    def _manifest_key(self) -> str:
+        """Identify the converter version and options that produced the outputs of a manifest."""
+        return build_cache_key(self.CONVERTER_VERSION, self.github_assets_base_url)
+
+    @staticmethod
+    def _load_manifest(manifest_path: Path) -> Dict[str, Any]:
+        """Load a conversion manifest, starting over if it is missing or unreadable."""
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            if isinstance(manifest.get("files"), dict):
+                return manifest
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Ignoring unreadable manifest {manifest_path}: {e}")
+        return {"converter": None, "files": {}}
+
+    @staticmethod
+    def _remove_output(output_path: Path, output_dir: Path) -> None:
+        """Delete an output file and the directories it leaves empty inside output_dir."""
+        output_path.unlink(missing_ok=True)
+        parent = output_path.parent
+        while parent != output_dir and output_dir in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    def convert_tree(
+        self,
+        input_dir: Union[str, Path],
+        output_dir: Union[str, Path],
+        workers: int = 1,
+        manifest_path: Union[str, Path] = None,
+        force: bool = False
+    ) -> List[Path]:
+        """
+        Incrementally convert a GitBook source tree, mirroring its structure in output_dir.
+        
+        A manifest records the source hash, output hash and converter version of every
+        converted file. Only new or changed sources (and sources whose output is missing
+        or was modified) are converted, the outputs of deleted sources are removed, and a
+        new CONVERTER_VERSION or different converter options reconvert everything. Source
+        hashes are only recomputed when a file's size or modification time changed.
+        
+        Relative links are resolved with a LinkResolutionIndex of the tree; the dangling
+        links of all current sources are kept in `self.last_dangling_links`.
+        
+        Args:
+            input_dir: Root directory of the GitBook markdown sources
+            output_dir: Directory to save the converted files
+            workers: Number of worker processes for the files that need converting
+            manifest_path: Optional path of the manifest (default: .gitbook_manifest.json in output_dir)
+            force: Whether to reconvert every file regardless of the manifest
+            
+        Returns:
+            List[Path]: Paths of the converted files of all current sources, in source order
+        """
+        input_dir = Path(input_dir)
+        if not input_dir.is_dir():
+            raise NotADirectoryError(f"Input directory not found: {input_dir}")
+        output_dir = ensure_dir(output_dir)
+        manifest_path = Path(manifest_path) if manifest_path else output_dir / '.gitbook_manifest.json'
+        
+        manifest = self._load_manifest(manifest_path)
+        converter_key = self._manifest_key()
+        previous = manifest["files"] if manifest.get("converter") == converter_key and not force else {}
+        
+        start = time.perf_counter()
+        link_index = LinkResolutionIndex(input_dir, self.transformer.base_url, self.transformer.base_dir_pattern)
+        sources = sorted(input_dir.rglob('*.md'))
+        entries = {}
+        jobs = []
+        for source in sources:
+            relative = source.relative_to(input_dir).as_posix()
+            output_path = get_output_path(source, output_dir, base_dir=input_dir)
+            stat = source.stat()
+            entry = previous.get(relative)
+            if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+                source_hash = entry["source_hash"]
+            else:
+                source_hash = compute_file_hash(source)
+            
+            if (entry and entry["source_hash"] == source_hash and "links" in entry and output_path.exists()
+                    and compute_file_hash(output_path) == entry["output_hash"]):
+                entries[relative] = {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            else:
+                entries[relative] = {"source_hash": source_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                jobs.append((source, output_path))
+        
+        previous_index = self.transformer.link_index
+        self.transformer.link_index = link_index
+        try:
+            report = self._run_batch_jobs(jobs, workers)
+        finally:
+            self.transformer.link_index = previous_index
+        for record in report:
+            relative = Path(record["source"]).relative_to(input_dir).as_posix()
+            if record["status"] == "done":
+                entries[relative]["output_hash"] = compute_file_hash(record["output"])
+                entries[relative]["links"] = record["links"]
+            else:
+                # Failed files are retried on the next run
+                del entries[relative]
+                print(f"❌ Failed to convert {record['source']}: {record['error']}")
+        
+        current = {source.relative_to(input_dir).as_posix() for source in sources}
+        removed = [relative for relative in manifest["files"] if relative not in current]
+        for relative in removed:
+            self._remove_output(get_output_path(input_dir / relative, output_dir, base_dir=input_dir), output_dir)
+        
+        atomic_write_bytes(manifest_path, json.dumps(
+            {"converter": converter_key, "files": entries}, ensure_ascii=False, indent=1
+        ).encode('utf-8'))
+        self.last_report = report
+        self.last_dangling_links = link_index.dangling_links(
+            {relative: entry["links"] for relative, entry in entries.items()}
+        )
+        
+        failed = sum(1 for record in report if record["status"] == "failed")
+        print(f"📊 {len(sources)} sources: {len(jobs) - failed} converted, {len(sources) - len(jobs)} unchanged, "
+              f"{failed} failed, {len(removed)} removed in {time.perf_counter() - start:.2f}s")
+        if self.last_dangling_links:
+            problems = Counter(link["problem"] for link in self.last_dangling_links)
+            print(f"🔗 {len(self.last_dangling_links)} dangling links: "
+                  + ", ".join(f"{count} {problem}" for problem, count in problems.most_common()))
+        
+        return [
+            get_output_path(source, output_dir, base_dir=input_dir)
+            for source in sources if source.relative_to(input_dir).as_posix() in entries
+        ]
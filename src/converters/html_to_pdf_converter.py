@@ -1,26 +1,62 @@
+import base64
 import hashlib
 import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Union, List
-from urllib.parse import urljoin, urlparse
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
 
 import pdfkit
-import requests
 from bs4 import BeautifulSoup
 
 from .base_converter import BaseConverter
+from ..utils.asset_fetcher import AssetFetcher
+from ..utils.cache_utils import ContentCache, atomic_write_bytes, build_cache_key, compute_file_hash, compute_text_hash
+
+# Headers mimicking a browser request, sent with every resource download
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://github.com/'
+}
 
 
 class HTMLToPDFConverter(BaseConverter):
     """Converter for HTML to PDF conversion using pdfkit and wkhtmltopdf."""
     
-    def __init__(self, wkhtmltopdf_path: str = None):
+    # Bump when the HTML rewriting (default styles, resource handling) changes, to invalidate old renders
+    CACHE_VERSION = 2
+    
+    def __init__(
+        self,
+        wkhtmltopdf_path: str = None,
+        asset_fetcher: AssetFetcher = None,
+        cache_dir: Union[str, Path] = None,
+        use_cache: bool = True
+    ):
         """
         Initialize the converter.
         
         Args:
             wkhtmltopdf_path: Path to wkhtmltopdf executable. If None, will try to use system default.
+            asset_fetcher: Optional shared AssetFetcher for downloading resources. If None, one with
+                           browser headers is created.
+            cache_dir: Directory of the render cache. If None, uses .cache/pdf_render
+            use_cache: Whether to reuse previous renders of unchanged documents
         """
+        self.asset_fetcher = asset_fetcher or AssetFetcher(headers=BROWSER_HEADERS)
+        self.cache_dir = Path(cache_dir) if cache_dir else Path('.cache') / 'pdf_render'
+        # PDF streams are already deflated, so the blobs are stored uncompressed
+        self.cache = ContentCache(self.cache_dir, compress=False) if use_cache else None
+        self._cache_lock = threading.Lock()
+        self.reset_cache_stats()
         self.config = pdfkit.configuration(wkhtmltopdf=wkhtmltopdf_path) if wkhtmltopdf_path else None
         self.options = {
             'encoding': 'UTF-8',
@@ -46,6 +82,18 @@ class HTMLToPDFConverter(BaseConverter):
             url = url.replace('/tree/', '/raw/')
         return url
 
+    def _is_remote_url(self, url: str) -> bool:
+        """Check whether a resource reference is fetched over HTTP(S) (not a local path or data: URI)."""
+        return urlparse(url).scheme in ('http', 'https')
+
+    def _file_uri(self, url: str, base_dir: Union[str, Path]) -> str:
+        """Resolve a relative local resource path against a directory as an absolute file:// URI."""
+        parsed = urlparse(url)
+        # Leave data: URIs, file:// URIs and fragment-only references alone
+        if parsed.scheme or not parsed.path:
+            return url
+        return (Path(base_dir) / unquote(parsed.path)).resolve().as_uri()
+
     def _get_safe_filename(self, url: str) -> str:
         """Generate a safe filename from URL."""
         # Create a hash of the URL
@@ -60,37 +108,87 @@ class HTMLToPDFConverter(BaseConverter):
         return f"img_{url_hash}{ext}"
 
     def _download_resource(self, url: str, resource_dir: Path) -> str:
-        """Download a resource and return its local path."""
+        """Download a resource (through the asset cache) and return its local path."""
+        # Convert GitHub URL if needed
+        url = self._convert_github_url(url)
+        if not self._is_remote_url(url):
+            return url
+        asset = self.asset_fetcher.fetch(url)
+        if asset is None:
+            return url
         try:
-            # Convert GitHub URL if needed
-            url = self._convert_github_url(url)
-            
-            # Add headers to mimic browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Referer': 'https://github.com/'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                # Generate a safe filename
-                safe_filename = self._get_safe_filename(url)
-                local_path = resource_dir / safe_filename
-                
-                with open(local_path, 'wb') as f:
-                    f.write(response.content)
-                return str(local_path)
-            else:
-                print(f"Failed to download {url}: Status code {response.status_code}")
-        except Exception as e:
-            print(f"Error downloading {url}: {e}")
+            local_path = resource_dir / self._get_safe_filename(url)
+            with open(local_path, 'wb') as f:
+                f.write(asset["data"])
+            return str(local_path)
+        except OSError as e:
+            print(f"Error saving {url}: {e}")
         return url
 
+    def _resource_urls(self, soup: BeautifulSoup) -> List[str]:
+        """Collect the URLs of the stylesheets, scripts and images referenced by a page (local paths included)."""
+        urls = [link['href'] for link in soup.find_all('link', rel='stylesheet') if link.get('href')]
+        urls += [script['src'] for script in soup.find_all('script', src=True)]
+        urls += [img['src'] for img in soup.find_all('img') if img.get('src')]
+        return [self._convert_github_url(url) for url in urls]
+
+    def prefetch_resources(self, input_paths: List[Union[str, Path]]) -> int:
+        """
+        Download the resources of several HTML files concurrently before converting them.
+        
+        Args:
+            input_paths: List of paths to input HTML files
+            
+        Returns:
+            int: Number of resources available in the asset cache
+        """
+        urls = []
+        for input_path in input_paths:
+            input_path = Path(input_path)
+            if input_path.exists():
+                with open(input_path, 'r', encoding='utf-8') as f:
+                    urls.extend(self._resource_urls(BeautifulSoup(f.read(), 'html.parser')))
+        # Cached assets are read when the pages are processed (or not at all for unchanged pages)
+        return self.asset_fetcher.prefetch([url for url in dict.fromkeys(urls)
+                                            if self._is_remote_url(url) and self.asset_fetcher.cached_hash(url) is None])
+
+    def _inline_resource(self, url: str) -> str:
+        """Return a resource (through the asset cache) as a data URI, or its URL if it cannot be fetched."""
+        url = self._convert_github_url(url)
+        if not self._is_remote_url(url):
+            return url
+        asset = self.asset_fetcher.fetch(url)
+        if asset is None:
+            return url
+        content_type = (asset["content_type"] or 'application/octet-stream').split(';', 1)[0]
+        return f"data:{content_type};base64,{base64.b64encode(asset['data']).decode('ascii')}"
+
     def _process_html(self, html_content: str, resource_dir: Path) -> str:
         """Process HTML content to download and update resource references."""
         soup = BeautifulSoup(html_content, 'html.parser')
+        return str(self._rewrite_html(soup, resource_dir))
+
+    def _rewrite_html(self, soup: BeautifulSoup, resource_dir: Path = None, base_dir: Union[str, Path] = None) -> BeautifulSoup:
+        """
+        Add the default styles to a parsed HTML document and rewrite its resource references.
+        
+        Args:
+            soup: Parsed HTML document (modified in place)
+            resource_dir: Directory to download resources to. If None, resources are inlined as
+                          data URIs, so the document can be rendered without touching the disk
+            base_dir: Optional directory of the source document. Relative local resource paths are
+                      rewritten to file:// URIs resolved against it, so they still load when the
+                      processed HTML is written elsewhere
+        
+        Returns:
+            BeautifulSoup: The rewritten document
+        """
+        fetch = self._inline_resource if resource_dir is None else partial(self._download_resource, resource_dir=resource_dir)
+        
+        def localize(url: str) -> str:
+            if base_dir is not None and not self._is_remote_url(url):
+                return self._file_uri(url, base_dir)
+            return fetch(url)
         
         # Add default styles
         style_tag = soup.new_tag('style')
@@ -178,32 +276,219 @@ class HTMLToPDFConverter(BaseConverter):
                 }
             }
         '''
-        soup.head.append(style_tag)
+        (soup.head or soup).append(style_tag)
+        
+        # Download all resources of the page concurrently; the loops below read them from the cache
+        self.asset_fetcher.prefetch([url for url in self._resource_urls(soup) if self._is_remote_url(url)])
         
         # Process CSS files
         for link in soup.find_all('link', rel='stylesheet'):
             if link.get('href'):
-                url = urljoin(link['href'], link['href'])
-                local_path = self._download_resource(url, resource_dir)
+                url = link['href']
+                local_path = localize(url)
                 link['href'] = local_path
         
         # Process JavaScript files
         for script in soup.find_all('script', src=True):
-            url = urljoin(script['src'], script['src'])
-            local_path = self._download_resource(url, resource_dir)
+            url = script['src']
+            local_path = localize(url)
             script['src'] = local_path
         
         # Process images and add alt text
         for img in soup.find_all('img'):
             if img.get('src'):
-                url = urljoin(img['src'], img['src'])
-                local_path = self._download_resource(url, resource_dir)
+                url = img['src']
+                local_path = localize(url)
                 img['src'] = local_path
                 # Add alt text if missing for accessibility
                 if not img.get('alt'):
                     img['alt'] = 'Image'
         
-        return str(soup)
+        return soup
+
+    def reset_cache_stats(self) -> None:
+        """Reset the render cache counters."""
+        with self._cache_lock:
+            self.cache_stats = {"lookups": 0, "hits": 0, "seconds_saved": 0.0}
+
+    def _asset_hashes(self, soup: BeautifulSoup, base_dir: Union[str, Path] = None) -> Dict[str, Optional[str]]:
+        """
+        Hash the resources referenced by a page, as they would be rendered.
+        
+        Remote resources are identified by their content hash in the asset cache (assets that
+        are not cached yet are downloaded first), local files by the hash of the file.
+        
+        Args:
+            soup: Parsed HTML document (before rewriting)
+            base_dir: Directory relative local paths are resolved against. If None, uses the working directory
+        
+        Returns:
+            Dict[str, Optional[str]]: Content hash per resource URL (None if it cannot be read)
+        """
+        base_dir = Path(base_dir) if base_dir else Path.cwd()
+        urls = [url for url in dict.fromkeys(self._resource_urls(soup)) if not url.startswith('data:')]
+        remote_urls = [url for url in urls if self._is_remote_url(url)]
+        self.asset_fetcher.prefetch([url for url in remote_urls if self.asset_fetcher.cached_hash(url) is None])
+        
+        hashes = {}
+        for url in urls:
+            if url in remote_urls:
+                hashes[url] = self.asset_fetcher.cached_hash(url)
+                continue
+            parsed = urlparse(url)
+            local_path = Path(unquote(parsed.path)) if parsed.scheme == 'file' else base_dir / unquote(parsed.path)
+            hashes[url] = compute_file_hash(local_path) if local_path.is_file() else None
+        return hashes
+
+    def _get_cache_key(self, soup: BeautifulSoup, base_dir: Union[str, Path] = None) -> Optional[str]:
+        """
+        Build the render cache key of a page.
+        
+        Args:
+            soup: Parsed HTML document (before rewriting)
+            base_dir: Directory relative local paths are resolved against
+        
+        Returns:
+            Optional[str]: Key combining the page's SHA-256, the hashes of its resources and the
+                           wkhtmltopdf options (None when caching is disabled)
+        """
+        if self.cache is None:
+            return None
+        return build_cache_key(
+            "pdf_render",
+            self.CACHE_VERSION,
+            compute_text_hash(str(soup)),
+            self._asset_hashes(soup, base_dir),
+            self.options
+        )
+
+    def _load_from_cache(self, cache_key: Optional[str]) -> Optional[bytes]:
+        """
+        Read a previous render of a page.
+        
+        Args:
+            cache_key: Render cache key of the page (None when caching is disabled)
+        
+        Returns:
+            Optional[bytes]: The cached PDF content, or None on a miss
+        """
+        if not cache_key:
+            return None
+        pdf = self.cache.get(cache_key)
+        with self._cache_lock:
+            self.cache_stats["lookups"] += 1
+            if pdf is not None:
+                self.cache_stats["hits"] += 1
+                self.cache_stats["seconds_saved"] += self.cache.get_metadata(cache_key).get("seconds", 0.0)
+        return pdf
+
+    def _store_in_cache(self, cache_key: Optional[str], pdf: bytes, seconds: float, source: str = None) -> None:
+        """
+        Store a successful render in the cache.
+        
+        Args:
+            cache_key: Render cache key of the page (None when caching is disabled)
+            pdf: The PDF content
+            seconds: Time the render took (reported as saved on later hits)
+            source: Optional source of the page, kept in the entry's metadata
+        """
+        if not cache_key:
+            return
+        try:
+            self.cache.put(cache_key, pdf, metadata={"source": source, "seconds": round(seconds, 3)})
+        except Exception as e:
+            print(f"⚠️ Could not store render in cache: {e}")
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of render cache lookups served from the cache."""
+        lookups = self.cache_stats["lookups"]
+        return self.cache_stats["hits"] / lookups if lookups else 0.0
+
+    def print_cache_report(self) -> None:
+        """Print the render cache statistics since the last reset."""
+        stats = self.cache_stats
+        if not stats["lookups"]:
+            return
+        print(f"♻️ Render cache: {stats['hits']}/{stats['lookups']} documents unchanged "
+              f"({self.cache_hit_rate:.0%} hit rate), {stats['seconds_saved']:.1f}s of rendering saved")
+
+    def _render_string(self, html_content: str, timeout: float = None) -> bytes:
+        """
+        Render an HTML string to PDF bytes, piping it through wkhtmltopdf's stdin and stdout.
+        
+        Args:
+            html_content: Complete HTML document
+            timeout: Optional timeout in seconds (the wkhtmltopdf process is killed when it expires)
+        
+        Returns:
+            bytes: The PDF content
+        """
+        command = pdfkit.PDFKit(html_content, 'string', options=self.options, configuration=self.config).command()
+        process = subprocess.run(command, shell=False, input=html_content.encode('utf-8'), timeout=timeout,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # wkhtmltopdf exits with 1 when some resources failed to load but the PDF was still written
+        if process.stdout[:4] != b'%PDF':
+            stderr = process.stderr.decode('utf-8', errors='replace').strip()[-500:]
+            raise IOError(f"wkhtmltopdf exited with code {process.returncode}: {stderr}")
+        return process.stdout
+
+    def convert_soup(
+        self,
+        soup: BeautifulSoup,
+        output_path: Union[str, Path] = None,
+        timeout: float = None,
+        base_dir: Union[str, Path] = None
+    ) -> Union[bytes, str]:
+        """
+        Convert a parsed HTML document to PDF in memory.
+        
+        The document is rewritten in place (styles, remote resources inlined as data URIs) and piped
+        to wkhtmltopdf, so it is parsed once and no intermediate file is written. Documents whose
+        content, resources and options are unchanged are served from the render cache. Safe to
+        call from several threads at once.
+        
+        Args:
+            soup: Parsed HTML document
+            output_path: Optional path to save the PDF output. If not provided, the PDF content is returned
+            timeout: Optional timeout in seconds of the wkhtmltopdf run
+            base_dir: Optional directory of the source document that relative local resource paths
+                      are resolved against. If None, they resolve against the working directory
+        
+        Returns:
+            bytes: The PDF content if output_path is None, otherwise returns empty string
+        """
+        cache_key = self._get_cache_key(soup, base_dir)
+        pdf = self._load_from_cache(cache_key)
+        if pdf is None:
+            start = time.perf_counter()
+            pdf = self._render_string(str(self._rewrite_html(soup, base_dir=base_dir)), timeout)
+            self._store_in_cache(cache_key, pdf, time.perf_counter() - start)
+        if output_path:
+            atomic_write_bytes(output_path, pdf)
+            return ""
+        return pdf
+
+    def convert_string(
+        self,
+        html_content: str,
+        output_path: Union[str, Path] = None,
+        timeout: float = None,
+        base_dir: Union[str, Path] = None
+    ) -> Union[bytes, str]:
+        """
+        Convert an HTML string to PDF in memory (see convert_soup).
+        
+        Args:
+            html_content: HTML document
+            output_path: Optional path to save the PDF output. If not provided, the PDF content is returned
+            timeout: Optional timeout in seconds of the wkhtmltopdf run
+            base_dir: Optional directory relative local resource paths are resolved against
+        
+        Returns:
+            bytes: The PDF content if output_path is None, otherwise returns empty string
+        """
+        return self.convert_soup(BeautifulSoup(html_content, 'html.parser'), output_path, timeout, base_dir)
 
     def convert_to_markdown(self, input_path: Union[str, Path], output_path: Union[str, Path] = None) -> str:
         """
@@ -221,15 +506,24 @@ class HTMLToPDFConverter(BaseConverter):
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
         
+        # Read HTML content and skip rendering if the page and its resources are unchanged
+        with open(input_path, 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        
+        cache_key = self._get_cache_key(soup, input_path.parent)
+        pdf = self._load_from_cache(cache_key)
+        if pdf is not None:
+            if output_path:
+                atomic_write_bytes(output_path, pdf)
+                return ""
+            return pdf
+        
         # Create resource directory for downloaded assets
         resource_dir = input_path.parent / 'resources'
         resource_dir.mkdir(exist_ok=True)
         
-        # Read and process HTML content
-        with open(input_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        processed_html = self._process_html(html_content, resource_dir)
+        start = time.perf_counter()
+        processed_html = str(self._rewrite_html(soup, resource_dir))
         
         # Save processed HTML for debugging
         processed_html_path = input_path.parent / 'processed.html'
@@ -240,30 +534,178 @@ class HTMLToPDFConverter(BaseConverter):
             output_path = Path(output_path)
             pdfkit.from_file(str(processed_html_path), str(output_path), 
                            configuration=self.config, options=self.options)
+            with open(output_path, 'rb') as f:
+                self._store_in_cache(cache_key, f.read(), time.perf_counter() - start, str(input_path))
             return ""
         else:
-            return pdfkit.from_file(str(processed_html_path), False, 
+            pdf = pdfkit.from_file(str(processed_html_path), False, 
                                   configuration=self.config, options=self.options)
+            self._store_in_cache(cache_key, pdf, time.perf_counter() - start, str(input_path))
+            return pdf
 
-    def convert_batch(self, input_paths: List[Union[str, Path]], output_dir: Union[str, Path]) -> List[Path]:
+    def _render_pdf(self, html_path: Path, output_path: Path, timeout: float) -> Optional[str]:
         """
-        Convert multiple HTML files to PDF format.
+        Run wkhtmltopdf on an HTML file with a timeout.
+        
+        Args:
+            html_path: Path to the processed HTML file
+            output_path: Path of the PDF to write
+            timeout: Timeout in seconds (the wkhtmltopdf process is killed when it expires)
+            
+        Returns:
+            Optional[str]: Error message, or None if the PDF was written
+        """
+        command = pdfkit.PDFKit(str(html_path), 'file', options=self.options, configuration=self.config).command(str(output_path))
+        try:
+            process = subprocess.run(command, shell=False, timeout=timeout,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, errors='replace')
+        except subprocess.TimeoutExpired:
+            return f"timed out after {timeout} seconds"
+        # wkhtmltopdf exits with 1 when some resources failed to load but the PDF was still written
+        if output_path.exists():
+            with open(output_path, 'rb') as f:
+                if f.read(4) == b'%PDF':
+                    return None
+        return f"wkhtmltopdf exited with code {process.returncode}: {process.stderr.strip()[-500:]}"
+    
+    def _render_job(self, job: Tuple[Path, Path, Path], scratch_root: Path, timeout: float) -> Dict[str, Any]:
+        """
+        Render one HTML file of a batch inside its own scratch directory.
+        
+        Unchanged pages are copied from the render cache. Otherwise the processed HTML,
+        downloaded resources and the PDF are written to the scratch directory; the PDF is moved
+        atomically to its destination, so concurrent jobs never share files and a failed job
+        leaves no partial output behind. Relative local resources are rewritten to file:// URIs
+        resolved against the job's base directory, since the processed HTML lives elsewhere.
+        
+        Args:
+            job: Input HTML path, output PDF path and the directory relative resources resolve against
+            scratch_root: Directory holding the per-job scratch directories
+            timeout: Timeout in seconds of the wkhtmltopdf run
+            
+        Returns:
+            Dict[str, Any]: Job result with status, cache use, timing and error message
+        """
+        input_path, output_path, base_dir = job
+        start = time.perf_counter()
+        error = None
+        cached = False
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                soup = BeautifulSoup(f.read(), 'html.parser')
+            cache_key = self._get_cache_key(soup, base_dir)
+            pdf = self._load_from_cache(cache_key)
+            if pdf is not None:
+                atomic_write_bytes(output_path, pdf)
+                cached = True
+            else:
+                with tempfile.TemporaryDirectory(prefix=f"{input_path.stem}_", dir=scratch_root) as scratch_dir:
+                    scratch_dir = Path(scratch_dir)
+                    resource_dir = scratch_dir / 'resources'
+                    resource_dir.mkdir()
+                    processed_html_path = scratch_dir / 'processed.html'
+                    with open(processed_html_path, 'w', encoding='utf-8') as f:
+                        f.write(str(self._rewrite_html(soup, resource_dir, base_dir)))
+                    
+                    scratch_pdf = scratch_dir / 'output.pdf'
+                    error = self._render_pdf(processed_html_path, scratch_pdf, timeout)
+                    if error is None:
+                        with open(scratch_pdf, 'rb') as f:
+                            self._store_in_cache(cache_key, f.read(), time.perf_counter() - start, str(input_path))
+                        output_path.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(scratch_pdf, output_path)
+        except Exception as e:
+            error = str(e)
+        
+        return {
+            "source": str(input_path),
+            "output": str(output_path),
+            "status": "failed" if error else "done",
+            "cached": cached,
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": error,
+        }
+    
+    def render_batch(
+        self,
+        jobs: List[Tuple[Union[str, Path], ...]],
+        workers: int = None,
+        timeout: float = 120,
+        scratch_dir: Union[str, Path] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Render several HTML files to PDF with a bounded pool of wkhtmltopdf processes.
+        
+        Args:
+            jobs: Pairs of input HTML path and output PDF path, optionally followed by the directory
+                  relative local resources are resolved against (defaults to the input's directory)
+            workers: Maximum number of concurrent wkhtmltopdf processes. If None, uses the CPU count
+            timeout: Timeout in seconds of one wkhtmltopdf run
+            scratch_dir: Directory for the per-job scratch directories. If None, uses a hidden
+                         directory next to the first output
+            
+        Returns:
+            List[Dict[str, Any]]: One result per job, in the order of the jobs
+        """
+        jobs = [(Path(job[0]), Path(job[1]), Path(job[2]) if len(job) > 2 else Path(job[0]).parent) for job in jobs]
+        if not jobs:
+            return []
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        # Scratch directories live next to the outputs so the final move is a same-filesystem rename
+        scratch_root = Path(scratch_dir) if scratch_dir else jobs[0][1].parent / '.pdf_render_work'
+        scratch_root.mkdir(parents=True, exist_ok=True)
+        
+        # Resources shared by several pages are downloaded once, concurrently
+        self.asset_fetcher.reset_stats()
+        self.reset_cache_stats()
+        self.prefetch_resources([job[0] for job in jobs])
+        
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                report = list(executor.map(lambda job: self._render_job(job, scratch_root, timeout), jobs))
+        finally:
+            if not scratch_dir:
+                shutil.rmtree(scratch_root, ignore_errors=True)
+        
+        self._print_render_report(report, time.perf_counter() - start, workers)
+        self.print_cache_report()
+        self.asset_fetcher.print_report()
+        return report
+    
+    def _print_render_report(self, report: List[Dict[str, Any]], elapsed: float, workers: int) -> None:
+        """Print the failures and a summary of a batch render."""
+        for record in report:
+            if record["status"] == "failed":
+                print(f"❌ {record['source']}: {record['error']}")
+        done = sum(1 for record in report if record["status"] == "done")
+        cached = sum(1 for record in report if record.get("cached"))
+        render_seconds = sum(record["seconds"] for record in report)
+        print(f"📊 Rendered {done}/{len(report)} PDFs ({cached} from cache) in {elapsed:.1f}s with {workers} workers "
+              f"({render_seconds:.1f}s of rendering, {len(report) - done} failed)")
+    
+    def convert_batch(
+        self,
+        input_paths: List[Union[str, Path]],
+        output_dir: Union[str, Path],
+        workers: int = None,
+        timeout: float = 120
+    ) -> List[Path]:
+        """
+        Convert multiple HTML files to PDF format in parallel.
         
         Args:
             input_paths: List of paths to input HTML files
             output_dir: Directory to save the PDF outputs
+            workers: Maximum number of concurrent wkhtmltopdf processes. If None, uses the CPU count
+            timeout: Timeout in seconds of one wkhtmltopdf run
             
         Returns:
-            List[Path]: List of paths to the generated PDF files
+            List[Path]: List of paths to the generated PDF files, in the order of the inputs
         """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        output_files = []
-        for input_path in input_paths:
-            input_path = Path(input_path)
-            output_path = output_dir / f"{input_path.stem}.pdf"
-            self.convert_to_markdown(input_path, output_path)
-            output_files.append(output_path)
-            
-        return output_files 
\ No newline at end of file
+        jobs = [(Path(input_path), output_dir / f"{Path(input_path).stem}.pdf") for input_path in input_paths]
+        self.last_report = self.render_batch(jobs, workers=workers, timeout=timeout)
+        return [Path(record["output"]) for record in self.last_report if record["status"] == "done"]
@@ -1,4 +1,4 @@
-import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Union, List
@@ -8,44 +8,81 @@ from bs4 import BeautifulSoup
 
 from .html_to_pdf_converter import HTMLToPDFConverter
 
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code', 'codehilite', 'extra']
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        img {{
+            max-width: 100%;
+            height: auto;
+        }}
+        table {{
+            border-collapse: collapse;
+            width: 100%;
+            margin: 1em 0;
+        }}
+        th, td {{
+            border: 1px solid #ddd;
+            padding: 8px;
+            text-align: left;
+        }}
+        th {{
+            background-color: #f5f5f5;
+        }}
+        pre {{
+            background-color: #f5f5f5;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+        }}
+        code {{
+            font-family: Consolas, monospace;
+        }}
+        figure {{
+            margin: 1em 0;
+        }}
+        figcaption {{
+            text-align: center;
+            font-style: italic;
+            color: #666;
+        }}
+    </style>
+</head>
+<body>
+    {content}
+</body>
+</html>
+"""
+
 
 class MarkdownToPDFConverter:
     """Converter for Markdown to PDF conversion using markdown and HTMLToPDFConverter."""
     
-    def __init__(self, wkhtmltopdf_path: str = None):
+    def __init__(self, wkhtmltopdf_path: str = None, cache_dir: Union[str, Path] = None, use_cache: bool = True):
         """
         Initialize the converter.
         
         Args:
             wkhtmltopdf_path: Path to wkhtmltopdf executable. If None, will try to use system default.
+            cache_dir: Directory of the render cache. If None, uses .cache/pdf_render
+            use_cache: Whether to reuse previous renders of unchanged documents (keyed by the
+                       generated HTML, the hashes of its resources and the wkhtmltopdf options)
         """
-        self.html_converter = HTMLToPDFConverter(wkhtmltopdf_path)
-        self.md = markdown.Markdown(extensions=[
-            'tables',
-            'fenced_code',
-            'codehilite',
-            'extra'
-        ])
+        self.html_converter = HTMLToPDFConverter(wkhtmltopdf_path, cache_dir=cache_dir, use_cache=use_cache)
 
-    def _process_markdown(self, markdown_content: str) -> str:
-        """Process markdown content to handle relative image paths."""
-        # First convert markdown to HTML
-        html_content = self.md.convert(markdown_content)
-        
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Process all images in the HTML
-        for img in soup.find_all('img'):
-            if img.get('src'):
-                src = img['src']
-                # Convert GitHub URL if needed
-                if 'github.com' in src and '/tree/' in src:
-                    src = src.replace('/tree/', '/raw/')
-                # Update the image source
-                img['src'] = src
-        
-        return str(soup)
+    def _markdown_to_html(self, markdown_content: str) -> str:
+        """Convert markdown to an HTML fragment."""
+        # Markdown instances keep state between conversions and are not thread-safe, so every call gets its own
+        return markdown.Markdown(extensions=MARKDOWN_EXTENSIONS).convert(markdown_content)
 
     def convert_to_pdf(self, input_path: Union[str, Path], output_path: Union[str, Path] = None) -> str:
         """
@@ -67,101 +104,93 @@ class MarkdownToPDFConverter:
         with open(input_path, 'r', encoding='utf-8') as f:
             markdown_content = f.read()
         
-        # Process markdown content
-        processed_content = self._process_markdown(markdown_content)
-        
-        # Create complete HTML document
-        html_doc = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                img {{
-                    max-width: 100%;
-                    height: auto;
-                }}
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 1em 0;
-                }}
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 8px;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: #f5f5f5;
-                }}
-                pre {{
-                    background-color: #f5f5f5;
-                    padding: 15px;
-                    border-radius: 5px;
-                    overflow-x: auto;
-                }}
-                code {{
-                    font-family: Consolas, monospace;
-                }}
-                figure {{
-                    margin: 1em 0;
-                }}
-                figcaption {{
-                    text-align: center;
-                    font-style: italic;
-                    color: #666;
-                }}
-            </style>
-        </head>
-        <body>
-            {processed_content}
-        </body>
-        </html>
+        return self.convert_markdown(markdown_content, output_path, base_dir=input_path.parent)
+
+    def convert_markdown(
+        self,
+        markdown_content: str,
+        output_path: Union[str, Path] = None,
+        timeout: float = None,
+        base_dir: Union[str, Path] = None
+    ) -> Union[bytes, str]:
         """
+        Convert markdown content to PDF in memory.
         
-        # Create a temporary HTML file
-        with tempfile.NamedTemporaryFile(suffix='.html', delete=False, mode='w', encoding='utf-8') as temp_html:
-            temp_html.write(html_doc)
-            temp_html_path = temp_html.name
+        The HTML document is parsed once, its remote resources are inlined and it is piped to
+        wkhtmltopdf, so no temporary file is written. Safe to call from several threads at once.
         
-        try:
-            # Convert HTML to PDF
-            if output_path:
-                output_path = Path(output_path)
-                self.html_converter.convert_to_markdown(temp_html_path, output_path)
-                return ""
-            else:
-                return self.html_converter.convert_to_markdown(temp_html_path)
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_html_path)
+        Args:
+            markdown_content: Markdown content
+            output_path: Optional path to save the PDF output. If not provided, 
+                        will return the PDF content as bytes
+            timeout: Optional timeout in seconds of the wkhtmltopdf run
+            base_dir: Optional directory of the Markdown file that relative image and stylesheet
+                      paths are resolved against. If None, they resolve against the working directory
+        
+        Returns:
+            bytes: The PDF content if output_path is None, otherwise returns empty string
+        """
+        soup = BeautifulSoup(self._build_html_document(markdown_content), 'html.parser')
+        return self.html_converter.convert_soup(soup, output_path, timeout, base_dir)
 
-    def convert_batch(self, input_paths: List[Union[str, Path]], output_dir: Union[str, Path]) -> List[Path]:
+    def _build_html_document(self, markdown_content: str) -> str:
+        """Convert markdown content to a complete, styled HTML document."""
+        return HTML_TEMPLATE.format(content=self._markdown_to_html(markdown_content))
+
+    def convert_batch(
+        self,
+        input_paths: List[Union[str, Path]],
+        output_dir: Union[str, Path],
+        workers: int = None,
+        timeout: float = 120
+    ) -> List[Path]:
         """
-        Convert multiple Markdown files to PDF format.
+        Convert multiple Markdown files to PDF format in parallel.
+        
+        The Markdown files are converted to HTML one after another; the HTML documents are then
+        rendered by a bounded pool of wkhtmltopdf processes (see HTMLToPDFConverter.render_batch).
         
         Args:
             input_paths: List of paths to input Markdown files
             output_dir: Directory to save the PDF outputs
+            workers: Maximum number of concurrent wkhtmltopdf processes. If None, uses the CPU count
+            timeout: Timeout in seconds of one wkhtmltopdf run
             
         Returns:
-            List[Path]: List of paths to the generated PDF files
+            List[Path]: List of paths to the generated PDF files, in the order of the inputs
         """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        output_files = []
-        for input_path in input_paths:
-            input_path = Path(input_path)
-            output_path = output_dir / f"{input_path.stem}.pdf"
-            self.convert_to_pdf(input_path, output_path)
-            output_files.append(output_path)
+        scratch_root = output_dir / '.pdf_render_work'
+        scratch_root.mkdir(parents=True, exist_ok=True)
+        report = []
+        try:
+            html_dir = Path(tempfile.mkdtemp(prefix='html_', dir=scratch_root))
+            jobs = []
+            sources = []
+            for index, input_path in enumerate(input_paths):
+                input_path = Path(input_path)
+                output_path = output_dir / f"{input_path.stem}.pdf"
+                try:
+                    with open(input_path, 'r', encoding='utf-8') as f:
+                        html_doc = self._build_html_document(f.read())
+                except OSError as e:
+                    print(f"❌ {input_path}: {e}")
+                    continue
+                # The index keeps inputs with the same stem apart
+                html_path = html_dir / f"{index:05d}_{input_path.stem}.html"
+                with open(html_path, 'w', encoding='utf-8') as f:
+                    f.write(html_doc)
+                # Relative image paths resolve against the Markdown file, not the scratch HTML
+                jobs.append((html_path, output_path, input_path.parent))
+                sources.append(str(input_path))
             
-        return output_files 
\ No newline at end of file
+            report = self.html_converter.render_batch(jobs, workers=workers, timeout=timeout, scratch_dir=scratch_root)
+            for record, source in zip(report, sources):
+                record["source"] = source
+        finally:
+            shutil.rmtree(scratch_root, ignore_errors=True)
+        
+        self.last_report = report
+        return [Path(record["output"]) for record in report if record["status"] == "done"]
@@ -0,0 +1,290 @@
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Union, List, Dict, Tuple, Optional
+
+import fitz
+
+from .base_converter import BaseConverter
+from ..utils.file_utils import ensure_dir, get_output_path
+
+BULLET_PATTERN = re.compile(r'^\s*[•◦▪▫●○■□–\-*]\s+')
+LIST_ITEM_PATTERN = re.compile(r'^\s*(?:[•◦▪▫●○■□–\-*]|\d+[.)])\s+')
+MONOSPACE_FONT_PATTERN = re.compile(r'mono|courier|consolas|menlo', re.IGNORECASE)
+
+
+class PyMuPDFConverter(BaseConverter):
+    """Fast converter for simple digital PDFs using PyMuPDF text blocks and table detection."""
+
+    def __init__(
+        self,
+        heading_ratio: float = 1.15,
+        max_image_coverage: float = 0.5,
+        max_column_overlap_blocks: int = 2
+    ):
+        """
+        Initialize the converter.
+
+        Args:
+            heading_ratio: Minimum font size ratio to the body text for a line to be a heading
+            max_image_coverage: Fraction of a page covered by images above which the page
+                                is considered complex (e.g. scanned content or screenshots of text)
+            max_column_overlap_blocks: Number of side-by-side text block pairs tolerated on a page
+                                       before it is considered a multi-column layout
+        """
+        self.heading_ratio = heading_ratio
+        self.max_image_coverage = max_image_coverage
+        self.max_column_overlap_blocks = max_column_overlap_blocks
+
+    def _analyze_page(self, page: fitz.Page) -> Dict:
+        """
+        Analyze a page's tables, images and text layout.
+
+        Args:
+            page: PyMuPDF page
+
+        Returns:
+            Dict: Page analysis with the detected tables and the reasons the page is complex (if any)
+        """
+        reasons = []
+
+        tables = page.find_tables().tables
+        for table in tables:
+            # Merged (row/col spanning) cells come back as None
+            if any(cell is None for row in table.extract() for cell in row):
+                reasons.append("table with merged cells")
+                break
+
+        page_area = abs(page.rect) or 1
+        image_area = sum(abs(fitz.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+        if image_area / page_area > self.max_image_coverage:
+            reasons.append("image-heavy page")
+
+        text_blocks = [
+            fitz.Rect(block[:4]) for block in page.get_text("blocks")
+            if block[6] == 0 and block[4].strip()
+        ]
+        side_by_side = 0
+        for i, first in enumerate(text_blocks):
+            for second in text_blocks[i + 1:]:
+                vertical_overlap = min(first.y1, second.y1) - max(first.y0, second.y0)
+                horizontally_apart = first.x1 <= second.x0 or second.x1 <= first.x0
+                if horizontally_apart and vertical_overlap > 0.5 * min(first.height, second.height):
+                    side_by_side += 1
+        if side_by_side > self.max_column_overlap_blocks:
+            reasons.append("multi-column layout")
+
+        return {'tables': tables, 'complex_reasons': reasons}
+
+    def analyze(self, input_path: Union[str, Path]) -> Dict:
+        """
+        Analyze whether a PDF can be converted by the fast path.
+
+        Args:
+            input_path: Path to the PDF file
+
+        Returns:
+            Dict: 'simple' (bool), 'pages' (int), 'reasons' (list of "page N: reason" strings) and
+                  'tables' (per page, the (bbox, markdown) of every detected table, which
+                  convert_to_markdown reuses instead of detecting the tables again)
+        """
+        reasons = []
+        tables = []
+        with fitz.open(input_path) as doc:
+            for page in doc:
+                page_analysis = self._analyze_page(page)
+                for reason in page_analysis['complex_reasons']:
+                    reasons.append(f"page {page.number + 1}: {reason}")
+                tables.append(self._table_items(page_analysis['tables']))
+            page_count = doc.page_count
+        return {'simple': not reasons, 'pages': page_count, 'reasons': reasons, 'tables': tables}
+
+    @staticmethod
+    def _table_items(tables: List) -> List[Tuple[Tuple[float, float, float, float], str]]:
+        """Bounding box and markdown of detected tables (independent of the open document)."""
+        return [(tuple(table.bbox), table.to_markdown(clean=False).strip()) for table in tables]
+
+    def _get_font_levels(self, doc: fitz.Document) -> Tuple[float, Dict[float, int]]:
+        """
+        Infer the body font size and the heading level of larger font sizes.
+
+        Args:
+            doc: PyMuPDF document
+
+        Returns:
+            Tuple[float, Dict[float, int]]: Body font size and a map of heading font size to level
+        """
+        sizes = Counter()
+        for page in doc:
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", []):
+                    for span in line["spans"]:
+                        sizes[round(span["size"], 1)] += len(span["text"].strip())
+
+        if not sizes:
+            return 0.0, {}
+        body_size = sizes.most_common(1)[0][0]
+        heading_sizes = sorted((size for size in sizes if size >= body_size * self.heading_ratio), reverse=True)
+        return body_size, {size: min(level, 6) for level, size in enumerate(heading_sizes, start=1)}
+
+    def _block_to_item(self, block: Dict, heading_levels: Dict[float, int]) -> Optional[Dict]:
+        """
+        Classify a PyMuPDF text block as heading, code or text.
+
+        Args:
+            block: Text block from page.get_text("dict")
+            heading_levels: Map of heading font size to level
+
+        Returns:
+            Optional[Dict]: Item with 'kind', 'lines', 'level', 'size' and 'rect', or None for empty blocks
+        """
+        lines = []
+        monospace = True
+        sizes = []
+        for line in block.get("lines", []):
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            monospace &= all(MONOSPACE_FONT_PATTERN.search(span["font"]) for span in spans)
+            sizes.append(max(round(span["size"], 1) for span in spans))
+            lines.append("".join(span["text"] for span in line["spans"]).rstrip())
+
+        if not lines:
+            return None
+
+        level = heading_levels.get(min(sizes))
+        kind = "code" if monospace else "heading" if level else "text"
+        return {'kind': kind, 'lines': lines, 'level': level, 'size': max(sizes), 'rect': fitz.Rect(block["bbox"])}
+
+    def _continues(self, previous: Dict, item: Dict) -> bool:
+        """Check whether an item continues the previous one (wrapped paragraph or code lines)."""
+        if previous['kind'] != item['kind'] or item['kind'] == "heading":
+            return False
+        gap = item['rect'].y0 - previous['rect'].y1
+        if not 0 <= gap < 0.6 * previous['size']:
+            return False
+        if item['kind'] == "text" and LIST_ITEM_PATTERN.match(item['lines'][0]):
+            return False
+        return True
+
+    def _item_to_markdown(self, item: Dict) -> str:
+        """Render a merged heading, code or text item as markdown."""
+        if item['kind'] == "table":
+            return item['markdown']
+        if item['kind'] == "code":
+            return "```\n" + "\n".join(item['lines']) + "\n```"
+        if item['kind'] == "heading":
+            return "#" * item['level'] + " " + " ".join(line.strip() for line in item['lines'])
+
+        # Keep list items on their own lines, join wrapped lines of the same paragraph/item
+        paragraphs = []
+        for line in item['lines']:
+            line = line.strip()
+            if BULLET_PATTERN.match(line):
+                paragraphs.append("- " + BULLET_PATTERN.sub("", line))
+            elif LIST_ITEM_PATTERN.match(line) or not paragraphs:
+                paragraphs.append(line)
+            else:
+                paragraphs[-1] += " " + line
+        return "\n".join(paragraphs)
+
+    def _page_to_markdown(self, page: fitz.Page, heading_levels: Dict[float, int], tables: List) -> str:
+        """
+        Convert a page to markdown, placing tables at their position in the text flow.
+
+        Args:
+            page: PyMuPDF page
+            heading_levels: Map of heading font size to level
+            tables: Bounding box and markdown of the tables detected on the page
+
+        Returns:
+            str: Markdown of the page
+        """
+        table_rects = [fitz.Rect(bbox) for bbox, _ in tables]
+        items = [
+            {'kind': "table", 'markdown': markdown, 'rect': rect}
+            for rect, (_, markdown) in zip(table_rects, tables)
+        ]
+
+        for block in page.get_text("dict", sort=True)["blocks"]:
+            if block.get("type") != 0:
+                continue
+            if any(fitz.Rect(block["bbox"]).intersects(table_rect) for table_rect in table_rects):
+                continue
+            item = self._block_to_item(block, heading_levels)
+            if item:
+                items.append(item)
+
+        items.sort(key=lambda item: (item['rect'].y0, item['rect'].x0))
+
+        merged = []
+        for item in items:
+            if merged and self._continues(merged[-1], item):
+                merged[-1]['lines'] = merged[-1]['lines'] + item['lines']
+                merged[-1]['rect'] = merged[-1]['rect'] | item['rect']
+            else:
+                merged.append(dict(item))
+        return "\n\n".join(self._item_to_markdown(item) for item in merged)
+
+    def convert_to_markdown(
+        self,
+        input_path: Union[str, Path],
+        output_path: Union[str, Path] = None,
+        analysis: Optional[Dict] = None
+    ) -> str:
+        """
+        Convert a simple digital PDF to markdown.
+
+        Args:
+            input_path: Path to the input PDF file
+            output_path: Optional path to save the markdown output
+            analysis: Optional result of analyze() for the same file, whose tables are reused
+
+        Returns:
+            str: The markdown content if output_path is None, otherwise returns empty string
+        """
+        input_path = Path(input_path)
+        if input_path.suffix.lower() != '.pdf':
+            raise ValueError("PyMuPDFConverter only supports PDF files")
+
+        with fitz.open(input_path) as doc:
+            _, heading_levels = self._get_font_levels(doc)
+            pages = []
+            for page in doc:
+                if analysis is not None:
+                    tables = analysis['tables'][page.number]
+                else:
+                    tables = self._table_items(page.find_tables().tables)
+                pages.append(self._page_to_markdown(page, heading_levels, tables))
+
+        markdown_content = "\n\n".join(page for page in pages if page) + "\n"
+
+        if output_path:
+            output_path = Path(output_path)
+            output_path.write_text(markdown_content, encoding='utf-8')
+            return ""
+
+        return markdown_content
+
+    def convert_batch(self, input_paths: List[Union[str, Path]], output_dir: Union[str, Path]) -> List[Path]:
+        """
+        Convert multiple PDFs to markdown.
+
+        Args:
+            input_paths: List of paths to PDF files
+            output_dir: Directory to save the markdown outputs
+
+        Returns:
+            List[Path]: List of paths to the generated markdown files
+        """
+        output_dir = ensure_dir(output_dir)
+        converted_files = []
+
+        for input_path in input_paths:
+            input_path = Path(input_path)
+            if input_path.suffix.lower() == '.pdf':
+                output_path = get_output_path(input_path, output_dir)
+                self.convert_to_markdown(input_path, output_path)
+                converted_files.append(output_path)
+
+        return converted_files
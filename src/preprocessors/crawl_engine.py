@@ -0,0 +1,486 @@
+import asyncio
+import inspect
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Callable, Any
+from urllib.parse import urljoin, urlparse, urldefrag
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+import lxml.html
+
+from .crawl_frontier import URLFrontier
+from ..utils.http_cache import HTTPCache, get_header
+from ..utils.sitemap_utils import parse_robots_sitemaps, parse_sitemap
+from ..utils.url_utils import canonicalize_url
+
+CHARSET_PATTERN = re.compile(r'charset=["\']?([\w-]+)', re.IGNORECASE)
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def extract_links(html_content: str, base_url: str) -> List[str]:
+    """
+    Extract absolute, fragment-free link targets from an HTML page.
+
+    Args:
+        html_content: Raw HTML content
+        base_url: URL of the page, used to resolve relative links
+
+    Returns:
+        List[str]: Absolute http(s) URLs linked from the page
+    """
+    try:
+        document = lxml.html.fromstring(html_content)
+    except (ValueError, lxml.etree.ParserError):
+        return []
+
+    links = []
+    for href in document.xpath('//a/@href'):
+        url = urldefrag(urljoin(base_url, href.strip()))[0]
+        if urlparse(url).scheme in ('http', 'https'):
+            links.append(url)
+    return links
+
+
+class AsyncCrawlEngine:
+    """Long-lived asyncio crawler with pooled keep-alive connections and per-host politeness limits."""
+
+    def __init__(
+        self,
+        max_pages: int = 10,
+        max_depth: int = 2,
+        max_connections: int = 32,
+        per_host_concurrency: int = 4,
+        per_host_delay: float = 0.25,
+        timeout: float = 30,
+        user_agent: str = DEFAULT_USER_AGENT,
+        obey_robots: bool = True,
+        http_cache: Optional[HTTPCache] = None,
+        url_scores: Optional[Dict[str, float]] = None,
+        state_path: Optional[str] = None,
+        save_every: int = 100
+    ):
+        """
+        Initialize the crawl engine.
+
+        Args:
+            max_pages: Maximum number of pages fetched per host
+            max_depth: Maximum link depth followed from a seed URL (0 fetches only the seeds)
+            max_connections: Maximum number of open connections across all hosts
+            per_host_concurrency: Maximum number of concurrent requests to one host
+            per_host_delay: Minimum delay in seconds between two requests to the same host
+            timeout: Timeout in seconds of one request
+            user_agent: User-Agent header sent with every request
+            obey_robots: Whether to respect robots.txt
+            http_cache: Optional HTTP cache used to revalidate previously fetched pages with
+                        conditional requests (If-None-Match / If-Modified-Since)
+            url_scores: Map of URL regex to priority score (see URLFrontier); lower depth is crawled first
+            state_path: Optional path of a JSON file the frontier is saved to, so an interrupted
+                        crawl resumes where it stopped (removed once a crawl completes)
+            save_every: Number of fetched pages between two saves of the frontier state
+        """
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_connections = max_connections
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.obey_robots = obey_robots
+        self.http_cache = http_cache
+        self.url_scores = url_scores
+        self.state_path = Path(state_path) if state_path else None
+        self.save_every = save_every
+
+    def _reset_state(self) -> None:
+        """Reset the per-run crawl state."""
+        self.frontier = URLFrontier(url_scores=self.url_scores)
+        self._in_progress: Dict[str, int] = {}
+        self._active_workers = 0
+        self._condition = asyncio.Condition()
+        self._host_pages: Dict[str, int] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_next_request: Dict[str, float] = {}
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        self._stop_event: Optional[threading.Event] = None
+        self._callback_executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {'pages': 0, 'bytes': 0, 'not_modified': 0, 'errors': 0, 'seconds': 0.0}
+
+    async def _wait_for_host(self, host: str) -> None:
+        """Wait until the politeness delay of a host has elapsed."""
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            next_request = self._host_next_request.get(host, now)
+            if next_request > now:
+                await asyncio.sleep(next_request - now)
+            self._host_next_request[host] = max(now, next_request) + self.per_host_delay
+
+    async def _allowed_by_robots(self, session: aiohttp.ClientSession, url: str) -> bool:
+        """Check robots.txt of the URL's host (fetched once per host and run)."""
+        if not self.obey_robots:
+            return True
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin not in self._robots:
+            parser = None
+            try:
+                async with session.get(f"{origin}/robots.txt") as response:
+                    if response.status == 200:
+                        parser = RobotFileParser()
+                        parser.parse((await response.text(errors='replace')).splitlines())
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            self._robots[origin] = parser
+        parser = self._robots[origin]
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    def _schedule(self, url: str, depth: int, host: Optional[str] = None) -> None:
+        """
+        Add a URL to the frontier unless an equivalent URL was already seen or its host's page budget is spent.
+
+        Args:
+            url: Absolute URL (canonicalized before deduplication)
+            depth: Link depth of the URL
+            host: Only schedule the URL if it belongs to this host
+        """
+        url = canonicalize_url(url)
+        url_host = urlparse(url).netloc
+        if host is not None and url_host != host:
+            return
+        if self.frontier.seen(url) or self._host_pages.get(url_host, 0) >= self.max_pages:
+            return
+        # Reserve budget on scheduling so the frontier never holds more than max_pages per host
+        self._host_pages[url_host] = self._host_pages.get(url_host, 0) + 1
+        self.frontier.push(url, depth)
+
+    def _save_state(self) -> None:
+        """Save the frontier, including in-flight URLs, so the crawl can be resumed."""
+        if self.state_path is None:
+            return
+        self.frontier.save(self.state_path, extra={
+            'host_pages': self._host_pages,
+            'in_progress': [[url, depth] for url, depth in self._in_progress.items()],
+        })
+
+    def _load_state(self) -> bool:
+        """Restore a saved frontier; returns True if an interrupted crawl is resumed."""
+        if self.state_path is None or not self.state_path.exists():
+            return False
+        try:
+            extra = self.frontier.load(self.state_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable crawl state {self.state_path}: {e}")
+            return False
+        self._host_pages = extra.get('host_pages', {})
+        for url, depth in extra.get('in_progress', []):
+            self.frontier.requeue(url, depth)
+        print(f"↩️ Resuming crawl with {len(self.frontier)} pending URLs")
+        return True
+
+    def _stop_requested(self) -> bool:
+        """Check whether the caller asked the running crawl to stop."""
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    async def _next_url(self) -> Optional[tuple]:
+        """Wait for the next URL to crawl; None once the frontier is empty and no page is in flight, or on stop."""
+        async with self._condition:
+            while not self._stop_requested() and not len(self.frontier) and self._active_workers:
+                await self._condition.wait()
+            item = None if self._stop_requested() else self.frontier.pop()
+            if item is None:
+                self._condition.notify_all()
+                return None
+            self._active_workers += 1
+            self._in_progress[item[0]] = item[1]
+            return item
+
+    async def _finish_url(self, url: str) -> None:
+        """Mark a URL as done and wake up workers waiting for newly scheduled links."""
+        async with self._condition:
+            self._active_workers -= 1
+            self._in_progress.pop(url, None)
+            self._condition.notify_all()
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, depth: int) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one page, respecting the host's concurrency and politeness limits.
+
+        Args:
+            session: Shared HTTP session
+            url: URL to fetch
+            depth: Link depth of the URL
+
+        Returns:
+            Optional[Dict[str, Any]]: The fetched page, or None if it could not be fetched
+        """
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+        async with semaphore:
+            if not await self._allowed_by_robots(session, url):
+                return None
+            await self._wait_for_host(host)
+            start = time.perf_counter()
+            headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+            async with session.get(url, allow_redirects=True, headers=headers) as response:
+                body = await response.read()
+                page = {
+                    'url': url,
+                    'final_url': str(response.url),
+                    'status': response.status,
+                    'headers': dict(response.headers),
+                    'body': body,
+                    'encoding': response.get_encoding() if body else 'utf-8',
+                    'depth': depth,
+                    'elapsed': time.perf_counter() - start,
+                    'not_modified': False,
+                }
+
+        if self.http_cache is None:
+            return page
+        if page['status'] == 304:
+            cached = self.http_cache.lookup(url)
+            if cached is None:
+                # Cache entry vanished since the conditional headers were built: refetch in full
+                self.http_cache.invalidate(url)
+                return await self._fetch(session, url, depth)
+            page.update(cached, not_modified=True, transferred=len(body))
+            charset = CHARSET_PATTERN.search(get_header(page['headers'], 'Content-Type') or '')
+            page['encoding'] = charset.group(1) if charset else 'utf-8'
+        else:
+            self.http_cache.store(url, page['status'], page['headers'], body)
+        return page
+
+    async def _call_on_page(self, on_page: Callable, page: Dict[str, Any]) -> None:
+        """Run the page callback: coroutine functions on the event loop, plain functions on the callback thread."""
+        if inspect.iscoroutinefunction(on_page):
+            await on_page(page)
+            return
+        result = await asyncio.get_running_loop().run_in_executor(self._callback_executor, on_page, page)
+        if inspect.isawaitable(result):
+            await result
+
+    async def _worker(self, session: aiohttp.ClientSession, on_page: Optional[Callable]) -> None:
+        """Fetch URLs from the frontier, hand pages to the callback and schedule same-host links."""
+        while True:
+            item = await self._next_url()
+            if item is None:
+                return
+            url, depth = item
+            interrupted = False
+            try:
+                page = await self._fetch(session, url, depth)
+                if page is None:
+                    continue
+                self.stats['pages'] += 1
+                if self.state_path is not None and self.stats['pages'] % self.save_every == 0:
+                    self._save_state()
+                if page['not_modified']:
+                    self.stats['not_modified'] += 1
+                    self.stats['bytes'] += page['transferred']
+                else:
+                    self.stats['bytes'] += len(page['body'])
+
+                is_html = 'html' in (get_header(page['headers'], 'Content-Type') or 'text/html')
+                if page['status'] == 200 and is_html:
+                    page['text'] = page['body'].decode(page['encoding'] or 'utf-8', errors='replace')
+                    if depth < self.max_depth:
+                        host = urlparse(url).netloc
+                        for link in extract_links(page['text'], page['final_url']):
+                            self._schedule(link, depth + 1, host=host)
+
+                if on_page:
+                    await self._call_on_page(on_page, page)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"❌ Error fetching {url}: {e}")
+            except BaseException:
+                # Cancelled or interrupted: leave the URL in flight so the saved state re-crawls it
+                interrupted = True
+                raise
+            finally:
+                if not interrupted:
+                    await self._finish_url(url)
+
+    async def crawl(
+        self,
+        seed_urls: List[str],
+        on_page: Optional[Callable] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Crawl any number of seed URLs in one run.
+
+        Args:
+            seed_urls: URLs to start from; links are followed within each seed's host.
+                       Pages are reported under their canonical URL (see canonicalize_url)
+            on_page: Optional callback (sync or async) called with every fetched page dict
+                     ('url', 'final_url', 'status', 'headers', 'body', 'text' for HTML, 'depth', 'elapsed',
+                     'not_modified' when the body was revalidated from the HTTP cache). Sync callbacks
+                     run one at a time on a dedicated thread, so CPU-bound work does not stall the
+                     event loop and needs no locking; async callbacks run on the event loop
+            stop_event: Optional event another thread sets to stop the crawl: no new URLs are
+                        started, pages in flight finish and the frontier is saved for resuming
+
+        Returns:
+            Dict[str, Any]: Crawl statistics (pages, bytes transferred, not_modified, errors, seconds)
+        """
+        self._reset_state()
+        self._stop_event = stop_event
+        start = time.perf_counter()
+        self._load_state()
+        # A resumed frontier already dedups its seeds; seeds new to this run are still crawled
+        for url in seed_urls:
+            self._schedule(url, 0)
+
+        self._callback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='crawl-callback')
+        try:
+            async with self._create_session() as session:
+                workers = [
+                    asyncio.create_task(self._worker(session, on_page))
+                    for _ in range(self.max_connections)
+                ]
+                try:
+                    await asyncio.gather(*workers)
+                except BaseException:
+                    # Interrupted (e.g. Ctrl+C): keep the frontier so the next run resumes
+                    self._save_state()
+                    for worker in workers:
+                        worker.cancel()
+                    raise
+        finally:
+            self._callback_executor.shutdown(wait=False)
+
+        if self._stop_requested():
+            print(f"⏹️ Crawl stopped with {len(self.frontier)} pending URLs")
+            self._save_state()
+        elif self.state_path is not None and self.state_path.exists():
+            self.state_path.unlink()
+
+        self.stats['seconds'] = time.perf_counter() - start
+        return self.stats
+
+    async def discover_sitemap_entries(self, site_urls: List[str], max_sitemaps: int = 1000) -> Dict[str, Optional[str]]:
+        """
+        Collect the page URLs listed in the sitemaps of one or more sites.
+
+        Sitemaps declared in robots.txt are used, falling back to /sitemap.xml. Sitemap indexes
+        are followed recursively; gzip-compressed sitemaps are supported.
+
+        Args:
+            site_urls: Any URL of each site (only the origin is used)
+            max_sitemaps: Maximum number of sitemap files fetched per run
+
+        Returns:
+            Dict[str, Optional[str]]: Canonical page URL mapped to its normalized lastmod (None if not given).
+            self.sitemap_errors holds the number of sitemaps that could not be fetched or parsed
+        """
+        entries: Dict[str, Optional[str]] = {}
+        self.sitemap_errors = 0
+        async with self._create_session() as session:
+            pending = []
+            for site_url in site_urls:
+                parsed = urlparse(site_url)
+                origin = f"{parsed.scheme}://{parsed.netloc}"
+                sitemaps = []
+                try:
+                    async with session.get(f"{origin}/robots.txt") as response:
+                        if response.status == 200:
+                            sitemaps = parse_robots_sitemaps(await response.text(errors='replace'))
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+                pending.extend(sitemaps or [f"{origin}/sitemap.xml"])
+
+            fetched = set()
+            while pending and len(fetched) < max_sitemaps:
+                sitemap_url = pending.pop(0)
+                if sitemap_url in fetched:
+                    continue
+                fetched.add(sitemap_url)
+                try:
+                    async with session.get(sitemap_url) as response:
+                        if response.status != 200:
+                            print(f"⚠️ Sitemap not available ({response.status}): {sitemap_url}")
+                            self.sitemap_errors += 1
+                            continue
+                        data = await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"⚠️ Error fetching sitemap {sitemap_url}: {e}")
+                    self.sitemap_errors += 1
+                    continue
+
+                page_entries, nested_sitemaps = parse_sitemap(data)
+                if not page_entries and not nested_sitemaps:
+                    self.sitemap_errors += 1
+                pending.extend(nested_sitemaps)
+                for entry in page_entries:
+                    url = canonicalize_url(entry['loc'])
+                    # Keep the most recent lastmod if a URL is listed more than once
+                    if url not in entries or (entry['lastmod'] or '') > (entries[url] or ''):
+                        entries[url] = entry['lastmod']
+
+        print(f"🗺️ Found {len(entries)} URLs in {len(fetched)} sitemaps")
+        return entries
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the pooled keep-alive HTTP session of a run."""
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.per_host_concurrency,
+            ttl_dns_cache=300,
+            keepalive_timeout=30
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {'User-Agent': self.user_agent}
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
+
+    @staticmethod
+    def _run_sync(coroutine_function: Callable, *args) -> Any:
+        """Run a coroutine to completion, on its own thread if an event loop is already running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine_function(*args))
+
+        # Already inside an event loop (e.g. a notebook): run on a separate thread
+        result = {}
+
+        def target():
+            try:
+                result['value'] = asyncio.run(coroutine_function(*args))
+            except BaseException as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result.get('value')
+
+    def run(
+        self,
+        seed_urls: List[str],
+        on_page: Optional[Callable] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around crawl(); safe to call repeatedly and from a running event loop.
+
+        Args:
+            seed_urls: URLs to start from
+            on_page: Optional callback called with every fetched page dict
+            stop_event: Optional event another thread sets to stop the crawl early
+
+        Returns:
+            Dict[str, Any]: Crawl statistics
+        """
+        return self._run_sync(self.crawl, seed_urls, on_page, stop_event) or {}
+
+    def run_sitemap_discovery(self, site_urls: List[str], max_sitemaps: int = 1000) -> Dict[str, Optional[str]]:
+        """Synchronous wrapper around discover_sitemap_entries()."""
+        return self._run_sync(self.discover_sitemap_entries, site_urls, max_sitemaps) or {}
@@ -0,0 +1,153 @@
+import heapq
+import json
+import re
+from pathlib import Path
+from typing import Union, Optional, Dict, Any, Tuple
+
+from ..utils.cache_utils import atomic_write_bytes
+from ..utils.url_utils import canonicalize_url, BloomFilter
+
+
+class URLFrontier:
+    """
+    Priority queue of URLs to crawl with canonical-URL deduplication.
+
+    URLs are canonicalized before deduplication. Seen URLs are tracked in an exact set until
+    exact_threshold is reached, then moved to a Bloom filter to keep memory bounded on large crawls.
+    Lower depth is crawled first; url_scores raise (positive) or lower (negative) the priority of
+    URLs matching a regex. The frontier can be saved to and restored from disk to pause and resume.
+    """
+
+    def __init__(
+        self,
+        url_scores: Optional[Dict[str, float]] = None,
+        exact_threshold: int = 100_000,
+        bloom_capacity: int = 10_000_000,
+        bloom_error_rate: float = 0.001
+    ):
+        """
+        Initialize the frontier.
+
+        Args:
+            url_scores: Map of URL regex to score added to the priority of matching URLs
+                        (e.g. {r'/docs/': 1.0, r'/tag/': -2.0}); the best matching score is used
+            exact_threshold: Number of seen URLs kept in an exact set before switching to a Bloom filter
+            bloom_capacity: Expected number of URLs of the Bloom filter
+            bloom_error_rate: False positive rate of the Bloom filter at full capacity
+        """
+        self.url_scores = url_scores or {}
+        self._score_patterns = [(re.compile(pattern), score) for pattern, score in self.url_scores.items()]
+        self.exact_threshold = exact_threshold
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self._heap = []
+        self._counter = 0
+        self._seen = set()
+        self._bloom: Optional[BloomFilter] = None
+
+    def score(self, url: str) -> float:
+        """Return the score of a URL (best matching pattern, 0 if none matches)."""
+        scores = [score for pattern, score in self._score_patterns if pattern.search(url)]
+        return max(scores) if scores else 0.0
+
+    def seen(self, url: str) -> bool:
+        """Check whether a URL (after canonicalization) was already added."""
+        url = canonicalize_url(url)
+        return url in self._bloom if self._bloom is not None else url in self._seen
+
+    def _mark_seen(self, url: str) -> None:
+        """Record a canonical URL as seen, moving to the Bloom filter past the exact threshold."""
+        if self._bloom is not None:
+            self._bloom.add(url)
+            return
+        self._seen.add(url)
+        if len(self._seen) > self.exact_threshold:
+            self._bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            for seen_url in self._seen:
+                self._bloom.add(seen_url)
+            self._seen = set()
+
+    def push(self, url: str, depth: int = 0) -> Optional[str]:
+        """
+        Add a URL unless an equivalent URL was already added.
+
+        Args:
+            url: Absolute URL
+            depth: Link depth of the URL
+
+        Returns:
+            Optional[str]: The canonical URL if it was added, None if it is a duplicate
+        """
+        url = canonicalize_url(url)
+        if self.seen(url):
+            return None
+        self._mark_seen(url)
+        heapq.heappush(self._heap, (depth - self.score(url), self._counter, url, depth))
+        self._counter += 1
+        return url
+
+    def requeue(self, url: str, depth: int) -> None:
+        """Put back a URL that was taken but not crawled (e.g. in flight when a crawl was paused)."""
+        heapq.heappush(self._heap, (depth - self.score(url), self._counter, url, depth))
+        self._counter += 1
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Take the highest-priority URL.
+
+        Returns:
+            Optional[Tuple[str, int]]: URL and depth, or None if the frontier is empty
+        """
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the frontier (pending URLs and seen set) to a JSON-compatible dict."""
+        return {
+            'counter': self._counter,
+            'pending': [[url, depth] for _, _, url, depth in sorted(self._heap)],
+            'seen': sorted(self._seen),
+            'bloom': self._bloom.to_dict() if self._bloom is not None else None,
+        }
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Restore the state serialized with to_dict() (scores are recomputed with the current url_scores)."""
+        self._counter = 0
+        self._heap = []
+        for url, depth in data.get('pending', []):
+            heapq.heappush(self._heap, (depth - self.score(url), self._counter, url, depth))
+            self._counter += 1
+        self._counter = max(self._counter, data.get('counter', 0))
+        self._seen = set(data.get('seen', []))
+        self._bloom = BloomFilter.from_dict(data['bloom']) if data.get('bloom') else None
+
+    def save(self, path: Union[str, Path], extra: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Save the frontier to disk atomically.
+
+        Args:
+            path: Path of the JSON state file
+            extra: Optional additional state saved alongside (e.g. per-host page counts)
+        """
+        state = {'frontier': self.to_dict(), 'extra': extra or {}}
+        atomic_write_bytes(path, json.dumps(state, ensure_ascii=False).encode('utf-8'))
+
+    def load(self, path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Restore the frontier saved with save().
+
+        Args:
+            path: Path of the JSON state file
+
+        Returns:
+            Dict[str, Any]: The extra state saved alongside the frontier
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.load_dict(state['frontier'])
+        return state.get('extra', {})
@@ -0,0 +1,208 @@
+import argparse
+import hashlib
+import random
+import re
+import resource
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+from src.preprocessors.html_crawler_preprocessor import HTMLCrawlerPreprocessor
+
+WORDS = ("cloud server network load balancer instance volume snapshot backup region zone subnet "
+         "firewall policy certificate listener pool member health check kubernetes cluster node "
+         "database replica storage bucket object gateway route table monitor alarm metric").split()
+PAGE_PATTERN = re.compile(r'^/(docs|print)/page-(\d+)\.html$')
+
+
+class SyntheticSite:
+    """Deterministic synthetic documentation site generated on the fly."""
+
+    def __init__(
+        self,
+        pages: int = 500,
+        fanout: int = 5,
+        page_size: int = 4000,
+        duplicate_ratio: float = 0.1,
+        slow_ratio: float = 0.05,
+        slow_delay: float = 0.2,
+        seed: int = 0
+    ):
+        """
+        Initialize the site.
+
+        Args:
+            pages: Number of distinct documentation pages
+            fanout: Number of links to other pages on every page
+            page_size: Approximate size of the page text in bytes
+            duplicate_ratio: Fraction of pages that also have a near-duplicate print view
+            slow_ratio: Fraction of pages served with an extra delay
+            slow_delay: Extra delay in seconds of slow pages
+            seed: Random seed (the same seed always generates the same site)
+        """
+        self.pages = pages
+        self.fanout = fanout
+        self.page_size = page_size
+        self.slow_delay = slow_delay
+        rng = random.Random(seed)
+        self.duplicates = set(rng.sample(range(pages), int(pages * duplicate_ratio)))
+        self.slow = set(rng.sample(range(pages), int(pages * slow_ratio)))
+        self.seed = seed
+
+    def render(self, index: int, print_view: bool = False) -> bytes:
+        """Render page `index` (its print view adds a banner but keeps the same content)."""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        paragraphs = []
+        size = 0
+        while size < self.page_size:
+            paragraph = ' '.join(rng.choice(WORDS) for _ in range(60))
+            paragraphs.append(f"<p>{paragraph}</p>")
+            size += len(paragraph)
+        links = [f"<li><a href='/docs/page-{rng.randrange(self.pages)}.html'>Related</a></li>" for _ in range(self.fanout)]
+        if index + 1 < self.pages:
+            links.append(f"<li><a href='/docs/page-{index + 1}.html?utm_source=nav'>Next</a></li>")
+        if index in self.duplicates and not print_view:
+            links.append(f"<li><a href='/print/page-{index}.html'>Print</a></li>")
+        banner = "<p>Print view</p>" if print_view else ""
+        html = (
+            f"<html><head><title>Page {index}</title></head><body>"
+            f"<nav><a href='/'>Home</a><a href='/docs/page-0.html'>Docs</a></nav>"
+            f"<main><h1>Page {index}</h1>{banner}{''.join(paragraphs)}</main>"
+            f"<aside><ul>{''.join(links)}</ul></aside><footer>Synthetic docs</footer></body></html>"
+        )
+        return html.encode('utf-8')
+
+    def make_handler(self):
+        """Build the request handler class serving this site."""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/robots.txt':
+                    return self._send(200, b"User-agent: *\nAllow: /\n", 'text/plain')
+                match = PAGE_PATTERN.match(path)
+                if match is None or int(match.group(2)) >= site.pages:
+                    return self._send(404, b"not found", 'text/plain')
+                index = int(match.group(2))
+                print_view = match.group(1) == 'print'
+                if print_view and index not in site.duplicates:
+                    return self._send(404, b"not found", 'text/plain')
+                if index in site.slow:
+                    time.sleep(site.slow_delay)
+                body = site.render(index, print_view)
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(304, b"", 'text/html', etag)
+                self._send(200, body, 'text/html; charset=utf-8', etag)
+
+            def _send(self, status, body, content_type, etag=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Return the given percentile (0-1) of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_crawl(preprocessor: HTMLCrawlerPreprocessor, seed_url: str, label: str, trace_memory: bool = False) -> None:
+    """
+    Crawl the synthetic site once and print throughput, latency and memory figures.
+
+    tracemalloc slows the crawl down by an order of magnitude, so Python allocations are only
+    traced on request; max RSS is always reported.
+    """
+    latencies = []
+    transferred = []
+    preprocessor._reset_dedup()
+
+    def on_page(page):
+        latencies.append(page['elapsed'])
+        transferred.append(page.get('transferred', len(page['body'])))
+        preprocessor._record_page(page)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    stats = preprocessor.crawl_engine.run([seed_url], on_page=on_page)
+    seconds = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    pages = len(latencies)
+    print(f"\n{label}")
+    print("-" * 60)
+    print(f"pages fetched        {pages:>10d}   errors {stats.get('errors', 0)}, not modified {stats.get('not_modified', 0)}")
+    print(f"near-duplicates      {preprocessor.dedup_stats['pages']:>10d}   ({preprocessor.dedup_stats['bytes']:,d} bytes skipped)")
+    print(f"wall time            {seconds:>10.2f} s")
+    print(f"pages/sec            {pages / seconds:>10.1f}")
+    print(f"bytes/sec            {sum(transferred) / seconds:>10,.0f}")
+    print(f"latency p50/p90/p99  {percentile(latencies, 0.5) * 1000:>7.1f} / {percentile(latencies, 0.9) * 1000:.1f} / "
+          f"{percentile(latencies, 0.99) * 1000:.1f} ms (mean {statistics.mean(latencies or [0]) * 1000:.1f} ms)")
+    if peak is not None:
+        print(f"peak traced memory   {peak / 1024 / 1024:>10.1f} MiB")
+    print(f"max RSS              {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>10.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawler against a local synthetic doc site")
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--fanout', type=int, default=5)
+    parser.add_argument('--page-size', type=int, default=4000)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1)
+    parser.add_argument('--slow-ratio', type=float, default=0.05)
+    parser.add_argument('--slow-delay', type=float, default=0.2)
+    parser.add_argument('--concurrency', type=int, default=16, help="concurrent requests to the site")
+    parser.add_argument('--recrawl', action='store_true', help="crawl a second time to measure HTTP revalidation")
+    parser.add_argument('--trace-memory', action='store_true', help="report peak Python allocations (much slower)")
+    args = parser.parse_args()
+
+    site = SyntheticSite(args.pages, args.fanout, args.page_size, args.duplicate_ratio, args.slow_ratio, args.slow_delay)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), site.make_handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    seed_url = f"http://127.0.0.1:{server.server_address[1]}/docs/page-0.html"
+    print(f"Serving {args.pages} pages (+{len(site.duplicates)} print views, {len(site.slow)} slow) at {seed_url}")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            preprocessor = HTMLCrawlerPreprocessor(
+                max_pages=args.pages * 2,
+                max_depth=args.pages,
+                per_host_concurrency=args.concurrency,
+                per_host_delay=0.0,
+                max_connections=args.concurrency,
+                store_dir=Path(tmp_dir) / 'page_store',
+                http_cache_dir=Path(tmp_dir) / 'http_cache'
+            )
+            run_crawl(preprocessor, seed_url, "Cold crawl", args.trace_memory)
+            if args.recrawl:
+                run_crawl(preprocessor, seed_url, "Recrawl (conditional requests)", args.trace_memory)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+import difflib
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+from src.converters.pymupdf_converter import PyMuPDFConverter
+from src.preprocessors.pdf_preprocessor import PDFPreprocessor
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+RAW_DIR = PROJECT_ROOT / 'data' / 'raw' / 'demo'
+# docling outputs of data/raw/demo, used as reference when docling is not installed
+PROCESSED_DIR = PROJECT_ROOT / 'data' / 'processed' / 'demo'
+
+
+def similarity(first: str, second: str) -> float:
+    """Word-level similarity (0-1) of two markdown documents, ignoring markdown punctuation."""
+    def tokens(text):
+        return re.sub(r'[#*|`_>\-]+', ' ', text).split()
+    return difflib.SequenceMatcher(None, tokens(first), tokens(second), autojunk=False).ratio()
+
+
+def convert_with_docling(pdf_file: Path) -> tuple:
+    """Convert a PDF with docling, returning (markdown, seconds)."""
+    preprocessor = PDFPreprocessor(use_cache=False)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_md = Path(tmp_dir) / f"{pdf_file.stem}.md"
+        start = time.perf_counter()
+        success = preprocessor._convert_pdf_to_markdown(pdf_file, output_md, tmp_dir)
+        seconds = time.perf_counter() - start
+        return (output_md.read_text(encoding='utf-8') if success else ""), seconds
+
+
+def main():
+    converter = PyMuPDFConverter()
+    use_docling = shutil.which("docling") is not None
+    print(f"Reference: {'docling (live run)' if use_docling else f'stored docling output in {PROCESSED_DIR}'}")
+    print("-" * 110)
+    print(f"{'file':45} {'pages':>5} {'tier':>7} {'fast s/page':>12} {'docling s/page':>15} {'similarity':>11}")
+
+    total_pages = 0
+    total_fast = 0.0
+    total_docling = 0.0
+    scores = []
+    for pdf_file in sorted(RAW_DIR.glob('**/*.pdf')):
+        with fitz.open(pdf_file) as doc:
+            pages = doc.page_count
+
+        start = time.perf_counter()
+        analysis = converter.analyze(pdf_file)
+        fast_markdown = converter.convert_to_markdown(pdf_file)
+        fast_seconds = time.perf_counter() - start
+
+        if use_docling:
+            reference, docling_seconds = convert_with_docling(pdf_file)
+        else:
+            reference_file = PROCESSED_DIR / pdf_file.relative_to(RAW_DIR).with_suffix('.md')
+            reference = reference_file.read_text(encoding='utf-8') if reference_file.exists() else ""
+            docling_seconds = None
+
+        score = similarity(fast_markdown, reference) if reference else None
+        if score is not None:
+            scores.append(score)
+        total_pages += pages
+        total_fast += fast_seconds
+        total_docling += docling_seconds or 0.0
+
+        tier = "fast" if analysis['simple'] else "docling"
+        docling_column = f"{docling_seconds / pages:15.3f}" if docling_seconds is not None else f"{'-':>15}"
+        score_column = f"{score:11.3f}" if score is not None else f"{'-':>11}"
+        print(f"{pdf_file.name[:45]:45} {pages:5d} {tier:>7} {fast_seconds / pages:12.4f} {docling_column} {score_column}")
+        for reason in analysis['reasons']:
+            print(f"    ↳ escalate: {reason}")
+
+    print("-" * 110)
+    print(f"Fast path: {total_fast / max(total_pages, 1):.4f} s/page over {total_pages} pages")
+    if use_docling:
+        print(f"Docling:   {total_docling / max(total_pages, 1):.4f} s/page")
+    if scores:
+        print(f"Mean similarity to docling: {sum(scores) / len(scores):.3f}")
+
+
+if __name__ == '__main__':
+    main()
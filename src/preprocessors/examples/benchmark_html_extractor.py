@@ -0,0 +1,96 @@
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.preprocessors.html_content_extractor import HTMLContentExtractor
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+HTML_DIR = PROJECT_ROOT / 'data' / 'raw' / 'demo' / 'html'
+ROUNDS = 5
+# ASP.NET WebForms page: the whole content sits inside one <form>, next to a search form
+WEBFORMS_PAGE = """<html><body><form id="form1" method="post" action="./Default.aspx">
+<input type="hidden" name="__VIEWSTATE" value="dDwtMTA4MTY2NjQ5Njs7Pg==">
+<form class="search-form" role="search"><input type="text" name="q"><button>Search</button></form>
+<div><h1>Title</h1><p>Main content of the page that must survive extraction.</p></div>
+</form></body></html>"""
+# Documentation whose tables and lists are mostly links, with and without a <main> element
+LINK_CONTENT_PAGES = {
+    "<main> page": """<html><body><nav><a href="/">Home</a><a href="/docs">Docs</a></nav><main>
+<h1>API reference</h1>
+<table><tr><th>Endpoint</th><th>Guide</th></tr>
+<tr><td><a href="/api/servers">GET /v2/servers</a></td><td><a href="/guide/servers">Servers</a></td></tr>
+<tr><td><a href="/api/volumes">GET /v2/volumes</a></td><td><a href="/guide/volumes">Volumes</a></td></tr></table>
+<ul><li><a href="/docs/quotas">Quotas and limits</a></li><li><a href="/docs/regions">Regions</a></li></ul>
+</main></body></html>""",
+    "<body> page": """<html><body><div class="menu"><a href="/">Home</a><a href="/docs">Docs</a></div>
+<h1>API reference</h1>
+<div><table><tr><th>Endpoint</th><th>Guide</th></tr>
+<tr><td><a href="/api/servers">GET /v2/servers</a></td><td><a href="/guide/servers">Servers</a></td></tr>
+<tr><td><a href="/api/volumes">GET /v2/volumes</a></td><td><a href="/guide/volumes">Volumes</a></td></tr></table></div>
+<ul><li><a href="/docs/quotas">Quotas and limits</a></li><li><a href="/docs/regions">Regions</a></li></ul>
+</body></html>""",
+}
+
+
+def legacy_clean_html(html_content: str) -> str:
+    """Previous HTMLCrawlerPreprocessor._clean_html (html.parser, keeps script contents), for comparison."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    text = soup.get_text(separator='\n', strip=True)
+    script_content = "\n\n".join(script.get_text() for script in soup.find_all("script"))
+    text = text + "\n" + script_content
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line:
+            lines.append(' '.join(line.split()))
+    return '\n\n'.join(lines)
+
+
+def run(name: str, clean, pages: list) -> None:
+    """Clean every page ROUNDS times and print throughput and output size."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        outputs = [clean(html) for html in pages]
+    seconds = time.perf_counter() - start
+    input_bytes = sum(len(html.encode('utf-8')) for html in pages)
+    output_bytes = sum(len(output.encode('utf-8')) for output in outputs)
+    print(f"{name:12} {len(pages) * ROUNDS / seconds:12.1f} {input_bytes:14,d} {output_bytes:14,d} "
+          f"{output_bytes / max(input_bytes, 1):9.1%}")
+
+
+def check_webforms() -> None:
+    """Check that a page wrapped in a WebForms <form> keeps its content."""
+    markdown = HTMLContentExtractor().extract(WEBFORMS_PAGE)
+    kept = 'Title' in markdown and 'Main content' in markdown and 'Search' not in markdown
+    print(f"{'✅' if kept else '❌'} WebForms page: {markdown!r}")
+
+
+def check_link_content() -> None:
+    """Check that tables and lists of links survive while the navigation around them is dropped."""
+    for name, html in LINK_CONTENT_PAGES.items():
+        markdown = HTMLContentExtractor().extract(html)
+        kept = all(text in markdown for text in ('GET /v2/volumes', 'Servers', 'Quotas and limits', 'Regions'))
+        kept = kept and 'Home' not in markdown
+        print(f"{'✅' if kept else '❌'} Links in {name}: {markdown!r}")
+
+
+def main():
+    # Optional argument: directory of HTML pages (e.g. output_dir of a crawl)
+    html_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else HTML_DIR
+    pages = [path.read_text(encoding='utf-8', errors='replace') for path in sorted(html_dir.glob('**/*.html'))]
+    if not pages:
+        print(f"❌ No HTML files found in {html_dir}")
+        return
+
+    print(f"{len(pages)} pages from {html_dir}, {ROUNDS} rounds")
+    print(f"{'cleaner':12} {'pages/sec':>12} {'input bytes':>14} {'output bytes':>14} {'ratio':>9}")
+    run("legacy", legacy_clean_html, pages)
+    run("extractor", HTMLContentExtractor().extract, pages)
+    check_webforms()
+    check_link_content()
+
+
+if __name__ == '__main__':
+    main()
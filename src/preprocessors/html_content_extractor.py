@@ -0,0 +1,309 @@
+import re
+from typing import List, Dict, Union, Optional
+
+import lxml.html
+from lxml import etree
+
+# Elements that never hold readable page content (form controls only: ASP.NET WebForms wrap whole pages in <form>)
+DROP_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'object', 'embed', 'button', 'select', 'input', 'textarea']
+BOILERPLATE_ROLES = {'navigation', 'banner', 'contentinfo', 'complementary', 'search', 'menu', 'menubar', 'dialog'}
+BOILERPLATE_TAGS = {'nav', 'footer', 'aside'}
+BOILERPLATE_PATTERN = re.compile(
+    r'(^|[\s_-])(nav|navbar|menu|footer|sidebar|breadcrumbs?|cookie|consent|banner|social|share|advert|ads|promo|related|pagination|toc)($|[\s_-])',
+    re.IGNORECASE
+)
+# Containers that are candidates for boilerplate removal
+CANDIDATE_TAGS = {'div', 'section', 'header', 'ul', 'ol', 'table', 'p', 'span', 'dl', 'form'}
+# Generic containers also dropped for their link density alone (tables and lists of links are often content)
+LINK_DENSITY_TAGS = {'div', 'section', 'header', 'span'}
+# Everything else (including custom elements of JS frameworks) is rendered as a block container
+INLINE_TAGS = {
+    'a', 'abbr', 'b', 'bdi', 'bdo', 'br', 'cite', 'code', 'data', 'del', 'dfn', 'em', 'font', 'i', 'img',
+    'ins', 'kbd', 'label', 'mark', 'q', 's', 'samp', 'small', 'span', 'strong', 'sub', 'sup', 'time', 'u',
+    'var', 'wbr'
+}
+HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+CODE_LANGUAGE_PATTERN = re.compile(r'(?:language|lang)-([\w+#-]+)')
+WHITESPACE_PATTERN = re.compile(r'[ \t\r\n\f\v]+')
+# Marks an explicit <br> line break while source whitespace is collapsed
+LINE_BREAK = '\u2028'
+
+
+class HTMLContentExtractor:
+    """
+    Main-content extractor for web pages built on lxml's C parser.
+
+    Drops scripts, styles, navigation, footers and other boilerplate (by tag, ARIA role,
+    class/id names and link density) and renders the remaining content as markdown,
+    keeping headings, lists, tables and code blocks.
+    """
+
+    def __init__(self, max_link_density: float = 0.5, min_boilerplate_text: int = 200):
+        """
+        Initialize the extractor.
+
+        Args:
+            max_link_density: Fraction of link text above which a container with several links
+                              is treated as navigation
+            min_boilerplate_text: Text length below which a container with a boilerplate class/id
+                                  (menu, footer, sidebar, ...) is dropped regardless of its link density
+        """
+        self.max_link_density = max_link_density
+        self.min_boilerplate_text = min_boilerplate_text
+
+    @staticmethod
+    def _parse(html_content: Union[str, bytes]) -> Optional[etree._Element]:
+        """Parse an HTML document, returning None for empty or unparsable input."""
+        if not html_content or not html_content.strip():
+            return None
+        try:
+            return lxml.html.document_fromstring(html_content)
+        except ValueError:
+            # Strings with an XML encoding declaration must be parsed from bytes
+            return lxml.html.document_fromstring(html_content.encode('utf-8'))
+        except etree.ParserError:
+            return None
+
+    @staticmethod
+    def _text_lengths(root: etree._Element) -> Dict[etree._Element, tuple]:
+        """
+        Compute the text length and link text length of every element in one bottom-up pass.
+
+        Returns:
+            Dict[etree._Element, tuple]: (text length, link text length, link count) per element
+        """
+        stats = {}
+        for element in reversed(list(root.iter())):
+            if not isinstance(element.tag, str):
+                continue
+            text = len((element.text or '').strip())
+            links = 0
+            count = 0
+            for child in element:
+                child_text, child_links, child_count = stats.get(child, (0, 0, 0))
+                text += child_text + len((child.tail or '').strip())
+                links += child_links
+                count += child_count
+            if element.tag == 'a':
+                links = text
+                count += 1
+            stats[element] = (text, links, count)
+        return stats
+
+    def _is_boilerplate(
+        self,
+        element: etree._Element,
+        stats: Dict[etree._Element, tuple],
+        in_content_root: bool = False
+    ) -> bool:
+        """
+        Decide whether an element is navigation or other boilerplate.
+
+        Args:
+            element: Element to check
+            stats: Text statistics of the tree (see _text_lengths)
+            in_content_root: Whether the element is inside an explicit <main>/<article> root, where
+                             only link-heavy blocks named as boilerplate are dropped
+
+        Returns:
+            bool: True if the element should be removed
+        """
+        role = (element.get('role') or '').lower()
+        if element.tag in BOILERPLATE_TAGS or role in BOILERPLATE_ROLES:
+            return True
+        if element.tag not in CANDIDATE_TAGS:
+            return False
+
+        text, links, count = stats.get(element, (0, 0, 0))
+        if not text:
+            return False
+        link_density = links / text
+        names = f"{element.get('class', '')} {element.get('id', '')}"
+        if BOILERPLATE_PATTERN.search(names):
+            # Inside <main>/<article>, short blocks named e.g. "primary-banner" or "nav-link" are heroes and tabs
+            if link_density > 0.2 or (text < self.min_boilerplate_text and not in_content_root):
+                return True
+        if in_content_root or element.tag not in LINK_DENSITY_TAGS:
+            return False
+        # Containers wrapping a table (e.g. a reference of linked endpoints) are content
+        return count >= 2 and link_density > self.max_link_density and element.find('.//table') is None
+
+    def _select_root(self, document: etree._Element) -> etree._Element:
+        """Pick the main content container: <main>, role="main", a single <article>, or <body>."""
+        main = document.xpath('//main | //*[@role="main"]')
+        if main:
+            return main[0]
+        articles = document.xpath('//article')
+        if len(articles) == 1:
+            return articles[0]
+        body = document.find('body')
+        return body if body is not None else document
+
+    def _clean_tree(self, root: etree._Element, in_content_root: bool = False) -> None:
+        """Remove non-content elements and boilerplate containers in place (see _is_boilerplate)."""
+        etree.strip_elements(root, *DROP_TAGS, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+        stats = self._text_lengths(root)
+        removed = set()
+        for element in list(root.iter()):
+            if element is root or not isinstance(element.tag, str):
+                continue
+            parent = element.getparent()
+            if parent in removed:
+                removed.add(element)
+                continue
+            if self._is_boilerplate(element, stats, in_content_root):
+                removed.add(element)
+                element.drop_tree()
+
+    def _inline_element(self, element: etree._Element) -> str:
+        """Render one inline element (without its tail)."""
+        if element.tag == 'br':
+            return LINE_BREAK
+        if element.tag == 'code':
+            code = WHITESPACE_PATTERN.sub(' ', element.text_content()).strip()
+            return f" `{code}` " if code else ''
+        if element.tag == 'img':
+            return element.get('alt') or ''
+        return self._inline(element)
+
+    def _inline(self, element: etree._Element) -> str:
+        """Render the inline content of an element (text, inline code, line breaks)."""
+        parts = [element.text or '']
+        for child in element:
+            if isinstance(child.tag, str):
+                parts.append(self._inline_element(child))
+            parts.append(child.tail or '')
+        return ''.join(parts)
+
+    @staticmethod
+    def _is_block(element: etree._Element) -> bool:
+        """Check whether an element must be rendered as a block (not inline tag or wrapping blocks)."""
+        if element.tag not in INLINE_TAGS:
+            return True
+        return any(
+            isinstance(descendant.tag, str) and descendant.tag not in INLINE_TAGS
+            for descendant in element.iterdescendants()
+        )
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Collapse source whitespace while keeping explicit <br> line breaks."""
+        lines = (WHITESPACE_PATTERN.sub(' ', line).strip() for line in text.split(LINE_BREAK))
+        return '\n'.join(line for line in lines if line)
+
+    def _render_table(self, table: etree._Element) -> str:
+        """Render a table as a markdown pipe table (first row as header)."""
+        rows = []
+        for row in table.iter('tr'):
+            if row.xpath('ancestor::table[1]')[0] is not table:
+                continue  # row of a nested table
+            cells = [
+                ' <br> '.join(self._render_children(cell)).replace('\n', ' <br> ').replace('|', '\\|')
+                for cell in row if isinstance(cell.tag, str) and cell.tag in ('td', 'th')
+            ]
+            if any(cells):
+                rows.append(cells)
+        if not rows:
+            return ''
+
+        width = max(len(row) for row in rows)
+        rows = [row + [''] * (width - len(row)) for row in rows]
+        lines = ['| ' + ' | '.join(rows[0]) + ' |', '| ' + ' | '.join(['---'] * width) + ' |']
+        lines.extend('| ' + ' | '.join(row) + ' |' for row in rows[1:])
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _render_code(pre: etree._Element) -> str:
+        """Render a <pre> block as a fenced code block, keeping its whitespace."""
+        code = pre.text_content().strip('\n')
+        if not code.strip():
+            return ''
+        language = ''
+        for element in [pre] + pre.findall('code'):
+            match = CODE_LANGUAGE_PATTERN.search(element.get('class', ''))
+            if match:
+                language = match.group(1)
+                break
+        return f"```{language}\n{code}\n```"
+
+    def _render_list(self, element: etree._Element) -> str:
+        """Render an ordered or unordered list, indenting nested lists."""
+        items = []
+        number = int(element.get('start', '1')) if element.get('start', '1').isdigit() else 1
+        for item in element:
+            if not isinstance(item.tag, str) or item.tag != 'li':
+                continue
+            marker = f"{number}. " if element.tag == 'ol' else "- "
+            number += 1
+            content = '\n'.join(self._render_children(item))
+            if not content:
+                continue
+            lines = content.split('\n')
+            items.append(marker + lines[0] + ''.join('\n' + ' ' * len(marker) + line for line in lines[1:]))
+        return '\n'.join(items)
+
+    def _render_block(self, element: etree._Element) -> List[str]:
+        """Render a block-level element to markdown blocks."""
+        tag = element.tag
+        if tag in HEADING_TAGS:
+            text = self._normalize(self._inline(element)).replace('\n', ' ')
+            return [f"{'#' * HEADING_TAGS[tag]} {text}"] if text else []
+        if tag in ('ul', 'ol'):
+            rendered = self._render_list(element)
+            return [rendered] if rendered else []
+        if tag == 'table':
+            rendered = self._render_table(element)
+            return [rendered] if rendered else []
+        if tag == 'pre':
+            rendered = self._render_code(element)
+            return [rendered] if rendered else []
+        if tag == 'hr':
+            return []
+        if tag == 'blockquote':
+            content = '\n\n'.join(self._render_children(element))
+            return ['\n'.join(f"> {line}" if line else '>' for line in content.split('\n'))] if content else []
+        return self._render_children(element)
+
+    def _render_children(self, element: etree._Element) -> List[str]:
+        """Render the mixed inline and block content of a container."""
+        blocks = []
+        buffer = [element.text or '']
+
+        def flush():
+            text = self._normalize(''.join(buffer))
+            if text:
+                blocks.append(text)
+            buffer.clear()
+
+        for child in element:
+            if isinstance(child.tag, str) and self._is_block(child):
+                flush()
+                blocks.extend(self._render_block(child))
+            elif isinstance(child.tag, str):
+                buffer.append(self._inline_element(child))
+            buffer.append(child.tail or '')
+        flush()
+        return blocks
+
+    def extract(self, html_content: Union[str, bytes]) -> str:
+        """
+        Extract the main content of an HTML page as markdown.
+
+        Args:
+            html_content: Raw HTML content
+
+        Returns:
+            str: Markdown of the page's main content (empty string for empty pages)
+        """
+        document = self._parse(html_content)
+        if document is None:
+            return ''
+
+        title = self._normalize(document.findtext('.//title') or '').replace('\n', ' ')
+        root = self._select_root(document)
+        self._clean_tree(root, in_content_root=root.tag not in ('body', 'html'))
+        blocks = self._render_children(root)
+
+        if title and not any(block.startswith('# ') for block in blocks):
+            blocks.insert(0, f"# {title}")
+        return '\n\n'.join(blocks)
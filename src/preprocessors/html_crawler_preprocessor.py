@@ -1,13 +1,25 @@
-from typing import Optional
+import json
+import queue
+import re
+import threading
+from typing import Optional, List, Dict, Iterator, Tuple, Callable
 from urllib.parse import urlparse
 
 import requests
 import scrapy
-from bs4 import BeautifulSoup
 from pathlib import Path
 from scrapy.crawler import CrawlerProcess
 from scrapy.utils.project import get_project_settings
 
+from .crawl_engine import CHARSET_PATTERN, AsyncCrawlEngine
+from .crawl_frontier import URLFrontier
+from .html_content_extractor import HTMLContentExtractor
+from .page_store import PageStore
+from ..utils.cache_utils import compute_text_hash, atomic_write_bytes
+from ..utils.http_cache import HTTPCache, get_header
+from ..utils.simhash import simhash, SimHashIndex
+from ..utils.url_utils import canonicalize_url
+
 
 class WebSpider(scrapy.Spider):
     """Scrapy spider for crawling web content."""
@@ -20,10 +32,23 @@ class WebSpider(scrapy.Spider):
         'CONCURRENT_REQUESTS': 1,
     }
     
-    def __init__(self, url: str, output_file: str, *args, **kwargs):
+    def __init__(
+        self,
+        url: str,
+        output_file: str,
+        on_page: Callable[[Dict], Optional[str]] = None,
+        url_scores: Dict[str, float] = None,
+        *args,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
         self.start_urls = [url]
         self.output_file = output_file
+        # Called with every crawled page; returns the URL it duplicates, if any
+        self.on_page = on_page
+        # Canonical-URL deduplication and per-pattern priorities of followed links
+        self.frontier = URLFrontier(url_scores=url_scores)
+        self.frontier.push(url)
         self.content = None  # Chỉ lưu nội dung trang đầu tiên
         
     def parse(self, response):
@@ -31,12 +56,31 @@ class WebSpider(scrapy.Spider):
         # Chỉ lưu nội dung trang đầu tiên
         if self.content is None:
             self.content = response.text
+        
+        # Stream every crawled page to the page store
+        if self.on_page is not None:
+            page = {
+                'url': canonicalize_url(response.request.url),
+                'final_url': response.url,
+                'status': response.status,
+                'headers': response.headers.to_unicode_dict(),
+                'body': response.body,
+            }
+            if response.status == 200 and 'html' in (get_header(page['headers'], 'Content-Type') or 'text/html'):
+                page['text'] = response.text
+            if self.on_page(page):
+                # Near-duplicate of a page already crawled: its links were followed there
+                return
             
-        # Follow links within the same domain
-        domain = urlparse(response.url).netloc
+        # Follow links within the same domain, skipping variants of already seen URLs
+        domain = urlparse(canonicalize_url(response.url)).netloc
         for href in response.css('a::attr(href)').getall():
-            if href.startswith('/') or urlparse(href).netloc == domain:
-                yield response.follow(href, self.parse)
+            url = response.urljoin(href)
+            if urlparse(url).scheme not in ('http', 'https'):
+                continue
+            url = self.frontier.push(url)
+            if url and urlparse(url).netloc == domain:
+                yield scrapy.Request(url, callback=self.parse, priority=int(self.frontier.score(url) * 10))
     
     def closed(self, reason):
         """Save content when spider is closed."""
@@ -48,49 +92,146 @@ class WebSpider(scrapy.Spider):
 class HTMLCrawlerPreprocessor:
     """Preprocessor for crawling and cleaning web content."""
     
-    def __init__(self, max_pages: int = 10, max_depth: int = 2):
+    def __init__(
+        self,
+        max_pages: int = 10,
+        max_depth: int = 2,
+        engine: str = "asyncio",
+        per_host_concurrency: int = 4,
+        per_host_delay: float = 0.25,
+        max_connections: int = 32,
+        store_dir: str = None,
+        use_http_cache: bool = True,
+        http_cache_dir: str = None,
+        url_scores: Dict[str, float] = None,
+        crawl_state_dir: str = None,
+        dedup: bool = True,
+        dedup_max_distance: int = 3,
+        dedup_min_words: int = 20
+    ):
         """
         Initialize the HTML crawler preprocessor.
         
         Args:
             max_pages: Maximum number of pages to crawl
             max_depth: Maximum depth of crawling
+            engine: Crawl engine, "asyncio" (default) or "scrapy"
+            per_host_concurrency: Maximum number of concurrent requests to one host (asyncio engine)
+            per_host_delay: Minimum delay in seconds between requests to one host (asyncio engine)
+            max_connections: Maximum number of open connections across all hosts (asyncio engine)
+            store_dir: Directory of the page store every crawled page is streamed to
+                       (default: output_dir/page_store)
+            use_http_cache: Whether to revalidate previously crawled pages with conditional requests
+            http_cache_dir: Directory of the HTTP revalidation cache (default: output_dir/http_cache)
+            url_scores: Map of URL regex to crawl priority score (e.g. {r'/docs/': 1.0, r'/tag/': -2.0})
+            crawl_state_dir: Optional directory where the crawl frontier is saved so an interrupted
+                             crawl resumes where it stopped
+            dedup: Whether to record near-duplicate pages (SimHash of the cleaned content) as aliases
+                   instead of storing and processing them again
+            dedup_max_distance: Maximum Hamming distance of two 64-bit SimHash fingerprints of near-duplicates
+            dedup_min_words: Minimum number of words of a cleaned page for it to be deduplicated
         """
+        if engine not in ("asyncio", "scrapy"):
+            raise ValueError(f"Unsupported crawl engine: {engine}. Supported engines: ['asyncio', 'scrapy']")
         self.max_pages = max_pages
         self.max_depth = max_depth
+        self.engine = engine
         self.process = None
+        self.content_extractor = HTMLContentExtractor()
+        self.page_store = PageStore(store_dir or Path('output_dir') / 'page_store')
+        self.http_cache_dir = Path(http_cache_dir or Path('output_dir') / 'http_cache')
+        self.http_cache = HTTPCache(self.http_cache_dir) if use_http_cache else None
+        # URLs of the last run whose content was unchanged (answered with 304 Not Modified)
+        self.unchanged_urls = set()
+        self.dedup = dedup
+        self.dedup_max_distance = dedup_max_distance
+        self.dedup_min_words = dedup_min_words
+        self._reset_dedup()
+        self.url_scores = url_scores
+        self.crawl_state_dir = Path(crawl_state_dir) if crawl_state_dir else None
+        self.engine_options = {
+            'max_connections': max_connections,
+            'per_host_concurrency': per_host_concurrency,
+            'per_host_delay': per_host_delay,
+            'http_cache': self.http_cache,
+        }
+        self.crawl_engine = AsyncCrawlEngine(
+            max_pages=max_pages,
+            max_depth=max_depth,
+            url_scores=url_scores,
+            state_path=self.crawl_state_dir / 'frontier.json' if self.crawl_state_dir else None,
+            **self.engine_options
+        )
     
     def _clean_html(self, html_content: str) -> str:
         """
-        Clean HTML content using BeautifulSoup while preserving all text content.
+        Extract the main content of an HTML page as markdown.
+        
+        Scripts, styles, navigation and footers are dropped; headings, lists,
+        tables and code blocks are kept (see HTMLContentExtractor).
         
         Args:
             html_content: Raw HTML content
             
         Returns:
-            str: Cleaned text content with HTML tags removed
+            str: Markdown of the page's main content
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Get all text content, including from scripts and styles
-        text = soup.get_text(separator='\n', strip=True)
-
-        script_content = "\n\n".join(script.get_text() for script in soup.find_all("script"))
-
-        # Kết hợp cả hai nội dung
-        text = text + "\n" + script_content
+        return self.content_extractor.extract(html_content)
+    
+    def _reset_dedup(self) -> None:
+        """Start a new near-duplicate index; aliases map canonical URLs to the URL they duplicate."""
+        self.simhash_index = SimHashIndex(max_distance=self.dedup_max_distance)
+        self.aliases: Dict[str, str] = {}
+        self.dedup_stats = {'pages': 0, 'bytes': 0}
+    
+    def _record_page(self, page: Dict) -> Optional[str]:
+        """
+        Stream a crawled page to the page store, or record it as an alias if it nearly duplicates
+        a page already crawled in this run.
         
-        # Clean up whitespace but preserve line breaks
-        lines = []
-        for line in text.split('\n'):
-            line = line.strip()
-            if line:
-                # Remove multiple spaces but preserve single spaces
-                line = ' '.join(line.split())
-                lines.append(line)
+        Args:
+            page: Crawled page dict (see AsyncCrawlEngine.crawl)
+            
+        Returns:
+            Optional[str]: URL of the page it duplicates, or None if the page was stored
+        """
+        url = page['url']
+        if self.dedup and page['status'] == 200 and 'text' in page:
+            fingerprint = None
+            if page.get('not_modified'):
+                # Reuse the fingerprint stored with the unchanged page instead of cleaning it again
+                fingerprint = (self.page_store.get_entry(url) or {}).get('simhash')
+            if fingerprint is None:
+                cleaned_content = self._clean_html(page['text'])
+                page['cleaned'] = cleaned_content
+                if len(cleaned_content.split()) >= self.dedup_min_words:
+                    fingerprint = simhash(cleaned_content)
+            
+            if fingerprint is not None:
+                match = self.simhash_index.find(fingerprint)
+                if match is not None and match[0] != url:
+                    self.aliases[url] = match[0]
+                    self.dedup_stats['pages'] += 1
+                    self.dedup_stats['bytes'] += len(page['body'])
+                    self.page_store.add_alias(url, match[0], distance=match[1], length=len(page['body']))
+                    return match[0]
+                self.simhash_index.add(url, fingerprint)
+                page['simhash'] = fingerprint
         
-        # Join lines with double newlines for better readability
-        return '\n\n'.join(lines)
+        # Unchanged pages are already in the store
+        if not page.get('not_modified') or url not in self.page_store:
+            self.page_store.append(page)
+        return None
+    
+    def get_alias_target(self, url: str) -> Optional[str]:
+        """Return the URL whose content a URL duplicated in the last crawl (None if it is not an alias)."""
+        return self.aliases.get(canonicalize_url(url))
+    
+    def _print_dedup_report(self) -> None:
+        """Print how many near-duplicate pages were skipped."""
+        if self.dedup_stats['pages']:
+            print(f"♻️ Skipped {self.dedup_stats['pages']} near-duplicate pages "
+                  f"({self.dedup_stats['bytes']} bytes) recorded as aliases")
     
     def _crawl_with_scrapy(self, url: str, output_file: str) -> bool:
         """
@@ -109,18 +250,66 @@ class HTMLCrawlerPreprocessor:
             settings.update({
                 'CLOSESPIDER_PAGECOUNT': self.max_pages,
                 'CLOSESPIDER_DEPTH': self.max_depth,
-                'LOG_LEVEL': 'ERROR'
+                'LOG_LEVEL': 'ERROR',
+                # Breadth-first: lower depth is crawled first
+                'DEPTH_PRIORITY': 1,
+                'SCHEDULER_DISK_QUEUE': 'scrapy.squeues.PickleFifoDiskQueue',
+                'SCHEDULER_MEMORY_QUEUE': 'scrapy.squeues.FifoMemoryQueue'
             })
+            if self.crawl_state_dir is not None:
+                # Scrapy persists its scheduler queue and seen requests in JOBDIR to pause and resume
+                settings.set('JOBDIR', str(self.crawl_state_dir / 'scrapy'))
+            if self.http_cache is not None:
+                # Scrapy's RFC 2616 cache policy revalidates cached pages with conditional requests
+                settings.update({
+                    'HTTPCACHE_ENABLED': True,
+                    'HTTPCACHE_POLICY': 'scrapy.extensions.httpcache.RFC2616Policy',
+                    'HTTPCACHE_DIR': str((self.http_cache_dir / 'scrapy').resolve())
+                })
             
             # Create and run spider
             process = CrawlerProcess(settings)
-            process.crawl(WebSpider, url=url, output_file=output_file)
+            process.crawl(
+                WebSpider,
+                url=url,
+                output_file=output_file,
+                on_page=self._record_page,
+                url_scores=self.url_scores
+            )
             process.start()
+            self._print_dedup_report()
             return True
         except Exception as e:
             print(f"❌ Error crawling with Scrapy: {e}")
             return False
     
+    def _crawl_with_engine(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Crawl any number of URLs in one run of the asyncio crawl engine.
+        
+        Args:
+            urls: Seed URLs to crawl
+            
+        Returns:
+            Dict[str, str]: Raw HTML of each seed URL that could be fetched
+        """
+        seeds = {canonicalize_url(url): url for url in urls}
+        contents = {}
+        
+        def on_page(page: Dict) -> None:
+            self._record_page(page)
+            if page['url'] in seeds and page['status'] == 200 and 'text' in page:
+                contents[seeds[page['url']]] = page['text']
+                if page.get('not_modified'):
+                    self.unchanged_urls.add(seeds[page['url']])
+        
+        stats = self.crawl_engine.run(list(seeds), on_page=on_page)
+        print(f"🕸️ Crawled {stats.get('pages', 0)} pages ({stats.get('bytes', 0)} bytes, "
+              f"{stats.get('not_modified', 0)} not modified) "
+              f"in {stats.get('seconds', 0.0):.1f}s with {stats.get('errors', 0)} errors")
+        self._print_dedup_report()
+        return contents
+    
     def _crawl_with_requests(self, url: str, output_file: str) -> bool:
         """
         Crawl website using requests (fallback method).
@@ -133,11 +322,22 @@ class HTMLCrawlerPreprocessor:
             bool: True if crawling was successful
         """
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+            response = requests.get(url, timeout=30, headers=headers)
+            cached = self.http_cache.lookup(url) if response.status_code == 304 and self.http_cache else None
+            if cached is not None:
+                self.unchanged_urls.add(url)
+                html_content = cached['body'].decode(response.encoding or 'utf-8', errors='replace')
+            else:
+                if response.status_code == 304:
+                    response = requests.get(url, timeout=30)
+                response.raise_for_status()
+                if self.http_cache is not None:
+                    self.http_cache.store(url, response.status_code, response.headers, response.content)
+                html_content = response.text
             
             # Clean and save content
-            cleaned_content = self._clean_html(response.text)
+            cleaned_content = self._clean_html(html_content)
             with open(output_file, 'w', encoding='utf-8') as f:
                 f.write(cleaned_content)
             return True
@@ -145,6 +345,184 @@ class HTMLCrawlerPreprocessor:
             print(f"❌ Error crawling with requests: {e}")
             return False
     
+    def _get_output_file(self, url: str) -> Path:
+        """
+        Get the path of the raw HTML file saved for a URL.
+        
+        Pages of the same host get distinct names derived from their path and query.
+        
+        Args:
+            url: URL of the page
+            
+        Returns:
+            Path: Path of the HTML file in output_dir
+        """
+        output_dir = Path('output_dir')
+        output_dir.mkdir(exist_ok=True)
+        
+        parsed = urlparse(url)
+        name = parsed.netloc
+        path = re.sub(r'\.(html?|php|aspx?)$', '', parsed.path)
+        path_slug = re.sub(r'[^A-Za-z0-9._-]+', '_', path).strip('_')
+        if path_slug:
+            name += f"_{path_slug}"
+        if parsed.query:
+            name += f"_{compute_text_hash(parsed.query)[:8]}"
+        return output_dir / f"{name}.html"
+    
+    def iter_pages(self) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily read the crawled HTML pages back from the page store and clean them.
+        
+        Yields:
+            Tuple[str, str]: URL and cleaned content of every successfully fetched HTML page
+        """
+        for page in self.page_store.iter_pages():
+            content_type = get_header(page['headers'], 'Content-Type') or 'text/html'
+            if page['status'] != 200 or 'html' not in content_type:
+                continue
+            # Recorded encoding of the body, else the charset of the Content-Type header
+            charset = CHARSET_PATTERN.search(content_type)
+            encoding = page.get('encoding') or (charset.group(1) if charset else 'utf-8')
+            try:
+                text = page['body'].decode(encoding, errors='replace')
+            except LookupError:
+                text = page['body'].decode('utf-8', errors='replace')
+            yield page['url'], self._clean_html(text)
+    
+    def iter_crawl(self, urls: List[str], max_queue: int = 64) -> Iterator[Tuple[str, str]]:
+        """
+        Crawl URLs and yield every page's cleaned content as soon as it is fetched.
+        
+        The crawl runs on a background thread and hands pages over through a bounded queue:
+        when the consumer falls behind, fetching pauses until it catches up. When the consumer
+        stops early, the engine stops crawling once the pages in flight are done.
+        
+        Args:
+            urls: Seed URLs to crawl (links are followed within each seed's host)
+            max_queue: Maximum number of cleaned pages waiting for the consumer
+            
+        Yields:
+            Tuple[str, str]: Canonical URL and cleaned markdown of every fetched HTML page
+            (near-duplicates are recorded as aliases and not yielded)
+        """
+        self.unchanged_urls = set()
+        self._reset_dedup()
+        pages: queue.Queue = queue.Queue(maxsize=max_queue)
+        done = object()
+        stopped = threading.Event()
+        
+        def on_page(page: Dict):
+            if self._record_page(page) is not None or page['status'] != 200 or 'text' not in page:
+                return None
+            if stopped.is_set():
+                return None
+            if page.get('not_modified'):
+                self.unchanged_urls.add(page['url'])
+            content = page.get('cleaned')
+            if content is None:
+                content = self._clean_html(page['text'])
+            if not content.strip():
+                return None
+            # Blocks the engine's callback thread, not the event loop, while the queue is full
+            pages.put((page['url'], content))
+            return None
+        
+        def crawl():
+            try:
+                stats = self.crawl_engine.run(urls, on_page=on_page, stop_event=stopped)
+                print(f"🕸️ Crawled {stats.get('pages', 0)} pages ({stats.get('bytes', 0)} bytes, "
+                      f"{stats.get('not_modified', 0)} not modified) "
+                      f"in {stats.get('seconds', 0.0):.1f}s with {stats.get('errors', 0)} errors")
+                self._print_dedup_report()
+            except Exception as e:
+                print(f"❌ Error crawling with asyncio engine: {e}")
+            finally:
+                pages.put(done)
+        
+        thread = threading.Thread(target=crawl, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            # Consumer stopped early: stop the engine from starting new URLs and drain the
+            # queue so the pages still in flight can be handed over and the thread can finish
+            stopped.set()
+            while thread.is_alive():
+                try:
+                    pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            thread.join()
+    
+    def _save_cleaned(self, url: str, output_file: Path) -> str:
+        """Clean a crawled HTML file and save it as markdown next to it (skipped for unchanged pages)."""
+        md_file = output_file.with_suffix('.md')
+        if url in self.unchanged_urls and md_file.exists():
+            print(f"⏭️ Not modified since last crawl, skipping cleaning: {url}")
+            return str(md_file)
+        
+        with open(output_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        
+        cleaned_content = self._clean_html(html_content)
+        
+        with open(md_file, 'w', encoding='utf-8') as f:
+            f.write(cleaned_content)
+        
+        print(f"✅ Successfully processed URL: {url}")
+        return str(md_file)
+    
+    def process_urls(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        Process several URLs in a single crawl and return their cleaned content.
+        
+        Args:
+            urls: URLs to process
+            
+        Returns:
+            List[Optional[str]]: Path to the processed content file of each URL (None where processing failed)
+        """
+        self.unchanged_urls = set()
+        self._reset_dedup()
+        if self.engine == "scrapy":
+            return [self.process_url(url) for url in urls]
+        
+        try:
+            print(f"🔄 Processing {len(urls)} URLs")
+            contents = self._crawl_with_engine(urls)
+        except Exception as e:
+            print(f"❌ Error crawling with asyncio engine: {e}")
+            contents = {}
+        
+        results = []
+        for url in urls:
+            try:
+                output_file = self._get_output_file(url)
+                if url in self.unchanged_urls and output_file.exists():
+                    print(f"✅ Not modified: {url}")
+                elif url in contents:
+                    with open(output_file, 'w', encoding='utf-8') as f:
+                        f.write(contents[url])
+                    print(f"✅ Successfully crawled: {url}")
+                else:
+                    print("⚠️ Crawl engine failed, trying requests...")
+                    if not self._crawl_with_requests(url, str(output_file)):
+                        print("❌ Both crawling methods failed")
+                        results.append(None)
+                        continue
+                results.append(self._save_cleaned(url, output_file))
+            except Exception as e:
+                print(f"❌ Error processing URL {url}: {str(e)}")
+                import traceback
+                print(f"Traceback: {traceback.format_exc()}")
+                results.append(None)
+        return results
+    
     def process_url(self, url: str) -> Optional[str]:
         """
         Process a URL and return cleaned content.
@@ -155,15 +533,14 @@ class HTMLCrawlerPreprocessor:
         Returns:
             Optional[str]: Path to the processed content file, or None if processing failed
         """
+        if self.engine == "asyncio":
+            return self.process_urls([url])[0]
+        
         try:
             print(f"🔄 Processing URL: {url}")
             
-            # Create output directory if it doesn't exist
-            output_dir = Path('output_dir')
-            output_dir.mkdir(exist_ok=True)
-            
             # Generate output file path
-            output_file = output_dir / f"{urlparse(url).netloc}.html"
+            output_file = self._get_output_file(url)
             
             # Try Scrapy first
             if self._crawl_with_scrapy(url, str(output_file)):
@@ -174,22 +551,89 @@ class HTMLCrawlerPreprocessor:
                     print("❌ Both crawling methods failed")
                     return None
             
-            # Clean the crawled content
-            with open(output_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            cleaned_content = self._clean_html(html_content)
-            
-            # Save cleaned content
-            md_file = output_file.with_suffix('.md')
-            with open(md_file, 'w', encoding='utf-8') as f:
-                f.write(cleaned_content)
-            
-            print(f"✅ Successfully processed URL: {url}")
-            return str(md_file)
+            return self._save_cleaned(url, output_file)
             
         except Exception as e:
             print(f"❌ Error processing URL {url}: {str(e)}")
             import traceback
             print(f"Traceback: {traceback.format_exc()}")
-            return None 
\ No newline at end of file
+            return None
+    
+    def _load_sitemap_state(self, state_path: Path) -> Dict[str, Optional[str]]:
+        """Load the URL -> lastmod state of previous sitemap syncs."""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable sitemap state {state_path}: {e}")
+            return {}
+    
+    def sync_sitemaps(self, site_urls: List[str], state_path: str = None) -> Dict[str, str]:
+        """
+        Incrementally sync sites from their sitemaps instead of following links.
+        
+        Page URLs are read from the sitemaps declared in robots.txt (or /sitemap.xml), including
+        sitemap indexes and gzipped sitemaps. Only URLs that are new or whose lastmod is newer than in
+        the stored crawl state are fetched (URLs without lastmod are always revalidated). URLs no longer
+        listed are dropped from the state, unless a sitemap could not be read.
+        
+        Args:
+            site_urls: Any URL of each site to sync
+            state_path: Path of the JSON crawl state (default: output_dir/sitemap_state.json)
+            
+        Returns:
+            Dict[str, str]: Path to the processed content file of each fetched URL
+            (near-duplicates of other pages are recorded as aliases and not processed)
+        """
+        state_path = Path(state_path or Path('output_dir') / 'sitemap_state.json')
+        state = self._load_sitemap_state(state_path)
+        entries = self.crawl_engine.run_sitemap_discovery(site_urls)
+        
+        changed = [
+            url for url, lastmod in entries.items()
+            if url not in state or lastmod is None or lastmod > (state[url] or '')
+        ]
+        origins = {urlparse(canonicalize_url(url)).netloc for url in site_urls}
+        removed = [url for url in state if urlparse(url).netloc in origins and url not in entries]
+        if self.crawl_engine.sitemap_errors:
+            # An unreadable sitemap must not be mistaken for removed pages
+            removed = []
+        for url in removed:
+            del state[url]
+        print(f"🗺️ Sitemap sync: {len(entries)} listed, {len(changed)} new or changed, {len(removed)} removed")
+        
+        results = {}
+        self.unchanged_urls = set()
+        self._reset_dedup()
+        
+        def on_page(page: Dict) -> None:
+            alias_target = self._record_page(page)
+            if page['status'] != 200 or 'text' not in page:
+                return
+            if alias_target is not None:
+                state[page['url']] = entries.get(page['url'])
+                return
+            if page.get('not_modified'):
+                self.unchanged_urls.add(page['url'])
+            output_file = self._get_output_file(page['url'])
+            if page['url'] not in self.unchanged_urls or not output_file.exists():
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(page['text'])
+            results[page['url']] = self._save_cleaned(page['url'], output_file)
+            state[page['url']] = entries.get(page['url'])
+        
+        try:
+            if changed:
+                # Sitemaps list every page: fetch exactly the changed URLs without following links
+                engine = AsyncCrawlEngine(max_pages=len(changed), max_depth=0, **self.engine_options)
+                stats = engine.run(changed, on_page=on_page)
+                print(f"🕸️ Fetched {stats.get('pages', 0)} pages ({stats.get('bytes', 0)} bytes) "
+                      f"in {stats.get('seconds', 0.0):.1f}s with {stats.get('errors', 0)} errors")
+                self._print_dedup_report()
+        finally:
+            # Only successfully fetched pages update the state, failed ones are retried next sync
+            atomic_write_bytes(state_path, json.dumps(state, ensure_ascii=False, indent=2).encode('utf-8'))
+        
+        return results
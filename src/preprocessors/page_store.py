@@ -0,0 +1,248 @@
+import base64
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Union, Dict, Any, Optional, Iterator, List
+
+from ..utils.cache_utils import compute_text_hash
+
+
+class PageStore:
+    """
+    Append-only store of crawled pages.
+
+    Pages are appended as JSON lines to pages.jsonl (URL, status, headers, content hash and
+    gzip-compressed body). index.jsonl maps every URL to the byte offset and length of its latest
+    record, so single pages can be read back without scanning the whole store. aliases.jsonl maps
+    near-duplicate URLs to the URL whose content they repeat. chunks.jsonl records how many chunks
+    of every page were embedded into each vector store collection.
+    """
+
+    PAGES_FILE = "pages.jsonl"
+    INDEX_FILE = "index.jsonl"
+    ALIASES_FILE = "aliases.jsonl"
+    CHUNKS_FILE = "chunks.jsonl"
+
+    def __init__(self, store_dir: Union[str, Path]):
+        """
+        Initialize the page store.
+
+        Args:
+            store_dir: Directory holding the store files (created if missing)
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.pages_path = self.store_dir / self.PAGES_FILE
+        self.index_path = self.store_dir / self.INDEX_FILE
+        self.aliases_path = self.store_dir / self.ALIASES_FILE
+        self.chunks_path = self.store_dir / self.CHUNKS_FILE
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._aliases: Optional[Dict[str, Dict[str, Any]]] = None
+        self._chunk_counts: Optional[Dict[tuple, int]] = None
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the offset index (latest entry per URL wins)."""
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._index[entry['url']] = entry
+        return self._index
+
+    def _load_aliases(self) -> Dict[str, Dict[str, Any]]:
+        """Load the alias records (latest record per URL wins)."""
+        if self._aliases is None:
+            self._aliases = {}
+            if self.aliases_path.exists():
+                with open(self.aliases_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            alias = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._aliases[alias['url']] = alias
+            # Drop aliases of URLs stored with their own content since
+            for url, entry in self._load_index().items():
+                alias = self._aliases.get(url)
+                if alias is not None and entry['fetched_at'] >= alias['recorded_at']:
+                    del self._aliases[url]
+        return self._aliases
+
+    def add_alias(self, url: str, target_url: str, **details: Any) -> None:
+        """
+        Record a URL as a near-duplicate of an already stored page instead of storing its content.
+
+        Args:
+            url: URL of the duplicate page
+            target_url: URL of the stored page with the same content
+            **details: Additional JSON-serializable details (e.g. Hamming distance, body size)
+        """
+        alias = {'url': url, 'alias_of': target_url, 'recorded_at': time.time(), **details}
+        with self._lock:
+            aliases = self._load_aliases()
+            with open(self.aliases_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(alias, ensure_ascii=False) + "\n")
+            aliases[url] = alias
+
+    def aliases(self) -> Dict[str, str]:
+        """Return the map of near-duplicate URL to the URL whose content it repeats."""
+        return {url: alias['alias_of'] for url, alias in self._load_aliases().items()}
+
+    def _load_chunk_counts(self) -> Dict[tuple, int]:
+        """Load the chunk counts (latest record per URL and collection wins)."""
+        if self._chunk_counts is None:
+            self._chunk_counts = {}
+            if self.chunks_path.exists():
+                with open(self.chunks_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._chunk_counts[(record['url'], record['collection'])] = record['count']
+        return self._chunk_counts
+
+    def get_chunk_count(self, url: str, collection: str) -> int:
+        """Return the number of chunks of a URL last embedded into a collection (0 if none were recorded)."""
+        return self._load_chunk_counts().get((url, collection), 0)
+
+    def set_chunk_count(self, url: str, collection: str, count: int) -> None:
+        """
+        Record the number of chunks of a URL embedded into a collection.
+
+        Args:
+            url: URL of the page
+            collection: Name of the vector store collection
+            count: Number of chunks (chunk indexes 0 to count - 1)
+        """
+        with self._lock:
+            counts = self._load_chunk_counts()
+            if counts.get((url, collection)) == count:
+                return
+            with open(self.chunks_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'url': url, 'collection': collection, 'count': count}, ensure_ascii=False) + "\n")
+            counts[(url, collection)] = count
+
+    def append(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append a fetched page to the store.
+
+        Args:
+            page: Page dict with 'url', 'status', 'headers' and 'body' (bytes), optionally
+                  'final_url', 'encoding' (charset of the body) and 'simhash' (fingerprint of the
+                  cleaned content)
+
+        Returns:
+            Dict[str, Any]: The index entry of the stored record
+        """
+        body = page.get('body') or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        content_hash = compute_text_hash(body)
+        record = {
+            'url': page['url'],
+            'final_url': page.get('final_url', page['url']),
+            'status': page.get('status'),
+            'headers': page.get('headers', {}),
+            'encoding': page.get('encoding'),
+            'content_hash': content_hash,
+            'length': len(body),
+            'fetched_at': page.get('fetched_at', time.time()),
+            'simhash': page.get('simhash'),
+            'body': base64.b64encode(gzip.compress(body, mtime=0)).decode('ascii'),
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+        with self._lock:
+            index = self._load_index()
+            with open(self.pages_path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+            entry = {
+                'url': record['url'],
+                'offset': offset,
+                'size': len(line),
+                'status': record['status'],
+                'content_hash': content_hash,
+                'fetched_at': record['fetched_at'],
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            index[record['url']] = entry
+            # A page stored with its own content is no longer an alias
+            self._load_aliases().pop(record['url'], None)
+        return entry
+
+    @staticmethod
+    def _decode(line: bytes) -> Dict[str, Any]:
+        """Decode a stored record, decompressing its body."""
+        record = json.loads(line)
+        record['body'] = gzip.decompress(base64.b64decode(record['body']))
+        return record
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the latest record of a URL (following aliases to the page they duplicate).
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            Optional[Dict[str, Any]]: The stored page with 'body' as bytes, or None if not stored
+        """
+        entry = self._load_index().get(url)
+        if entry is None and url in self._load_aliases():
+            entry = self._load_index().get(self._load_aliases()[url]['alias_of'])
+        if entry is None:
+            return None
+        with open(self.pages_path, 'rb') as f:
+            f.seek(entry['offset'])
+            return self._decode(f.read(entry['size']))
+
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry (offset, status, content hash, ...) of a URL without reading its body."""
+        return self._load_index().get(url)
+
+    def urls(self) -> List[str]:
+        """Return the URLs of all stored pages."""
+        return list(self._load_index())
+
+    def iter_pages(self, latest_only: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over stored pages.
+
+        Args:
+            latest_only: Only yield the latest record of every URL (in index order)
+
+        Yields:
+            Dict[str, Any]: Stored pages with 'body' as bytes
+        """
+        if latest_only:
+            for url in self.urls():
+                page = self.get(url)
+                if page is not None:
+                    yield page
+            return
+
+        if not self.pages_path.exists():
+            return
+        with open(self.pages_path, 'rb') as f:
+            for line in f:
+                try:
+                    yield self._decode(line)
+                except ValueError:
+                    continue
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._load_index())
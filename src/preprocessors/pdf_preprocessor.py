@@ -1,21 +1,295 @@
+import json
+import os
+import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from importlib import metadata
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Optional, Dict, Any, Tuple
 
 import fitz
 import pytesseract
+from PIL import Image
 from pdf2image import convert_from_path
+from pytesseract import Output
 from tqdm import tqdm
 
+from ..converters.pymupdf_converter import PyMuPDFConverter
+from ..utils.cache_utils import ContentCache, atomic_write_bytes, build_cache_key, compute_file_hash
+from ..utils.pdf_utils import get_page_count, split_pdf, stitch_markdown
+
+
+def _package_version(package: str) -> str:
+    """Return the installed version of a package, or 'unknown' if it is not installed."""
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
 
 class PDFPreprocessor:
     """Preprocessor for converting PDF files to Markdown format."""
     
-    def __init__(self):
-        """Initialize the PDF preprocessor."""
-        pass
+    # Bump when the conversion output format changes, to invalidate old cache entries
+    CACHE_VERSION = 1
+    
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = None,
+        use_cache: bool = True,
+        docling_table_mode: str = "accurate",
+        ocr_lang: str = "vie",
+        timeout: int = 300,
+        shard_pages: int = None,
+        shard_workers: int = 4,
+        shard_retries: int = 1,
+        fast_path: bool = False,
+        ocr_low_dpi: int = 150,
+        ocr_high_dpi: int = 300,
+        ocr_min_confidence: float = 75.0,
+        ocr_max_region_fraction: float = 0.3
+    ):
+        """
+        Initialize the PDF preprocessor.
+        
+        Args:
+            cache_dir: Directory of the conversion cache. If None, uses .cache/pdf_preprocessor
+            use_cache: Whether to reuse previous conversions of identical PDFs
+            docling_table_mode: Table structure mode passed to docling ("accurate" or "fast")
+            ocr_lang: Tesseract language used for image-based PDFs
+            timeout: Timeout in seconds of one docling/markitdown run (per shard when sharding)
+            shard_pages: If set, PDFs with more pages are split into shards of this many pages
+                         that are converted concurrently and stitched back together
+            shard_workers: Number of shards converted concurrently
+            shard_retries: Number of times a failed shard is retried on its own
+            fast_path: Whether to convert simple digital PDFs directly with PyMuPDF and
+                       escalate to docling only for pages with complex tables or layout
+            ocr_low_dpi: DPI of the first OCR render of every page
+            ocr_high_dpi: DPI used to re-render low-confidence pages or regions
+            ocr_min_confidence: Mean tesseract word confidence (0-100) below which a page or line is re-rendered
+            ocr_max_region_fraction: Fraction of low-confidence words above which the whole page is
+                                     re-rendered instead of only the low-confidence lines
+        """
+        self.docling_table_mode = docling_table_mode
+        self.ocr_lang = ocr_lang
+        self.timeout = timeout
+        self.shard_pages = shard_pages
+        self.shard_workers = shard_workers
+        self.shard_retries = shard_retries
+        self.fast_path = fast_path
+        self.fast_converter = PyMuPDFConverter() if fast_path else None
+        self.ocr_low_dpi = ocr_low_dpi
+        self.ocr_high_dpi = ocr_high_dpi
+        self.ocr_min_confidence = ocr_min_confidence
+        self.ocr_max_region_fraction = ocr_max_region_fraction
+        self.use_cache = use_cache
+        self.cache_dir = Path(cache_dir) if cache_dir else Path('.cache') / 'pdf_preprocessor'
+        self.cache = ContentCache(self.cache_dir) if use_cache else None
+        self._tool_versions = None
+        self.last_report = []
+
+    def _get_route(self, pdf_path: Union[str, Path]) -> Tuple[str, Optional[Dict], bool]:
+        """
+        Decide which conversion route a PDF takes.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Tuple[str, Optional[Dict], bool]: The route ("fast" for simple digital PDFs (fast path only),
+                "docling" for valid text, "markitdown" for encoded text, "ocr" for image-based PDFs),
+                the fast path analysis of the PDF, if one was made, and whether the checks succeeded
+                (False when the route is only a fallback because the PDF could not be read)
+        """
+        is_text = self._is_text_pdf(pdf_path)
+        if not is_text:
+            return "ocr", None, is_text is not None
+        is_encoded = self._is_encoded_text(pdf_path)
+        if is_encoded is None or is_encoded:
+            return "markitdown", None, is_encoded is not None
+        if self.fast_path:
+            analysis = self.fast_converter.analyze(pdf_path)
+            if analysis['simple']:
+                return "fast", analysis, True
+            print(f"🔬 {Path(pdf_path).name} needs docling: {', '.join(analysis['reasons'])}")
+        return "docling", None, True
+
+    def _get_routing_options(self) -> Dict[str, Any]:
+        """
+        Get the settings the routing decision depends on.
+        
+        Returns:
+            Dict[str, Any]: Fast path thresholds and the PyMuPDF version, used as part of the route cache key
+        """
+        options = {"fast_path": self.fast_path, "pymupdf": _package_version("PyMuPDF")}
+        if self.fast_path:
+            options.update({
+                "max_image_coverage": self.fast_converter.max_image_coverage,
+                "max_column_overlap_blocks": self.fast_converter.max_column_overlap_blocks,
+            })
+        return options
+
+    def _get_route_cache_key(self, file_hash: str) -> str:
+        """
+        Build the cache key of a PDF's route.
+        
+        Args:
+            file_hash: SHA-256 of the PDF file
+            
+        Returns:
+            str: Key combining the PDF's SHA-256 and the settings the routing decision depends on
+        """
+        return build_cache_key("pdf_route", self.CACHE_VERSION, file_hash, self._get_routing_options())
 
-    def _is_text_pdf(self, pdf_path: Union[str, Path]) -> bool:
+    def _resolve_route(self, pdf_path: Path, file_hash: Optional[str]) -> Tuple[str, Optional[Dict]]:
+        """
+        Get a PDF's route from the cache, or decide it (and cache it).
+        
+        Routing opens the PDF and, on the fast path, detects the tables of every page, so
+        unchanged PDFs reuse the route decided on an earlier run. Fallback routes taken because
+        the PDF could not be read are not cached, so a transient error is retried on the next run.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            file_hash: SHA-256 of the PDF file (None when caching is disabled)
+            
+        Returns:
+            Tuple[str, Optional[Dict]]: The route and the fast path analysis, if one was made
+        """
+        if not file_hash:
+            route, analysis, _ = self._get_route(pdf_path)
+            return route, analysis
+        route_key = self._get_route_cache_key(file_hash)
+        route = self.cache.get_text(route_key)
+        if route:
+            return route, None
+        route, analysis, checked = self._get_route(pdf_path)
+        if not checked:
+            print(f"⚠️ Falling back to the {route} route for {pdf_path.name} (not cached)")
+            return route, analysis
+        try:
+            self.cache.put(route_key, route, metadata={"source": pdf_path.name})
+        except Exception as e:
+            print(f"⚠️ Could not store route in cache: {e}")
+        return route, analysis
+
+    def _get_route_options(self, route: str) -> Dict[str, str]:
+        """
+        Get the options that influence the output of a conversion route.
+        
+        Args:
+            route: Conversion route
+            
+        Returns:
+            Dict[str, str]: Options identifying the route's output, used as part of the cache key
+        """
+        if self._tool_versions is None:
+            self._tool_versions = {
+                "docling": _package_version("docling"),
+                "markitdown": _package_version("markitdown"),
+                "pymupdf": _package_version("PyMuPDF"),
+                "pytesseract": _package_version("pytesseract"),
+            }
+        
+        if route == "docling":
+            return {
+                "table_mode": self.docling_table_mode,
+                "ocr": "true",
+                "shard_pages": str(self.shard_pages),
+                "version": self._tool_versions["docling"],
+            }
+        if route == "fast":
+            return {"version": self._tool_versions["pymupdf"]}
+        if route == "markitdown":
+            return {"shard_pages": str(self.shard_pages), "version": self._tool_versions["markitdown"]}
+        return {
+            "lang": self.ocr_lang,
+            "dpi": f"{self.ocr_low_dpi}/{self.ocr_high_dpi}",
+            "min_confidence": str(self.ocr_min_confidence),
+            "max_region_fraction": str(self.ocr_max_region_fraction),
+            "version": self._tool_versions["pytesseract"],
+        }
+
+    def _get_cache_key(self, file_hash: str, route: str) -> str:
+        """
+        Build the conversion cache key of a PDF.
+        
+        Args:
+            file_hash: SHA-256 of the PDF file
+            route: Conversion route the PDF takes
+            
+        Returns:
+            str: Key combining the PDF's SHA-256, the route and the route options
+        """
+        return build_cache_key(
+            "pdf_preprocessor",
+            self.CACHE_VERSION,
+            file_hash,
+            route,
+            self._get_route_options(route)
+        )
+
+    @staticmethod
+    def _ocr_metadata_path(output_md: Path) -> Path:
+        """Path of the OCR metadata sidecar (per-page DPI and confidence) of a Markdown output."""
+        return output_md.with_suffix('.ocr.json')
+
+    def _load_from_cache(self, cache_key: Optional[str], output_md: Path, pdf_path: Path = None) -> bool:
+        """
+        Write a cached conversion (and the OCR metadata of OCR conversions) to the output path.
+        
+        Args:
+            cache_key: Cache key of the PDF (None when caching is disabled)
+            output_md: Path to save the Markdown output
+            pdf_path: Path to the source PDF file (recorded in the restored OCR metadata)
+            
+        Returns:
+            bool: True if the conversion was served from the cache
+        """
+        if not cache_key:
+            return False
+        entry_metadata = self.cache.get_metadata(cache_key)
+        ocr_metadata = entry_metadata.get("ocr")
+        if entry_metadata.get("route") == "ocr" and ocr_metadata is None:
+            # Entries from before the OCR metadata was cached are converted again
+            return False
+        cached = self.cache.get_text(cache_key)
+        if not cached:
+            return False
+        try:
+            if ocr_metadata is not None:
+                if pdf_path is not None:
+                    ocr_metadata["source"] = str(pdf_path)
+                self._ocr_metadata_path(output_md).write_text(json.dumps(ocr_metadata, indent=2), encoding='utf-8')
+            output_md.write_text(cached, encoding='utf-8')
+            return True
+        except Exception as e:
+            print(f"❌ Error writing cached markdown: {e}")
+            return False
+
+    def _store_in_cache(self, cache_key: Optional[str], output_md: Path, pdf_path: Path, route: str) -> None:
+        """
+        Store a successful conversion in the cache.
+        
+        Args:
+            cache_key: Cache key of the PDF (None when caching is disabled)
+            output_md: Path of the generated Markdown file
+            pdf_path: Path to the source PDF file
+            route: Conversion route used
+        """
+        if not cache_key:
+            return
+        try:
+            entry_metadata = {"source": pdf_path.name, "route": route, **self._get_route_options(route)}
+            if route == "ocr":
+                entry_metadata["ocr"] = json.loads(self._ocr_metadata_path(output_md).read_text(encoding='utf-8'))
+            self.cache.put(cache_key, output_md.read_text(encoding='utf-8'), metadata=entry_metadata)
+        except Exception as e:
+            print(f"⚠️ Could not store conversion in cache: {e}")
+
+    def _is_text_pdf(self, pdf_path: Union[str, Path]) -> Optional[bool]:
         """
         Check if the PDF contains searchable text.
         
@@ -23,7 +297,8 @@ class PDFPreprocessor:
             pdf_path: Path to the PDF file
             
         Returns:
-            bool: True if the PDF contains searchable text, False if it's image-based
+            Optional[bool]: True if the PDF contains searchable text, False if it's image-based,
+                None if the PDF could not be read
         """
         try:
             doc = fitz.open(pdf_path)
@@ -36,9 +311,9 @@ class PDFPreprocessor:
             return text_content
         except Exception as e:
             print(f"❌ Error checking PDF type: {e}")
-            return False
+            return None
 
-    def _is_encoded_text(self, pdf_path: Union[str, Path]) -> bool:
+    def _is_encoded_text(self, pdf_path: Union[str, Path]) -> Optional[bool]:
         """
         Check if the PDF contains encoded or unreadable text.
         
@@ -46,7 +321,8 @@ class PDFPreprocessor:
             pdf_path: Path to the PDF file
             
         Returns:
-            bool: True if the PDF contains encoded text, False otherwise
+            Optional[bool]: True if the PDF contains encoded text, False otherwise,
+                None if the PDF could not be read
         """
         try:
             doc = fitz.open(pdf_path)
@@ -65,74 +341,231 @@ class PDFPreprocessor:
             return False
         except Exception as e:
             print(f"❌ Error checking encoded text: {e}")
-            return True
+            return None
+
+    def _ocr_image(self, image: Image.Image, config: str = "") -> List[Dict[str, Any]]:
+        """
+        Run tesseract on an image and group the recognized words into lines.
+        
+        Args:
+            image: Image to recognize
+            config: Extra tesseract configuration (e.g. page segmentation mode)
+            
+        Returns:
+            List[Dict[str, Any]]: Lines in reading order, each with 'key' (block, paragraph, line),
+                                  'text', 'confidence' (mean word confidence) and pixel 'box'
+        """
+        data = pytesseract.image_to_data(image, lang=self.ocr_lang, config=config, output_type=Output.DICT)
+        lines = {}
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if not word.strip() or confidence < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            line = lines.setdefault(key, {"key": key, "words": [], "confidences": [], "box": None})
+            line["words"].append(word)
+            line["confidences"].append(confidence)
+            box = (data["left"][i], data["top"][i],
+                   data["left"][i] + data["width"][i], data["top"][i] + data["height"][i])
+            line["box"] = box if line["box"] is None else (
+                min(line["box"][0], box[0]), min(line["box"][1], box[1]),
+                max(line["box"][2], box[2]), max(line["box"][3], box[3])
+            )
+        
+        return [
+            {
+                "key": line["key"],
+                "text": " ".join(line["words"]),
+                "confidence": sum(line["confidences"]) / len(line["confidences"]),
+                "words": len(line["words"]),
+                "box": line["box"],
+            }
+            for line in lines.values()
+        ]
+
+    def _render_region(self, page: fitz.Page, box: tuple, source_dpi: int, dpi: int) -> Image.Image:
+        """
+        Render a region of a page, given in pixels of a source_dpi render, at a higher DPI.
+        
+        Args:
+            page: PyMuPDF page
+            box: Region as (left, top, right, bottom) pixels of the source render
+            source_dpi: DPI of the render the box was measured on
+            dpi: DPI of the new render
+            
+        Returns:
+            Image.Image: The rendered region
+        """
+        scale = 72 / source_dpi
+        padding = 4
+        clip = fitz.Rect(
+            (box[0] - padding) * scale, (box[1] - padding) * scale,
+            (box[2] + padding) * scale, (box[3] + padding) * scale
+        ) & page.rect
+        pixmap = page.get_pixmap(dpi=dpi, clip=clip)
+        return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
 
-    def _extract_text_with_ocr(self, pdf_path: Union[str, Path]) -> str:
+    @staticmethod
+    def _mean_confidence(lines: List[Dict[str, Any]]) -> float:
+        """Word-weighted mean confidence of OCR lines."""
+        words = sum(line["words"] for line in lines)
+        return sum(line["confidence"] * line["words"] for line in lines) / words if words else 0.0
+
+    @staticmethod
+    def _lines_to_text(lines: List[Dict[str, Any]]) -> str:
+        """Join OCR lines, separating paragraphs with a blank line."""
+        text = []
+        previous_paragraph = None
+        for line in lines:
+            paragraph = line["key"][:2]
+            if previous_paragraph is not None and paragraph != previous_paragraph:
+                text.append("")
+            text.append(line["text"])
+            previous_paragraph = paragraph
+        return "\n".join(text)
+
+    def _ocr_page(self, pdf_path: Union[str, Path], page: fitz.Page) -> tuple:
+        """
+        OCR a page with confidence-driven adaptive DPI.
+        
+        The page is rendered at ocr_low_dpi first. If the word confidence is too low, either the
+        low-confidence lines are re-rendered at ocr_high_dpi (when they are a minority of the page)
+        or the whole page is.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page: PyMuPDF page of the same PDF
+            
+        Returns:
+            tuple: (page text, page metadata with DPI and confidence)
+        """
+        page_number = page.number + 1
+        image = convert_from_path(pdf_path, dpi=self.ocr_low_dpi, first_page=page_number, last_page=page_number)[0]
+        lines = self._ocr_image(image)
+        initial_confidence = self._mean_confidence(lines)
+        metadata = {
+            "page": page_number,
+            "dpi": self.ocr_low_dpi,
+            "initial_confidence": round(initial_confidence, 2),
+            "regions_rerendered": 0,
+        }
+        
+        if lines and initial_confidence >= self.ocr_min_confidence:
+            metadata["confidence"] = metadata["initial_confidence"]
+            return self._lines_to_text(lines), metadata
+        
+        low_lines = [line for line in lines if line["confidence"] < self.ocr_min_confidence]
+        low_words = sum(line["words"] for line in low_lines)
+        total_words = sum(line["words"] for line in lines)
+        
+        if not lines or low_words / total_words > self.ocr_max_region_fraction:
+            # Low confidence across the page: re-render it entirely
+            image = convert_from_path(
+                pdf_path, dpi=self.ocr_high_dpi, first_page=page_number, last_page=page_number
+            )[0]
+            high_lines = self._ocr_image(image)
+            if self._mean_confidence(high_lines) >= initial_confidence:
+                lines = high_lines
+                metadata["dpi"] = self.ocr_high_dpi
+        else:
+            # Only a few lines are unreadable: re-render just those regions
+            for line in low_lines:
+                region = self._render_region(page, line["box"], self.ocr_low_dpi, self.ocr_high_dpi)
+                region_lines = self._ocr_image(region, config="--psm 7")
+                if region_lines and self._mean_confidence(region_lines) > line["confidence"]:
+                    line["text"] = " ".join(region_line["text"] for region_line in region_lines)
+                    line["confidence"] = self._mean_confidence(region_lines)
+                metadata["regions_rerendered"] += 1
+            metadata["region_dpi"] = self.ocr_high_dpi
+        
+        metadata["confidence"] = round(self._mean_confidence(lines), 2)
+        return self._lines_to_text(lines), metadata
+
+    def _extract_text_with_ocr(self, pdf_path: Union[str, Path], metadata_path: Union[str, Path] = None) -> str:
         """
         Use OCR to extract text from image-based PDFs.
         
         Args:
             pdf_path: Path to the PDF file
+            metadata_path: Optional path to save the per-page DPI and confidence as JSON
             
         Returns:
             str: Extracted text from the PDF
         """
         try:
-            images = convert_from_path(pdf_path)
             extracted_text = ""
-            for img in tqdm(images, desc="Processing pages with OCR"):
-                extracted_text += pytesseract.image_to_string(img, lang="vie") + "\n"
+            pages_metadata = []
+            with fitz.open(pdf_path) as doc:
+                for page in tqdm(doc, total=doc.page_count, desc="Processing pages with OCR"):
+                    text, page_metadata = self._ocr_page(pdf_path, page)
+                    extracted_text += text + "\n"
+                    pages_metadata.append(page_metadata)
+            
+            if metadata_path:
+                Path(metadata_path).write_text(json.dumps({
+                    "source": str(pdf_path),
+                    "lang": self.ocr_lang,
+                    "low_dpi": self.ocr_low_dpi,
+                    "high_dpi": self.ocr_high_dpi,
+                    "min_confidence": self.ocr_min_confidence,
+                    "max_region_fraction": self.ocr_max_region_fraction,
+                    "pages": pages_metadata,
+                }, indent=2), encoding='utf-8')
             return extracted_text
         except Exception as e:
             print(f"❌ Error during OCR processing: {e}")
             return ""
 
-    def _convert_pdf_to_markdown(self, pdf_path: Union[str, Path], output_md_path: Union[str, Path]) -> bool:
+    def _convert_pdf_to_markdown(
+        self,
+        pdf_path: Union[str, Path],
+        output_md_path: Union[str, Path],
+        work_dir: Union[str, Path] = None
+    ) -> bool:
         """
         Convert the PDF to Markdown using docling.
         
         Args:
             pdf_path: Path to the PDF file
             output_md_path: Path to save the Markdown output
+            work_dir: Optional parent directory for docling's scratch output (defaults to the system temp dir)
             
         Returns:
             bool: True if conversion was successful, False otherwise
         """
         try:
-            # Create output directory if it doesn't exist
-            output_dir = Path('output_dir')
-            output_dir.mkdir(exist_ok=True)
-            
-            process = subprocess.run([
-                "docling", str(pdf_path),
-                "--from", "pdf",
-                "--to", "md",
-                "--output", 'output_dir',
-                "--ocr",
-                "--table-mode", "accurate"
-            ], shell=False, check=True, timeout=300,  # 5 minutes timeout
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            
-            # Find the generated markdown file
-            pdf_name = Path(pdf_path).stem
-            generated_file = output_dir / f"{pdf_name}.md"
-            
-            if not generated_file.exists():
-                print(f"❌ Docling did not generate the expected file: {generated_file}")
-                return False
+            # Every run gets its own scratch directory so concurrent runs and
+            # PDFs sharing a stem never collide on docling's output file
+            with tempfile.TemporaryDirectory(prefix='docling_', dir=work_dir) as scratch_dir:
+                process = subprocess.run([
+                    "docling", str(pdf_path),
+                    "--from", "pdf",
+                    "--to", "md",
+                    "--output", scratch_dir,
+                    "--ocr",
+                    "--table-mode", self.docling_table_mode
+                ], shell=False, check=True, timeout=self.timeout,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                
+                # Find the generated markdown file
+                pdf_name = Path(pdf_path).stem
+                generated_file = Path(scratch_dir) / f"{pdf_name}.md"
                 
-            # Move the file to the desired location
-            try:
-                import shutil
-                shutil.move(str(generated_file), str(output_md_path))
-                print(f"✅ Moved generated file from {generated_file} to {output_md_path}")
-                return True
-            except Exception as e:
-                print(f"❌ Error moving generated file: {e}")
-                return False
+                if not generated_file.exists():
+                    print(f"❌ Docling did not generate the expected file: {generated_file}")
+                    return False
+                    
+                # Move the file to the desired location
+                try:
+                    shutil.move(str(generated_file), str(output_md_path))
+                    print(f"✅ Moved generated file from {generated_file} to {output_md_path}")
+                    return True
+                except Exception as e:
+                    print(f"❌ Error moving generated file: {e}")
+                    return False
                 
         except subprocess.TimeoutExpired:
-            print(f"⏰ Docling conversion timed out after 5 minutes")
+            print(f"⏰ Docling conversion of {Path(pdf_path).name} timed out after {self.timeout} seconds")
             return False
         except subprocess.CalledProcessError as e:
             print(f"❌ Error using docling: {e}")
@@ -156,13 +589,13 @@ class PDFPreprocessor:
         try:
             result = subprocess.run(
                 ["markitdown", str(pdf_path), "-o", str(output_txt_path)],
-                shell=False, check=True, timeout=300,  # 5 minutes timeout
+                shell=False, check=True, timeout=self.timeout,
                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
             )
             print("✅ Successfully converted PDF to plain text.")
             return True
         except subprocess.TimeoutExpired:
-            print(f"⏰ Markitdown conversion timed out after 5 minutes")
+            print(f"⏰ Markitdown conversion of {Path(pdf_path).name} timed out after {self.timeout} seconds")
             return False
         except subprocess.CalledProcessError as e:
             print(f"❌ Error running markitdown: {e}")
@@ -172,33 +605,121 @@ class PDFPreprocessor:
             print(f"❌ Unexpected error during text conversion: {e}")
             return False
 
-    def process_pdf(self, pdf_path: Union[str, Path]) -> Path:
+    def _convert_shard(self, shard: Dict, route: str, work_dir: Union[str, Path]) -> Optional[str]:
+        """
+        Convert one page-range shard, retrying it on its own if it fails.
+        
+        Args:
+            shard: Shard description returned by split_pdf
+            route: Conversion route ("docling" or "markitdown")
+            work_dir: Directory for the shard's scratch files
+            
+        Returns:
+            Optional[str]: The shard's markdown, or None if every attempt failed
+        """
+        shard_md = shard['path'].with_suffix('.md')
+        pages = f"pages {shard['start_page']}-{shard['end_page']}"
+        for attempt in range(1 + self.shard_retries):
+            if attempt:
+                print(f"🔁 Retrying {pages} (attempt {attempt + 1}/{1 + self.shard_retries})")
+            if route == "docling":
+                success = self._convert_pdf_to_markdown(shard['path'], shard_md, work_dir)
+            else:
+                success = self._convert_pdf_to_plain_text(shard['path'], shard_md)
+            if success and shard_md.exists():
+                return shard_md.read_text(encoding='utf-8')
+        print(f"❌ Could not convert {pages}")
+        return None
+
+    def _convert_in_shards(
+        self,
+        pdf_path: Path,
+        output_md: Path,
+        route: str,
+        work_dir: Union[str, Path] = None
+    ) -> Optional[bool]:
+        """
+        Convert a large PDF as concurrently converted page-range shards.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            output_md: Path to save the stitched Markdown output
+            route: Conversion route ("docling" or "markitdown")
+            work_dir: Optional parent directory for the shard files
+            
+        Returns:
+            Optional[bool]: True if every shard was converted, False if some shards failed
+                            (their pages are marked in the output), None if nothing was converted
+        """
+        with tempfile.TemporaryDirectory(prefix='shards_', dir=work_dir) as shard_dir:
+            shards = split_pdf(pdf_path, shard_dir, self.shard_pages)
+            print(f"✂️ Split {pdf_path.name} into {len(shards)} shards of up to {self.shard_pages} pages.")
+            
+            with ThreadPoolExecutor(max_workers=self.shard_workers) as executor:
+                parts = list(executor.map(lambda shard: self._convert_shard(shard, route, shard_dir), shards))
+        
+        if all(part is None for part in parts):
+            return None
+        
+        complete = all(part is not None for part in parts)
+        parts = [
+            part if part is not None
+            else f"<!-- pages {shard['start_page']}-{shard['end_page']} could not be converted -->"
+            for shard, part in zip(shards, parts)
+        ]
+        output_md.write_text(stitch_markdown(parts), encoding='utf-8')
+        return complete
+
+    def process_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_path: Union[str, Path] = None,
+        work_dir: Union[str, Path] = None
+    ) -> Path:
         """
         Process a single PDF file and convert it to Markdown.
         
         Args:
             pdf_path: Path to the PDF file
+            output_path: Optional path of the Markdown output (if None, saves alongside the PDF)
+            work_dir: Optional directory for the converters' scratch files
             
         Returns:
             Path: Path to the generated Markdown file
         """
         pdf_path = Path(pdf_path)
-        output_md = pdf_path.with_suffix('.md')
+        output_md = Path(output_path) if output_path else pdf_path.with_suffix('.md')
         
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         try:
-            if self._is_text_pdf(pdf_path):
-                if self._is_encoded_text(pdf_path):
-                    print(f"🔍 {pdf_path.name} contains encoded text → Converting to plain text using markitdown.")
-                    success = self._convert_pdf_to_plain_text(pdf_path, output_md)
-                else:
-                    print(f"✅ {pdf_path.name} contains valid text → Converting to Markdown using docling.")
-                    success = self._convert_pdf_to_markdown(pdf_path, output_md)
+            file_hash = compute_file_hash(pdf_path) if self.cache else None
+            route, analysis = self._resolve_route(pdf_path, file_hash)
+            cache_key = self._get_cache_key(file_hash, route) if file_hash else None
+            if self._load_from_cache(cache_key, output_md, pdf_path):
+                print(f"♻️ {pdf_path.name} found in conversion cache → Skipping {route} conversion.")
+                return output_md
+            
+            complete = True
+            if route in ("docling", "markitdown") and self.shard_pages and get_page_count(pdf_path) > self.shard_pages:
+                print(f"📚 {pdf_path.name} is large → Converting page-range shards using {route}.")
+                result = self._convert_in_shards(pdf_path, output_md, route, work_dir)
+                success = result is not None
+                complete = bool(result)
+            elif route == "markitdown":
+                print(f"🔍 {pdf_path.name} contains encoded text → Converting to plain text using markitdown.")
+                success = self._convert_pdf_to_plain_text(pdf_path, output_md)
+            elif route == "fast":
+                print(f"⚡ {pdf_path.name} is a simple digital PDF → Converting to Markdown using PyMuPDF.")
+                self.fast_converter.convert_to_markdown(pdf_path, output_md, analysis=analysis)
+                success = True
+            elif route == "docling":
+                print(f"✅ {pdf_path.name} contains valid text → Converting to Markdown using docling.")
+                success = self._convert_pdf_to_markdown(pdf_path, output_md, work_dir)
             else:
                 print(f"📷 {pdf_path.name} is image-based → Using OCR to extract text.")
-                extracted_text = self._extract_text_with_ocr(pdf_path)
+                extracted_text = self._extract_text_with_ocr(pdf_path, self._ocr_metadata_path(output_md))
                 try:
                     output_md.write_text(extracted_text, encoding='utf-8')
                     success = True
@@ -210,6 +731,8 @@ class PDFPreprocessor:
                 if output_md.stat().st_size == 0:
                     print(f"❌ Generated markdown file is empty: {output_md}")
                     return None
+                if complete:
+                    self._store_in_cache(cache_key, output_md, pdf_path, route)
                 return output_md
             else:
                 print(f"❌ Failed to generate markdown file: {output_md}")
@@ -220,13 +743,133 @@ class PDFPreprocessor:
             print(f"Traceback: {traceback.format_exc()}")
             return None
 
-    def process_directory(self, input_dir: Union[str, Path], output_dir: Union[str, Path] = None) -> List[Path]:
+    def _load_journal(self, journal_path: Path) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the checkpoint journal of a directory run.
+        
+        Args:
+            journal_path: Path to the JSONL journal
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Latest journal record per source file
+        """
+        records = {}
+        if not journal_path.exists():
+            return records
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write may leave a truncated last line
+                    continue
+                records[record["source"]] = record
+        return records
+
+    def _compact_journal(self, journal_path: Path, records: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically rewrite the checkpoint journal with only the latest record per source file."""
+        if not journal_path.exists():
+            return
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records.values())
+        atomic_write_bytes(journal_path, lines.encode('utf-8'))
+
+    @staticmethod
+    def _source_fingerprint(pdf_file: Path) -> Dict[str, int]:
+        """Size and modification time of a source file, to detect PDFs replaced since they were converted."""
+        stat = pdf_file.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _append_journal(self, journal_path: Path, record: Dict[str, Any]) -> None:
+        """Append a record to the checkpoint journal and flush it to disk."""
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _run_directory_job(self, pdf_file: Path, output_path: Path, scratch_root: Path) -> Dict[str, Any]:
+        """
+        Convert one PDF of a directory run inside its own scratch directory.
+        
+        The Markdown file (and the OCR metadata sidecar of OCR conversions) is produced in the
+        scratch directory and atomically moved to its destination, so an interrupted job never
+        leaves a partial output behind.
+        
+        Args:
+            pdf_file: Path to the PDF file
+            output_path: Final path of the Markdown output
+            scratch_root: Directory holding the per-job scratch directories
+            
+        Returns:
+            Dict[str, Any]: Job result with status, timing and error message
+        """
+        start = time.perf_counter()
+        error = None
+        fingerprint = None
+        try:
+            # Taken before converting, so a PDF replaced during its conversion is converted again
+            fingerprint = self._source_fingerprint(pdf_file)
+            scratch_root.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(prefix=f"{pdf_file.stem}_", dir=scratch_root) as scratch_dir:
+                scratch_md = Path(scratch_dir) / f"{pdf_file.stem}.md"
+                result = self.process_pdf(pdf_file, output_path=scratch_md, work_dir=scratch_dir)
+                if result:
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    # The sidecar goes first, so a finished .md always has its metadata next to it
+                    ocr_metadata_path = self._ocr_metadata_path(result)
+                    if ocr_metadata_path.exists():
+                        os.replace(ocr_metadata_path, self._ocr_metadata_path(output_path))
+                    os.replace(result, output_path)
+                else:
+                    error = "conversion produced no output"
+        except Exception as e:
+            error = str(e)
+        
+        return {
+            "source": str(pdf_file),
+            "output": str(output_path),
+            "status": "failed" if error else "done",
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": error,
+            "fingerprint": fingerprint,
+        }
+
+    def _print_directory_report(self, report: List[Dict[str, Any]], elapsed: float) -> None:
+        """Print the per-file status and timing report of a directory run."""
+        print("\n📊 PDF processing report")
+        for record in report:
+            icon = {"done": "✅", "skipped": "⏭️", "failed": "❌"}.get(record["status"], "•")
+            line = f"  {icon} {record['source']}: {record['status']} ({record['seconds']:.1f}s)"
+            if record.get("error"):
+                line += f" - {record['error']}"
+            print(line)
+        counts = {status: sum(1 for r in report if r["status"] == status) for status in ("done", "skipped", "failed")}
+        print(f"  Total: {len(report)} files, {counts['done']} converted, {counts['skipped']} resumed, "
+              f"{counts['failed']} failed in {elapsed:.1f}s")
+
+    def process_directory(
+        self,
+        input_dir: Union[str, Path],
+        output_dir: Union[str, Path] = None,
+        workers: int = 1,
+        resume: bool = True,
+        journal_path: Union[str, Path] = None
+    ) -> List[Path]:
         """
         Process all PDF files in a directory and convert them to Markdown.
         
+        Each PDF is converted in its own scratch directory and moved atomically into
+        the destination tree. Finished files are recorded in a checkpoint journal, so an
+        interrupted run resumes where it stopped; PDFs replaced since their conversion (different
+        size or modification time) are converted again. The per-file report of the last run is
+        kept in `self.last_report`.
+        
         Args:
             input_dir: Directory containing PDF files
             output_dir: Optional directory to save Markdown files (if None, saves alongside PDFs)
+            workers: Number of worker processes (1 converts sequentially in this process)
+            resume: Whether to skip files the journal records as already converted
+            journal_path: Optional path of the checkpoint journal
+                          (default: .pdf_preprocessor_journal.jsonl in the output root)
             
         Returns:
             List[Path]: List of paths to the generated Markdown files
@@ -239,30 +882,70 @@ class PDFPreprocessor:
         if not input_dir.exists():
             raise NotADirectoryError(f"Input directory not found: {input_dir}")
         
-        pdf_files = list(input_dir.glob('**/*.pdf'))
+        pdf_files = sorted(input_dir.glob('**/*.pdf'))
         if not pdf_files:
             print("⚠️ No PDF files found in the input directory.")
             return []
         
-        processed_files = []
-        for pdf_file in tqdm(pdf_files, desc="Processing PDF files"):
-            try:
-                if output_dir:
-                    # Preserve directory structure in output
-                    rel_path = pdf_file.relative_to(input_dir)
-                    output_path = output_dir / rel_path.with_suffix('.md')
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Process PDF and move result to output directory
-                    temp_output = self.process_pdf(pdf_file)
-                    temp_output.replace(output_path)
-                    processed_files.append(output_path)
-                else:
-                    # Process PDF and save alongside original
-                    output_path = self.process_pdf(pdf_file)
-                    processed_files.append(output_path)
-            except Exception as e:
-                print(f"❌ Error processing {pdf_file.name}: {e}")
-                continue
+        # Scratch directories live in the output root so the final move is a same-filesystem rename
+        output_root = output_dir or input_dir
+        scratch_root = output_root / '.pdf_preprocessor_work'
+        journal_path = Path(journal_path) if journal_path else output_root / '.pdf_preprocessor_journal.jsonl'
+        journal = self._load_journal(journal_path)
+        # Keep only the latest record per file, so the append-only journal does not grow with every run
+        self._compact_journal(journal_path, journal)
+        
+        results = {}
+        jobs = []
+        for pdf_file in pdf_files:
+            if output_dir:
+                # Preserve directory structure in output
+                output_path = output_dir / pdf_file.relative_to(input_dir).with_suffix('.md')
+            else:
+                output_path = pdf_file.with_suffix('.md')
+            
+            previous = journal.get(str(pdf_file)) if resume else None
+            if (previous and previous["status"] == "done" and output_path.exists()
+                    and previous.get("fingerprint") == self._source_fingerprint(pdf_file)):
+                results[pdf_file] = {**previous, "status": "skipped", "seconds": 0.0, "error": None}
+            else:
+                jobs.append((pdf_file, output_path))
+        
+        if results:
+            print(f"⏭️ Resuming: {len(results)} of {len(pdf_files)} files already converted.")
+        
+        start = time.perf_counter()
+        try:
+            if workers <= 1:
+                for pdf_file, output_path in tqdm(jobs, desc="Processing PDF files"):
+                    result = self._run_directory_job(pdf_file, output_path, scratch_root)
+                    self._append_journal(journal_path, result)
+                    results[pdf_file] = result
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {
+                        executor.submit(self._run_directory_job, pdf_file, output_path, scratch_root): pdf_file
+                        for pdf_file, output_path in jobs
+                    }
+                    for future in tqdm(as_completed(futures), total=len(futures), desc="Processing PDF files"):
+                        pdf_file = futures[future]
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {
+                                "source": str(pdf_file),
+                                "output": None,
+                                "status": "failed",
+                                "seconds": 0.0,
+                                "error": str(e),
+                                "fingerprint": None,
+                            }
+                        self._append_journal(journal_path, result)
+                        results[pdf_file] = result
+        finally:
+            shutil.rmtree(scratch_root, ignore_errors=True)
+        
+        self.last_report = [results[pdf_file] for pdf_file in pdf_files if pdf_file in results]
+        self._print_directory_report(self.last_report, time.perf_counter() - start)
         
-        return processed_files 
\ No newline at end of file
+        return [Path(r["output"]) for r in self.last_report if r["status"] in ("done", "skipped")]
@@ -1,4 +1,5 @@
 from src.retrievers.direct_pdf_retriever import DirectPDFRetriever
+from src.retrievers.gitbook_retriever import GitBookRetriever
 from src.retrievers.html_retriever import HTMLRetriever
 from src.retrievers.preprocessed_pdf_retriever import PreprocessedPDFRetriever
 
@@ -88,6 +89,24 @@ def test_html_retriever(test_urls):
         assert 'document_id' in doc.metadata
         assert doc.metadata['source'] in test_urls
 
+
+def test_gitbook_retriever(book_dir):
+    """Test the GitBookRetriever (sections are streamed, not combined into one document)."""
+    retriever = GitBookRetriever(
+        collection_name="test_gitbook",
+        chunk_size=1000,
+        chunk_overlap=200
+    )
+    
+    retriever.add_documents([book_dir], batch_size=64)
+    
+    results = retriever.get_relevant_documents("Làm thế nào để tạo máy chủ ảo?")
+    assert len(results) > 0
+    for doc in results:
+        assert 'title_path' in doc.metadata
+        assert 'section_index' in doc.metadata
+        assert 'document_id' in doc.metadata
+
 # def test_html_retriever_error_handling():
 #     """Test error handling in HTMLRetriever."""
 #     # Initialize retriever
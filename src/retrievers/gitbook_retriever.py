@@ -0,0 +1,216 @@
+import hashlib
+from pathlib import Path
+from typing import List, Union, Optional, Dict, Any
+
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from langchain_postgres.vectorstores import PGVector
+
+from .base_retriever import BaseRetriever
+from ..converters.gitbook_converter import GitBookConverter
+from ..utils.chunk_quality import ChunkQualityGate
+from ..utils.env_loader import load_env_vars, get_db_connection_string
+
+
+class GitBookRetriever(BaseRetriever):
+    """Retriever that streams GitBook books section by section into the vector database."""
+    
+    def __init__(
+        self,
+        connection_string: str = None,
+        collection_name: str = "gitbook_documents",
+        chunk_size: int = 7000,
+        chunk_overlap: int = 6800,
+        embedding_model: str = "models/text-embedding-004",
+        quality_gate: bool = True
+    ):
+        """
+        Initialize the GitBook retriever.
+        
+        Args:
+            connection_string: PostgreSQL connection string. If None, will use environment variables
+            collection_name: Name of the collection in the database
+            chunk_size: Size of text chunks for splitting (sections longer than this are split further)
+            chunk_overlap: Overlap between chunks
+            embedding_model: Name of the embedding model to use
+            quality_gate: Whether to strip base64 payloads, minified code and low-information chunks
+                          before embedding (see ChunkQualityGate)
+        """
+        # Load environment variables
+        self.env_vars = load_env_vars()
+        
+        # Set connection string
+        self.connection_string = connection_string or get_db_connection_string()
+        self.collection_name = collection_name
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.quality_gate = ChunkQualityGate() if quality_gate else None
+        
+        # Initialize converter
+        self.converter = GitBookConverter()
+        
+        # Initialize text splitter
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            is_separator_regex=False
+        )
+        
+        # Initialize embeddings
+        self.embeddings = GoogleGenerativeAIEmbeddings(
+            model=embedding_model,
+            google_api_key=self.env_vars["GOOGLE_API_KEY"]
+        )
+        
+        # Initialize vector store
+        self._init_vector_store()
+    
+    def _init_vector_store(self) -> None:
+        """Initialize the PGVector store and create necessary tables."""
+        try:
+            # Create new collection with proper schema
+            self.vector_store = PGVector(
+                collection_name=self.collection_name,
+                connection=self.connection_string,
+                embeddings=self.embeddings,
+                pre_delete_collection=True,
+                use_jsonb=True,
+            )
+            
+            print(f"✅ Successfully initialized vector store collection: {self.collection_name}")
+            
+        except Exception as e:
+            print(f"❌ Fatal error initializing vector store: {str(e)}")
+            import traceback
+            print(f"Traceback: {traceback.format_exc()}")
+            raise
+    
+    def _generate_document_id(self, source: str, section_index: int, chunk_index: int) -> str:
+        """
+        Generate a unique document ID based on the page, section and chunk index.
+        
+        Args:
+            source: Path of the page
+            section_index: Index of the section within the page
+            chunk_index: Index of the chunk within the section
+            
+        Returns:
+            str: Unique document ID
+        """
+        content = f"{source}_{section_index}_{chunk_index}".encode()
+        return hashlib.md5(content).hexdigest()
+    
+    def _split_record(self, record: Dict[str, Any]) -> List[Document]:
+        """
+        Split one section record into chunks carrying its title path.
+        
+        Args:
+            record: Section record from GitBookConverter.iter_records
+            
+        Returns:
+            List[Document]: List of document chunks
+        """
+        source = record['source']
+        text = record['text']
+        if self.quality_gate is not None:
+            text = self.quality_gate.clean_text(text, source)
+        doc = Document(page_content=text, metadata={
+            'source': source,
+            'title_path': ' > '.join(record['title_path']),
+            'section_index': record['section_index']
+        })
+        chunks = self.text_splitter.split_documents([doc])
+        if self.quality_gate is not None:
+            chunks = self.quality_gate.filter_chunks(chunks, source)
+        for i, chunk in enumerate(chunks):
+            chunk.metadata.update({
+                'chunk_index': i,
+                'document_id': self._generate_document_id(source, record['section_index'], i)
+            })
+        return chunks
+    
+    def _add_batch(self, batch: List[Document]) -> bool:
+        """Embed and write one batch of chunks."""
+        try:
+            self.vector_store.add_documents(batch, ids=[chunk.metadata['document_id'] for chunk in batch])
+            return True
+        except Exception as e:
+            print(f"❌ Error adding {len(batch)} chunks to vector store: {e}")
+            return False
+    
+    def add_documents(
+        self,
+        file_paths: List[Union[str, Path]],
+        batch_size: int = 64,
+        combined_output_dir: Optional[Union[str, Path]] = None,
+        **kwargs
+    ) -> None:
+        """
+        Add GitBook books to the vector store.
+        
+        Sections are streamed from the books, chunked and written in batches, so neither the
+        combined book nor all of its chunks are held in memory.
+        
+        Args:
+            file_paths: List of paths to GitBook directories
+            batch_size: Number of chunks embedded and written per batch
+            combined_output_dir: Optional directory to also write each combined book to
+            **kwargs: Additional arguments (not used)
+        """
+        stats = {'sections': 0, 'chunks': 0, 'errors': 0}
+        batch = []
+        for book_dir in file_paths:
+            book_dir = Path(book_dir)
+            combined_output_path = None
+            if combined_output_dir:
+                Path(combined_output_dir).mkdir(parents=True, exist_ok=True)
+                combined_output_path = Path(combined_output_dir) / f"{book_dir.name}.md"
+            print(f"🔄 Streaming GitBook: {book_dir}")
+            try:
+                for record in self.converter.iter_records(book_dir, combined_output_path=combined_output_path):
+                    stats['sections'] += 1
+                    batch.extend(self._split_record(record))
+                    if len(batch) >= batch_size:
+                        stats['chunks' if self._add_batch(batch) else 'errors'] += len(batch)
+                        batch = []
+            except ValueError as e:
+                print(f"❌ Error processing GitBook {book_dir}: {e}")
+        if batch:
+            stats['chunks' if self._add_batch(batch) else 'errors'] += len(batch)
+            
+        if self.quality_gate is not None:
+            self.quality_gate.print_report()
+        print(f"✅ Added {stats['chunks']} chunks from {stats['sections']} sections of {len(file_paths)} books "
+              f"to vector store ({stats['errors']} chunks failed)")
+    
+    def get_relevant_documents(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs
+    ) -> List[Document]:
+        """
+        Retrieve relevant documents for a query.
+        
+        Args:
+            query: The search query
+            k: Number of documents to retrieve
+            filter: Optional metadata filter
+            **kwargs: Additional arguments passed to similarity search
+            
+        Returns:
+            List[Document]: List of relevant documents
+        """
+        try:
+            return self.vector_store.similarity_search(
+                query,
+                k=k,
+                filter=filter,
+                **kwargs
+            )
+        except Exception as e:
+            print(f"❌ Error retrieving documents: {e}")
+            return []
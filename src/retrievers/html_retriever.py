@@ -1,6 +1,9 @@
 import hashlib
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Dict, Any
 
 import psycopg2
 from langchain.schema import Document
@@ -9,7 +12,9 @@ from langchain_postgres.vectorstores import PGVector
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 from ..preprocessors.html_crawler_preprocessor import HTMLCrawlerPreprocessor
+from ..utils.chunk_quality import ChunkQualityGate
 from ..utils.env_loader import load_env_vars, get_db_connection_string
+from ..utils.url_utils import canonicalize_url
 from .base_retriever import BaseRetriever
 
 
@@ -24,7 +29,10 @@ class HTMLRetriever(BaseRetriever):
         chunk_overlap: int = 6800,
         embedding_model: str = "models/text-embedding-004",
         max_pages: int = 10,
-        max_depth: int = 2
+        max_depth: int = 2,
+        crawl_engine: str = "asyncio",
+        pre_delete_collection: bool = True,
+        quality_gate: bool = True
     ):
         """
         Initialize the HTML retriever.
@@ -37,6 +45,11 @@ class HTMLRetriever(BaseRetriever):
             embedding_model: Name of the embedding model to use
             max_pages: Maximum number of pages to crawl
             max_depth: Maximum depth of crawling
+            crawl_engine: Crawl engine used by the preprocessor ("asyncio" or "scrapy")
+            pre_delete_collection: Whether to recreate the collection on startup. Keep the collection
+                                   (False) to skip re-embedding pages that did not change since the last crawl
+            quality_gate: Whether to strip base64 payloads, minified code and low-information chunks
+                          before embedding (see ChunkQualityGate)
         """
         # Load environment variables
         self.env_vars = load_env_vars()
@@ -46,11 +59,14 @@ class HTMLRetriever(BaseRetriever):
         self.collection_name = collection_name
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.pre_delete_collection = pre_delete_collection
+        self.quality_gate = ChunkQualityGate() if quality_gate else None
         
         # Initialize preprocessor
         self.preprocessor = HTMLCrawlerPreprocessor(
             max_pages=max_pages,
-            max_depth=max_depth
+            max_depth=max_depth,
+            engine=crawl_engine
         )
         
         # Initialize text splitter
@@ -78,7 +94,7 @@ class HTMLRetriever(BaseRetriever):
                 collection_name=self.collection_name,
                 connection=self.connection_string,
                 embeddings=self.embeddings,
-                pre_delete_collection=True,
+                pre_delete_collection=self.pre_delete_collection,
                 use_jsonb=True,
             )
 
@@ -104,12 +120,63 @@ class HTMLRetriever(BaseRetriever):
         content = f"{url}_{chunk_index}".encode()
         return hashlib.md5(content).hexdigest()
     
-    def _process_and_split_document(self, url: str) -> List[Document]:
+    def _split_text(self, url: str, text: str) -> List[Document]:
+        """
+        Split the cleaned content of a page into chunks with stable document IDs.
+        
+        Args:
+            url: URL of the page
+            text: Cleaned content of the page
+            
+        Returns:
+            List[Document]: List of document chunks
+        """
+        if self.quality_gate is not None:
+            text = self.quality_gate.clean_text(text, url)
+        doc = Document(page_content=text, metadata={'source': url})
+        chunks = self.text_splitter.split_documents([doc])
+        if self.quality_gate is not None:
+            chunks = self.quality_gate.filter_chunks(chunks, url)
+        for i, chunk in enumerate(chunks):
+            chunk.metadata.update({
+                'chunk_index': i,
+                'document_id': self._generate_document_id(url, i)
+            })
+        return chunks
+    
+    def _delete_stale_chunks(self, url: str, chunks: List[Document]) -> None:
+        """
+        Delete the chunks a re-embedded page had beyond its new chunk count.
+        
+        The new chunks overwrite the previous ones by their stable IDs, so only the chunk indexes
+        past the new count are left behind when a page shrinks. Pages without chunks (e.g. a failed
+        read) keep their previous ones.
+        
+        Args:
+            url: URL of the page
+            chunks: New chunks of the page
+        """
+        if not chunks:
+            return
+        page_store = self.preprocessor.page_store
+        previous_count = page_store.get_chunk_count(url, self.collection_name)
+        if previous_count > len(chunks) and not self.pre_delete_collection:
+            stale_ids = [self._generate_document_id(url, i) for i in range(len(chunks), previous_count)]
+            try:
+                self.vector_store.delete(ids=stale_ids, collection_only=True)
+                print(f"🧹 Deleted {len(stale_ids)} stale chunks of {url}")
+            except Exception as e:
+                print(f"❌ Error deleting stale chunks of {url}: {e}")
+                return
+        page_store.set_chunk_count(url, self.collection_name, len(chunks))
+    
+    def _process_and_split_document(self, url: str, md_path: Optional[str] = None) -> List[Document]:
         """
         Process a URL and split it into chunks.
         
         Args:
             url: URL to process
+            md_path: Optional path of the URL's already processed markdown (skips crawling)
             
         Returns:
             List[Document]: List of document chunks
@@ -118,7 +185,8 @@ class HTMLRetriever(BaseRetriever):
             print(f"🔄 Processing URL: {url}")
             
             # Process URL and get markdown content
-            md_path = self.preprocessor.process_url(url)
+            if md_path is None:
+                md_path = self.preprocessor.process_url(url)
             if not md_path or not Path(md_path).exists():
                 print(f"❌ Markdown file not created at {md_path}")
                 return []
@@ -138,21 +206,11 @@ class HTMLRetriever(BaseRetriever):
                 print("❌ Markdown file is empty")
                 return []
             
-            # Create Document object from text
-            doc = Document(page_content=text, metadata={'source': url})
-            
-            # Split into chunks
             print("🔄 Splitting document into chunks...")
-            chunks = self.text_splitter.split_documents([doc])
+            chunks = self._split_text(url, text)
             print(f"✅ Created {len(chunks)} chunks")
-            
-            # Add metadata to chunks
-            for i, chunk in enumerate(chunks):
-                chunk.metadata.update({
-                    'chunk_index': i,
-                    'document_id': self._generate_document_id(url, i)
-                })
-            
+            if self.quality_gate is not None:
+                self.quality_gate.print_report(url)
             return chunks
         except Exception as e:
             print(f"❌ Error processing URL {url}: {str(e)}")
@@ -160,25 +218,154 @@ class HTMLRetriever(BaseRetriever):
             print(f"Traceback: {traceback.format_exc()}")
             return []
     
-    def add_documents(self, urls: List[str], **kwargs) -> None:
+    def add_documents(self, urls: List[str], streaming: bool = False, **kwargs) -> None:
         """
         Add web documents to the vector store.
         
         Args:
             urls: List of URLs to process and add
-            **kwargs: Additional arguments (not used)
+            streaming: Embed every crawled page as soon as it is fetched (see add_documents_streaming)
+                       instead of only the given URLs after the crawl has finished
+            **kwargs: Additional arguments passed to add_documents_streaming
         """
+        if streaming:
+            self.add_documents_streaming(urls, **kwargs)
+            return
+        
+        # Crawl all URLs in one run of the crawler
+        md_paths = self.preprocessor.process_urls(urls)
+        
+        processed_urls = {canonicalize_url(url) for url, md_path in zip(urls, md_paths) if md_path}
+        
         all_chunks = []
-        for url in urls:
-            chunks = self._process_and_split_document(url)
+        for url, md_path in zip(urls, md_paths):
+            if md_path is None:
+                print(f"❌ Could not process URL: {url}")
+                continue
+            alias_target = self.preprocessor.get_alias_target(url)
+            if alias_target in processed_urls:
+                print(f"♻️ Near-duplicate of {alias_target}, not embedding again: {url}")
+                continue
+            if url in self.preprocessor.unchanged_urls and not self.pre_delete_collection:
+                print(f"⏭️ Not modified since last crawl, keeping existing embeddings: {url}")
+                continue
+            chunks = self._process_and_split_document(url, md_path)
+            self._delete_stale_chunks(url, chunks)
             all_chunks.extend(chunks)
         
         if all_chunks:
             try:
-                self.vector_store.add_documents(all_chunks)
+                # Stable chunk IDs let re-embedded pages overwrite their previous chunks
+                self.vector_store.add_documents(
+                    all_chunks,
+                    ids=[chunk.metadata['document_id'] for chunk in all_chunks]
+                )
                 print(f"✅ Added {len(all_chunks)} chunks from {len(urls)} URLs to vector store")
             except Exception as e:
                 print(f"❌ Error adding documents to vector store: {e}")
+        if self.quality_gate is not None:
+            self.quality_gate.print_report()
+    
+    def add_documents_streaming(self, urls: List[str], batch_size: int = 32, queue_size: int = 4) -> Dict[str, Any]:
+        """
+        Crawl, clean, chunk, embed and write web documents as a streaming pipeline.
+        
+        Each page is chunked as soon as it is fetched; chunk batches flow through bounded queues to an
+        embedding thread and a database writer thread, so the stages overlap instead of running one
+        after another and the first pages become searchable while the crawl is still running.
+        
+        Args:
+            urls: Seed URLs to crawl (links are followed within each seed's host)
+            batch_size: Number of chunks embedded and written per batch
+            queue_size: Maximum number of batches waiting between two stages
+            
+        Returns:
+            Dict[str, Any]: Pipeline statistics (pages, chunks, batches, errors, seconds to the first
+            searchable page, total seconds and seconds spent per stage)
+        """
+        stats = {
+            'pages': 0, 'chunks': 0, 'batches': 0, 'errors': 0,
+            'first_searchable_seconds': None, 'seconds': 0.0,
+            'stage_seconds': {'crawl_and_chunk': 0.0, 'embed': 0.0, 'write': 0.0}
+        }
+        embed_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        done = object()
+        start = time.perf_counter()
+        
+        def embed_stage():
+            while True:
+                batch = embed_queue.get()
+                if batch is done:
+                    write_queue.put(done)
+                    return
+                stage_start = time.perf_counter()
+                try:
+                    vectors = self.embeddings.embed_documents([chunk.page_content for chunk in batch])
+                    write_queue.put((batch, vectors))
+                except Exception as e:
+                    stats['errors'] += 1
+                    print(f"❌ Error embedding {len(batch)} chunks: {e}")
+                stats['stage_seconds']['embed'] += time.perf_counter() - stage_start
+        
+        def write_stage():
+            while True:
+                item = write_queue.get()
+                if item is done:
+                    return
+                batch, vectors = item
+                stage_start = time.perf_counter()
+                try:
+                    self.vector_store.add_embeddings(
+                        texts=[chunk.page_content for chunk in batch],
+                        embeddings=vectors,
+                        metadatas=[chunk.metadata for chunk in batch],
+                        ids=[chunk.metadata['document_id'] for chunk in batch]
+                    )
+                    stats['batches'] += 1
+                    if stats['first_searchable_seconds'] is None:
+                        stats['first_searchable_seconds'] = time.perf_counter() - start
+                        print(f"🔎 First pages searchable after {stats['first_searchable_seconds']:.1f}s")
+                except Exception as e:
+                    stats['errors'] += 1
+                    print(f"❌ Error adding {len(batch)} chunks to vector store: {e}")
+                stats['stage_seconds']['write'] += time.perf_counter() - stage_start
+        
+        workers = [threading.Thread(target=embed_stage), threading.Thread(target=write_stage)]
+        for worker in workers:
+            worker.start()
+        
+        batch = []
+        try:
+            stage_start = time.perf_counter()
+            for url, text in self.preprocessor.iter_crawl(urls):
+                if url in self.preprocessor.unchanged_urls and not self.pre_delete_collection:
+                    print(f"⏭️ Not modified since last crawl, keeping existing embeddings: {url}")
+                    continue
+                stats['pages'] += 1
+                chunks = self._split_text(url, text)
+                self._delete_stale_chunks(url, chunks)
+                for chunk in chunks:
+                    batch.append(chunk)
+                    if len(batch) >= batch_size:
+                        stats['chunks'] += len(batch)
+                        embed_queue.put(batch)
+                        batch = []
+            stats['stage_seconds']['crawl_and_chunk'] = time.perf_counter() - stage_start
+            if batch:
+                stats['chunks'] += len(batch)
+                embed_queue.put(batch)
+        finally:
+            embed_queue.put(done)
+            for worker in workers:
+                worker.join()
+        
+        stats['seconds'] = time.perf_counter() - start
+        if self.quality_gate is not None:
+            self.quality_gate.print_report()
+        print(f"✅ Streamed {stats['chunks']} chunks from {stats['pages']} pages to vector store "
+              f"in {stats['seconds']:.1f}s with {stats['errors']} errors")
+        return stats
     
     def get_relevant_documents(
         self,
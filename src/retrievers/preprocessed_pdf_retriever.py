@@ -9,6 +9,7 @@ from pathlib import Path
 
 from .base_retriever import BaseRetriever
 from ..preprocessors.pdf_preprocessor import PDFPreprocessor
+from ..utils.chunk_quality import ChunkQualityGate
 from ..utils.env_loader import load_env_vars, get_db_connection_string
 
 
@@ -21,7 +22,8 @@ class PreprocessedPDFRetriever(BaseRetriever):
         collection_name: str = "preprocessed_documents",
         chunk_size: int = 7000,
         chunk_overlap: int = 6800,
-        embedding_model: str = "models/text-embedding-004"
+        embedding_model: str = "models/text-embedding-004",
+        quality_gate: bool = True
     ):
         """
         Initialize the preprocessed PDF retriever.
@@ -32,6 +34,8 @@ class PreprocessedPDFRetriever(BaseRetriever):
             chunk_size: Size of text chunks for splitting
             chunk_overlap: Overlap between chunks
             embedding_model: Name of the embedding model to use
+            quality_gate: Whether to strip base64 payloads, minified code and low-information chunks
+                          before embedding (see ChunkQualityGate)
         """
         # Load environment variables
         self.env_vars = load_env_vars()
@@ -41,6 +45,7 @@ class PreprocessedPDFRetriever(BaseRetriever):
         self.collection_name = collection_name
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.quality_gate = ChunkQualityGate() if quality_gate else None
         
         # Initialize preprocessor
         self.preprocessor = PDFPreprocessor()
@@ -131,13 +136,21 @@ class PreprocessedPDFRetriever(BaseRetriever):
                 print("❌ Markdown file is empty")
                 return []
             
+            # Strip payloads that are not worth embedding
+            if self.quality_gate is not None:
+                text = self.quality_gate.clean_text(text, str(file_path))
+            
             # Create Document object from text
             doc = Document(page_content=text, metadata={'source': str(file_path)})
             
             # Split into chunks
             print("🔄 Splitting document into chunks...")
             chunks = self.text_splitter.split_documents([doc])
+            if self.quality_gate is not None:
+                chunks = self.quality_gate.filter_chunks(chunks, str(file_path))
             print(f"✅ Created {len(chunks)} chunks")
+            if self.quality_gate is not None:
+                self.quality_gate.print_report(str(file_path))
             
             # Add metadata to chunks
             for i, chunk in enumerate(chunks):
@@ -172,6 +185,8 @@ class PreprocessedPDFRetriever(BaseRetriever):
                 print(f"✅ Added {len(all_chunks)} chunks from {len(file_paths)} documents to vector store")
             except Exception as e:
                 print(f"❌ Error adding documents to vector store: {e}")
+        if self.quality_gate is not None:
+            self.quality_gate.print_report()
     
     def get_relevant_documents(
         self,
@@ -0,0 +1,225 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache_utils import ContentCache, build_cache_key, compute_text_hash
+
+
+class AssetFetcher:
+    """
+    Shared downloader for images, stylesheets and other assets referenced by documents.
+
+    All downloads go through one pooled requests.Session. Assets are stored in a
+    content-addressed on-disk cache (a URL index points to blobs named by the SHA-256 of
+    their content, so identical assets behind different URLs are stored once) that is
+    evicted least-recently-used beyond a size cap. Concurrent requests for the same URL
+    share one download, failed URLs are not retried within a run, and prefetch() downloads
+    all assets of a batch with bounded concurrency before the documents are processed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = None,
+        max_cache_bytes: int = 512 * 1024 * 1024,
+        max_workers: int = 8,
+        timeout: float = 10,
+        headers: Dict[str, str] = None
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            cache_dir: Directory of the asset cache. If None, uses .cache/assets
+            max_cache_bytes: Size cap of the cached asset contents (least recently used assets are evicted)
+            max_workers: Maximum number of concurrent downloads (also the connection pool size)
+            timeout: Timeout in seconds of one download
+            headers: Optional headers sent with every request
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Path('.cache') / 'assets'
+        self.blobs = ContentCache(self.cache_dir / 'blobs', compress=False)
+        self.urls = ContentCache(self.cache_dir / 'urls', compress=False)
+        self.max_cache_bytes = max_cache_bytes
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        self.headers = dict(headers or {})
+        self._init_runtime()
+        self.reset_stats()
+
+    def _init_runtime(self) -> None:
+        """Create the session, lock and in-flight table (not copied when the fetcher is pickled)."""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.headers)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._failed: Dict[str, str] = {}
+        self._fetched: Set[str] = set()
+
+    def __getstate__(self) -> Dict:
+        # Worker processes get their own session and lock
+        state = self.__dict__.copy()
+        for name in ('session', '_lock', '_in_flight', '_failed', '_fetched'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._init_runtime()
+
+    def reset_stats(self) -> None:
+        """Start a new run: reset the counters and forget the URLs fetched or failed so far."""
+        with self._lock:
+            self.stats = {"requests": 0, "hits": 0, "downloads": 0, "shared": 0, "failures": 0,
+                          "bytes_downloaded": 0, "bytes_saved": 0}
+            self._failed = {}
+            self._fetched = set()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def _lookup(self, url: str) -> Optional[Dict]:
+        """Read an asset from the cache, or None if the URL or its content is not cached."""
+        url_key = build_cache_key('asset', url)
+        content_hash = self.urls.get_text(url_key)
+        if content_hash is None:
+            return None
+        data = self.blobs.get(content_hash)
+        if data is None:
+            return None
+        metadata = self.urls.get_metadata(url_key)
+        return {"url": url, "data": data, "content_type": metadata.get("content_type"), "hash": content_hash}
+
+    def _download(self, url: str) -> Optional[Dict]:
+        """Download an asset and store it in the cache."""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._failed[url] = str(e)
+            print(f"⚠️ Error downloading {url}: {e}")
+            return None
+        if response.status_code != 200:
+            self._failed[url] = f"status code {response.status_code}"
+            print(f"⚠️ Failed to download {url}: Status code {response.status_code}")
+            return None
+
+        data = response.content
+        content_hash = compute_text_hash(data)
+        content_type = response.headers.get('Content-Type')
+        if not self.blobs.contains(content_hash):
+            self.blobs.put(content_hash, data)
+        self.urls.put(build_cache_key('asset', url), content_hash, {"url": url, "content_type": content_type})
+        self._count("downloads")
+        self._count("bytes_downloaded", len(data))
+        return {"url": url, "data": data, "content_type": content_type, "hash": content_hash}
+
+    def cached_hash(self, url: str) -> Optional[str]:
+        """
+        Look up the content hash of a cached asset without reading or downloading it.
+
+        Args:
+            url: URL of the asset
+
+        Returns:
+            Optional[str]: SHA-256 of the cached content, or None if the asset is not cached
+        """
+        content_hash = self.urls.get_text(build_cache_key('asset', url))
+        if content_hash is None or not self.blobs.contains(content_hash):
+            return None
+        return content_hash
+
+    def fetch(self, url: str) -> Optional[Dict]:
+        """
+        Get an asset from the cache or download it.
+
+        Args:
+            url: URL of the asset
+
+        Returns:
+            Optional[Dict]: Asset with url, data, content_type and (content) hash, or None if it failed
+        """
+        self._count("requests")
+        with self._lock:
+            if url in self._failed:
+                self.stats["failures"] += 1
+                return None
+            future = self._in_flight.get(url)
+            owner = future is None
+            if owner:
+                future = self._in_flight[url] = Future()
+
+        if not owner:
+            self._count("shared")
+            asset = future.result()
+            if asset is None:
+                self._count("failures")
+            else:
+                self._count("bytes_saved", len(asset["data"]))
+            return asset
+
+        asset = None
+        try:
+            asset = self._lookup(url)
+            if asset is not None:
+                self._count("hits")
+                self._count("bytes_saved", len(asset["data"]))
+            else:
+                asset = self._download(url)
+                if asset is None:
+                    self._count("failures")
+        finally:
+            future.set_result(asset)
+            with self._lock:
+                self._in_flight.pop(url, None)
+                if asset is not None:
+                    self._fetched.add(url)
+        return asset
+
+    def prefetch(self, urls: Iterable[str]) -> int:
+        """
+        Download all assets of a batch concurrently (bounded by max_workers).
+
+        Args:
+            urls: Asset URLs (duplicates and URLs already fetched or failed in this run are skipped)
+
+        Returns:
+            int: Number of assets newly fetched
+        """
+        with self._lock:
+            unique_urls = [url for url in dict.fromkeys(urls)
+                           if url and url not in self._fetched and url not in self._failed]
+        if not unique_urls:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            assets = list(executor.map(self.fetch, unique_urls))
+        self.evict()
+        return sum(1 for asset in assets if asset is not None)
+
+    def evict(self) -> None:
+        """Evict least recently used assets beyond the cache size cap."""
+        removed, freed = self.blobs.evict(self.max_cache_bytes)
+        if removed:
+            print(f"🧹 Evicted {removed} cached assets ({freed / 1024 / 1024:.1f} MiB)")
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of asset requests served without a download."""
+        requests_made = self.stats["requests"] - self.stats["failures"]
+        return (self.stats["hits"] + self.stats["shared"]) / requests_made if requests_made > 0 else 0.0
+
+    def print_report(self) -> None:
+        """Print the asset statistics of the current run."""
+        stats = self.stats
+        if not stats['requests']:
+            return
+        print(f"📦 Assets: {stats['requests']} requests, {stats['downloads']} downloaded "
+              f"({stats['bytes_downloaded'] / 1024:.0f} KiB), {stats['hits'] + stats['shared']} from cache "
+              f"({self.hit_rate:.0%} hit rate, {stats['bytes_saved'] / 1024:.0f} KiB saved), "
+              f"{stats['failures']} failed")
@@ -0,0 +1,223 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Union, Optional, Dict, Any, Tuple
+
+
+def compute_file_hash(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 hash of a file without loading it fully into memory.
+
+    Args:
+        file_path: Path to file
+        chunk_size: Number of bytes read per iteration (default: 1 MiB)
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def compute_text_hash(content: Union[str, bytes]) -> str:
+    """
+    Compute the SHA-256 hash of a string or bytes object.
+
+    Args:
+        content: Content to hash (strings are encoded as utf-8)
+
+    Returns:
+        str: Hex digest of the content
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def build_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from arbitrary JSON-serializable parts.
+
+    Args:
+        *parts: Values that identify the cached entry (hashes, option dicts, versions, ...)
+
+    Returns:
+        str: Hex digest identifying the combination of parts
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return compute_text_hash(payload)
+
+
+def atomic_write_bytes(file_path: Union[str, Path], data: bytes) -> None:
+    """
+    Write bytes to a file atomically (temporary file in the same directory + rename).
+
+    Args:
+        file_path: Destination path
+        data: Content to write
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ContentCache:
+    """On-disk, content-addressed cache storing gzip-compressed blobs with optional JSON metadata."""
+
+    def __init__(self, cache_dir: Union[str, Path], compress: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            compress: Whether to gzip-compress stored blobs
+        """
+        self.cache_dir = Path(cache_dir)
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+
+    def _blob_path(self, key: str) -> Path:
+        """Return the path of the blob stored under a key (sharded by key prefix)."""
+        suffix = '.gz' if self.compress else '.bin'
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def _meta_path(self, key: str) -> Path:
+        """Return the path of the metadata file stored under a key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def contains(self, key: str) -> bool:
+        """Check whether an entry exists for a key."""
+        return self._blob_path(key).exists()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read the blob stored under a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[bytes]: The cached content, or None on a miss or unreadable entry
+        """
+        blob_path = self._blob_path(key)
+        try:
+            data = blob_path.read_bytes()
+            if self.compress:
+                data = gzip.decompress(data)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError) as e:
+            print(f"⚠️ Discarding corrupt cache entry {blob_path}: {e}")
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        # Refresh the modification time so size-capped eviction keeps recently used entries
+        try:
+            os.utime(blob_path)
+        except OSError:
+            pass
+        return data
+
+    def get_text(self, key: str, encoding: str = 'utf-8') -> Optional[str]:
+        """Read a cached blob as text."""
+        data = self.get(key)
+        return data.decode(encoding) if data is not None else None
+
+    def get_metadata(self, key: str) -> Dict[str, Any]:
+        """Read the metadata stored alongside a key (empty dict if none)."""
+        try:
+            return json.loads(self._meta_path(key).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def put(self, key: str, data: Union[str, bytes], metadata: Dict[str, Any] = None) -> Path:
+        """
+        Store a blob (and optional metadata) under a key.
+
+        Args:
+            key: Cache key
+            data: Content to store (strings are encoded as utf-8)
+            metadata: Optional JSON-serializable metadata
+
+        Returns:
+            Path: Path of the stored blob
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        blob_path = self._blob_path(key)
+        payload = gzip.compress(data, compresslevel=6, mtime=0) if self.compress else data
+        atomic_write_bytes(blob_path, payload)
+        if metadata is not None:
+            atomic_write_bytes(
+                self._meta_path(key),
+                json.dumps(metadata, ensure_ascii=False, default=str).encode('utf-8')
+            )
+        return blob_path
+
+    def delete(self, key: str) -> None:
+        """Remove an entry and its metadata from the cache."""
+        for path in (self._blob_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def total_size(self) -> int:
+        """Return the total size in bytes of the stored blobs."""
+        suffix = '.gz' if self.compress else '.bin'
+        return sum(path.stat().st_size for path in self.cache_dir.glob(f'*/*{suffix}'))
+
+    def evict(self, max_bytes: int) -> Tuple[int, int]:
+        """
+        Remove least recently used entries until the blobs fit in a size budget.
+
+        Args:
+            max_bytes: Maximum total size of the stored blobs
+
+        Returns:
+            Tuple[int, int]: Number of removed entries and number of freed bytes
+        """
+        suffix = '.gz' if self.compress else '.bin'
+        entries = []
+        for path in self.cache_dir.glob(f'*/*{suffix}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        freed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= max_bytes:
+                break
+            self.delete(path.name[:-len(suffix)])
+            total -= size
+            freed += size
+            removed += 1
+        return removed, freed
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,164 @@
+import base64
+import binascii
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from langchain.schema import Document
+
+from .cache_utils import ContentCache, compute_text_hash
+
+# data: URIs with a base64 payload (markdown images, inline CSS/HTML attributes)
+DATA_URI_PATTERN = re.compile(r'data:([\w.+-]+/[\w.+-]+)?(?:;[\w-]+=[\w.-]+)*;base64,([A-Za-z0-9+/]+=*)')
+# Bare base64 runs (no whitespace or punctuation for hundreds of characters)
+BASE64_RUN_PATTERN = re.compile(r'[A-Za-z0-9+/]{256,}={0,2}')
+# Link targets and bare URLs are ignored when judging whether a line is code
+URL_PATTERN = re.compile(r'<img\s[^>]*>|\S*://\S*')
+CODE_SYMBOLS = frozenset(';{}()=')
+
+
+class ChunkQualityGate:
+    """
+    Removes non-linguistic payloads from documents before they are chunked and embedded.
+
+    Base64 data URIs (e.g. inlined images) are replaced by a short placeholder or, if an
+    asset directory is given, written to a content-addressed store and replaced by a reference.
+    Bare base64 runs and long minified-code lines are stripped, and chunks that are left with
+    too little text or without any letters or digits (e.g. table separators) are dropped. Bytes and chunks removed are recorded per document.
+    """
+
+    def __init__(
+        self,
+        asset_dir: Union[str, Path] = None,
+        min_line_length: int = 2000,
+        max_space_ratio: float = 0.1,
+        min_symbol_ratio: float = 0.08,
+        min_chunk_chars: int = 20
+    ):
+        """
+        Initialize the gate.
+
+        Args:
+            asset_dir: Optional directory to externalize decoded data URI payloads to. If None, they are dropped
+            min_line_length: Lines at least this long (without URLs) are checked for minified code
+            max_space_ratio: Maximum fraction of spaces in a minified code line
+            min_symbol_ratio: Minimum fraction of code symbols (;{}()=) in a minified code line
+            min_chunk_chars: Chunks with fewer non-whitespace characters are dropped
+        """
+        self.assets = ContentCache(asset_dir, compress=False) if asset_dir else None
+        self.min_line_length = min_line_length
+        self.max_space_ratio = max_space_ratio
+        self.min_symbol_ratio = min_symbol_ratio
+        self.min_chunk_chars = min_chunk_chars
+        self.document_stats: Dict[str, Dict[str, int]] = {}
+
+    def _stats(self, source: str) -> Dict[str, int]:
+        return self.document_stats.setdefault(source, {
+            'data_uris': 0, 'base64_runs': 0, 'code_lines': 0,
+            'bytes_removed': 0, 'chunks_kept': 0, 'chunks_removed': 0, 'chunk_bytes_removed': 0
+        })
+
+    def _replace_data_uri(self, match: re.Match) -> str:
+        """Placeholder for a data URI, externalizing its payload if an asset directory is set."""
+        mime_type = match.group(1) or 'application/octet-stream'
+        if self.assets is not None:
+            try:
+                data = base64.b64decode(match.group(2), validate=True)
+            except (binascii.Error, ValueError):
+                data = None
+            if data is not None:
+                key = compute_text_hash(data)
+                if not self.assets.contains(key):
+                    self.assets.put(key, data, {'content_type': mime_type})
+                return f"asset:{key}"
+        return f"data:{mime_type};base64,omitted"
+
+    def _is_code_line(self, line: str) -> bool:
+        """Check whether a line looks like minified code (long, dense in code symbols, hardly any spaces)."""
+        if len(line) < self.min_line_length or line.lstrip().startswith('|'):
+            return False
+        line = URL_PATTERN.sub('', line)
+        length = len(line)
+        if length < self.min_line_length or line.count(' ') / length > self.max_space_ratio:
+            return False
+        return sum(1 for char in line if char in CODE_SYMBOLS) / length > self.min_symbol_ratio
+
+    def clean_text(self, text: str, source: str = '') -> str:
+        """
+        Strip base64 payloads and minified code from a document.
+
+        Args:
+            text: Document text (markdown)
+            source: Source of the document (key of its statistics)
+
+        Returns:
+            str: Cleaned text
+        """
+        stats = self._stats(source)
+        original_length = len(text)
+
+        if 'base64,' in text:
+            text, count = DATA_URI_PATTERN.subn(self._replace_data_uri, text)
+            stats['data_uris'] += count
+        text, count = BASE64_RUN_PATTERN.subn('', text)
+        stats['base64_runs'] += count
+
+        if any(len(line) >= self.min_line_length for line in text.split('\n')):
+            lines = []
+            for line in text.split('\n'):
+                if self._is_code_line(line):
+                    stats['code_lines'] += 1
+                else:
+                    lines.append(line)
+            text = '\n'.join(lines)
+
+        stats['bytes_removed'] += original_length - len(text)
+        return text
+
+    def is_informative(self, text: str) -> bool:
+        """Check whether a chunk contains enough text to be worth embedding."""
+        visible = len(text) - sum(1 for char in text if char.isspace())
+        # Numeric tables (prices, specs) are mostly digits and pipes, so only chunks without any
+        # letter or digit (separator rows, leftover markup) are dropped
+        return visible >= self.min_chunk_chars and any(char.isalnum() for char in text)
+
+    def filter_chunks(self, chunks: List[Document], source: str = '') -> List[Document]:
+        """
+        Drop chunks with too little text.
+
+        Args:
+            chunks: Chunks of one document
+            source: Source of the document (key of its statistics)
+
+        Returns:
+            List[Document]: Chunks to embed
+        """
+        stats = self._stats(source)
+        kept = []
+        for chunk in chunks:
+            if self.is_informative(chunk.page_content):
+                kept.append(chunk)
+            else:
+                stats['chunks_removed'] += 1
+                stats['chunk_bytes_removed'] += len(chunk.page_content)
+        stats['chunks_kept'] += len(kept)
+        return kept
+
+    def totals(self) -> Dict[str, int]:
+        """Sum the statistics of all documents."""
+        totals: Dict[str, int] = {}
+        for stats in self.document_stats.values():
+            for name, value in stats.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def print_report(self, source: Optional[str] = None) -> None:
+        """Print what the gate removed from one document, or from all documents if source is None."""
+        stats = self.document_stats.get(source, {}) if source is not None else self.totals()
+        if not stats.get('bytes_removed') and not stats.get('chunks_removed'):
+            return
+        label = source if source is not None else f"{len(self.document_stats)} documents"
+        print(f"🧽 Quality gate ({label}): removed {stats['bytes_removed']:,d} bytes "
+              f"({stats['data_uris']} data URIs, {stats['base64_runs']} base64 runs, {stats['code_lines']} code lines) "
+              f"and {stats['chunks_removed']} low-information chunks ({stats['chunk_bytes_removed']:,d} bytes), "
+              f"kept {stats['chunks_kept']} chunks")
@@ -17,7 +17,12 @@ def ensure_dir(dir_path: Union[str, Path]) -> Path:
     dir_path.mkdir(parents=True, exist_ok=True)
     return dir_path
 
-def get_output_path(input_path: Union[str, Path], output_dir: Union[str, Path], extension: str = '.md') -> Path:
+def get_output_path(
+    input_path: Union[str, Path], 
+    output_dir: Union[str, Path], 
+    extension: str = '.md',
+    base_dir: Union[str, Path] = None
+) -> Path:
     """
     Generate output file path from input path.
     
@@ -25,12 +30,16 @@ def get_output_path(input_path: Union[str, Path], output_dir: Union[str, Path],
         input_path: Path to input file
         output_dir: Directory for output file
         extension: File extension for output file (default: .md)
+        base_dir: Optional source root; if given, the input's path relative to it is
+                  mirrored under output_dir instead of flattening to the file name
         
     Returns:
         Path: Output file path
     """
     input_path = Path(input_path)
     output_dir = Path(output_dir)
+    if base_dir is not None:
+        return (output_dir / input_path.relative_to(base_dir)).with_suffix(extension)
     return output_dir / f"{input_path.stem}{extension}"
 
 def find_files(
@@ -0,0 +1,229 @@
+import os
+import re
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .regex_utils import (
+    convert_html_table,
+    gitbook_image_markdown,
+    hint_to_blockquote,
+    resolve_relative_link,
+    FIGURE_IMAGE_PATTERN,
+    GITBOOK_IMAGE_PATTERN,
+    RELATIVE_LINK_PATTERN,
+    EMPTY_ANCHOR_PATTERN,
+    MARK_OPEN_PATTERN
+)
+from .link_index import LinkResolutionIndex
+
+# Opening marker of every GitBook construct, in the order the multi-pass converter rewrote them
+TOKEN_MARKERS = {
+    'figure': r'<figure>',
+    'image': r'\[\]\(<',
+    'table': r'<table',
+    'hint': r'\{% hint style="',
+    'link': r'\]\(',
+    'anchor': r'<a\s',
+    'mark': r'<mark',
+    'space': r'&#x20;|&#xA0;|&nbsp;'
+}
+STAGE = {kind: stage for stage, kind in enumerate(TOKEN_MARKERS)}
+ALL_KINDS = frozenset(TOKEN_MARKERS)
+HINT_HEADER_END = '" %}\n'
+HINT_END = '\n{% endhint %}'
+
+
+def _kinds_after(kind: str) -> FrozenSet[str]:
+    """Constructs rewritten after the given one (and therefore also applied to its output)."""
+    return frozenset(other for other in TOKEN_MARKERS if STAGE[other] > STAGE[kind])
+
+
+class GitBookTransformer:
+    """
+    Single-pass rewriter for GitBook markdown.
+
+    One compiled alternation of opening markers locates every GitBook construct (figures,
+    asset images, HTML tables, hints, relative links, empty anchors, <mark> tags and space
+    entities) in a single left-to-right scan. Closing tags are located with str.find instead of
+    lazy DOTALL patterns, and a missing closing tag is remembered, so unclosed constructs cannot
+    make the scan quadratic. Nested content (table cells, hint bodies, marked text) is rewritten
+    with the constructs the multi-pass converter applied to it, so the output is identical to
+    running convert_images, the table conversion, convert_gitbook_hints, convert_relative_links
+    and clean_markdown one after another.
+    """
+
+    def __init__(
+        self,
+        assets_base_url: str = "https://github.com/vngcloud/docs/blob/main/Vietnamese/.gitbook/assets",
+        base_url: str = 'https://docs.vngcloud.vn/vng-cloud-document/vn',
+        base_dir_pattern: str = r'^.*?/data/(?:vngcloud_docs|English)',
+        table_converter: Callable[[str], str] = convert_html_table,
+        link_index=None
+    ):
+        """
+        Initialize the transformer.
+
+        Args:
+            assets_base_url: Base URL for GitBook assets
+            base_url: Base URL for converted relative links
+            base_dir_pattern: Pattern matching the local docs directory in resolved link paths
+            table_converter: Function converting an HTML table to markdown
+            link_index: Optional LinkResolutionIndex resolving relative links without filesystem calls
+                        (base_url and base_dir_pattern are then taken from the index). If None, an
+                        index is built on first use for every docs root matched by base_dir_pattern
+        """
+        self.assets_base_url = assets_base_url
+        self.base_url = base_url
+        self.base_dir_pattern = base_dir_pattern
+        self.table_converter = table_converter
+        self.link_index = link_index
+        self._root_indexes: Dict[str, LinkResolutionIndex] = {}
+        self._token_patterns: Dict[FrozenSet[str], re.Pattern] = {}
+        self._handlers = {
+            'figure': self._rewrite_figure,
+            'image': self._rewrite_image,
+            'table': self._rewrite_table,
+            'hint': self._rewrite_hint,
+            'link': self._rewrite_link,
+            'anchor': self._rewrite_anchor,
+            'mark': self._rewrite_mark,
+            'space': self._rewrite_space
+        }
+
+    def _token_pattern(self, kinds: FrozenSet[str]) -> re.Pattern:
+        """Compiled alternation of the opening markers of the given constructs."""
+        pattern = self._token_patterns.get(kinds)
+        if pattern is None:
+            markers = {kind: marker for kind, marker in TOKEN_MARKERS.items() if kind in kinds}
+            # A leading character-class lookahead lets the regex engine skip ordinary text quickly
+            first_chars = {marker[1] if marker.startswith('\\') else marker[0] for marker in markers.values()}
+            pattern = re.compile(
+                f"(?=[{re.escape(''.join(sorted(first_chars)))}])(?:"
+                + '|'.join(f"(?P<{kind}>{marker})" for kind, marker in markers.items()) + ')'
+            )
+            self._token_patterns[kinds] = pattern
+        return pattern
+
+    @staticmethod
+    def _find(text: str, needle: str, start: int, missing: Dict[str, int]) -> int:
+        """str.find that remembers the first position after which a needle no longer occurs."""
+        if needle in missing and start >= missing[needle]:
+            return -1
+        index = text.find(needle, start)
+        if index < 0:
+            missing[needle] = min(start, missing.get(needle, start))
+        return index
+
+    def _scan(self, text: str, kinds: FrozenSet[str], file_path: str) -> str:
+        """Rewrite the given constructs of a text in one left-to-right scan."""
+        if not text:
+            return text
+        token_pattern = self._token_pattern(kinds)
+        missing: Dict[str, int] = {}
+        parts: List[str] = []
+        position = 0
+        search_from = 0
+        while True:
+            token = token_pattern.search(text, search_from)
+            if token is None:
+                break
+            rewritten = self._handlers[token.lastgroup](text, token, file_path, missing)
+            if rewritten is None:
+                search_from = token.end()
+                continue
+            replacement, end = rewritten
+            parts.append(text[position:token.start()])
+            parts.append(replacement)
+            position = search_from = end
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def _image(self, asset_name: str, file_path: str) -> str:
+        """Markdown image for a GitBook asset, with the later rewrites applied to it."""
+        return self._scan(gitbook_image_markdown(asset_name, self.assets_base_url), _kinds_after('image'), file_path)
+
+    def _rewrite_figure(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        match = FIGURE_IMAGE_PATTERN.match(text, token.start())
+        return (self._image(match.group(1), file_path), match.end()) if match else None
+
+    def _rewrite_image(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        match = GITBOOK_IMAGE_PATTERN.match(text, token.start())
+        return (self._image(match.group(1), file_path), match.end()) if match else None
+
+    def _rewrite_table(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        close = self._find(text, '</table>', token.end(), missing)
+        if close < 0:
+            return None
+        end = close + len('</table>')
+        table = self._scan(text[token.start():end], frozenset({'figure', 'image'}), file_path)
+        return self._scan(self.table_converter(table), _kinds_after('table'), file_path), end
+
+    def _rewrite_hint(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        header_end = self._find(text, HINT_HEADER_END, token.end(), missing)
+        if header_end < 0:
+            return None
+        content_start = header_end + len(HINT_HEADER_END)
+        close = self._find(text, HINT_END, content_start, missing)
+        if close < 0:
+            return None
+        # Images and tables were rewritten before hints, links and cleanup after them
+        content = self._scan(text[content_start:close], frozenset({'figure', 'image', 'table'}), file_path)
+        quote = self._scan(hint_to_blockquote(content), _kinds_after('hint'), file_path)
+        return quote, close + len(HINT_END)
+
+    def _index_for(self, file_path: str) -> Optional[LinkResolutionIndex]:
+        """Link index of the docs root containing a file, built on first use (None outside any root)."""
+        if self.link_index is not None:
+            return self.link_index
+        root = re.match(self.base_dir_pattern, os.path.abspath(file_path))
+        if root is None or not os.path.isdir(root.group(0)):
+            return None
+        index = self._root_indexes.get(root.group(0))
+        if index is None:
+            index = self._root_indexes[root.group(0)] = LinkResolutionIndex(
+                root.group(0), self.base_url, self.base_dir_pattern, record_links=False
+            )
+        return index
+
+    def _rewrite_link(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        match = RELATIVE_LINK_PATTERN.match(text, token.start())
+        if match is None:
+            return None
+        relative_path, anchor = match.groups()
+        link_index = self._index_for(file_path)
+        if link_index is not None:
+            target = link_index.resolve(relative_path, anchor, file_path)
+        else:
+            target = resolve_relative_link(relative_path, anchor, file_path, self.base_url, self.base_dir_pattern)
+        return self._scan(f"]({target})", _kinds_after('link'), file_path), match.end()
+
+    def _rewrite_anchor(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        match = EMPTY_ANCHOR_PATTERN.match(text, token.start())
+        return ('', match.end()) if match else None
+
+    def _rewrite_mark(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        opening = MARK_OPEN_PATTERN.match(text, token.start())
+        if opening is None:
+            return None
+        close = self._find(text, '</mark>', opening.end(), missing)
+        if close < 0:
+            return None
+        content = self._scan(text[opening.end():close], ALL_KINDS, file_path)
+        return f"**{content}**", close + len('</mark>')
+
+    def _rewrite_space(self, text: str, token: re.Match, file_path: str, missing: Dict[str, int]) -> Optional[Tuple[str, int]]:
+        return ' ', token.end()
+
+    def transform(self, md_text: str, md_file_path: str) -> str:
+        """
+        Convert GitBook markdown to pure markdown.
+
+        Args:
+            md_text: GitBook markdown content
+            md_file_path: Path of the markdown file (used to resolve relative links)
+
+        Returns:
+            str: Converted markdown
+        """
+        return self._scan(md_text, ALL_KINDS, str(md_file_path))
@@ -0,0 +1,128 @@
+import time
+from pathlib import Path
+from typing import Union, Optional, Dict, Any
+
+from .cache_utils import ContentCache, build_cache_key, compute_text_hash
+
+
+def get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """
+    Look up a header case-insensitively.
+
+    Args:
+        headers: Response or request headers
+        name: Header name
+
+    Returns:
+        Optional[str]: The header value, or None if absent
+    """
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP responses used to revalidate pages on recrawls.
+
+    Bodies of cacheable responses (status 200 with an ETag or Last-Modified validator) are stored
+    in a ContentCache together with their validators, so the next crawl can send a conditional
+    request and reuse the stored body when the server answers 304 Not Modified.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the HTTP cache.
+
+        Args:
+            cache_dir: Directory holding the cached responses
+        """
+        self.cache = ContentCache(cache_dir)
+        self.stats = {'stored': 0, 'revalidated': 0, 'not_modified': 0}
+
+    @staticmethod
+    def _get_key(url: str) -> str:
+        """Return the cache key of a URL."""
+        return build_cache_key('http', url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build the conditional request headers for a URL.
+
+        Args:
+            url: URL about to be fetched
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers (empty if the URL is not cached)
+        """
+        key = self._get_key(url)
+        if not self.cache.contains(key):
+            return {}
+        metadata = self.cache.get_metadata(key)
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        if headers:
+            self.stats['revalidated'] += 1
+        return headers
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the cached response of a URL, e.g. after a 304 Not Modified answer.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached 'status', 'headers' and 'body' (bytes), or None if not cached
+        """
+        key = self._get_key(url)
+        body = self.cache.get(key)
+        if body is None:
+            return None
+        metadata = self.cache.get_metadata(key)
+        self.stats['not_modified'] += 1
+        return {
+            'status': metadata.get('status', 200),
+            'headers': metadata.get('headers', {}),
+            'body': body,
+        }
+
+    def invalidate(self, url: str) -> None:
+        """Remove the cached response of a URL."""
+        self.cache.delete(self._get_key(url))
+
+    def store(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """
+        Store a response if it can be revalidated later.
+
+        Args:
+            url: URL of the page
+            status: HTTP status code
+            headers: Response headers
+            body: Response body
+
+        Returns:
+            bool: True if the response was stored
+        """
+        etag = get_header(headers, 'ETag')
+        last_modified = get_header(headers, 'Last-Modified')
+        cache_control = (get_header(headers, 'Cache-Control') or '').lower()
+        if status != 200 or not (etag or last_modified) or 'no-store' in cache_control:
+            return False
+
+        self.cache.put(self._get_key(url), body, metadata={
+            'url': url,
+            'status': status,
+            'headers': dict(headers),
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': compute_text_hash(body),
+            'stored_at': time.time(),
+        })
+        self.stats['stored'] += 1
+        return True
@@ -0,0 +1,174 @@
+import os
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .file_utils import read_file_content
+from .regex_utils import resolve_relative_link
+
+SUMMARY_LINK_PATTERN = re.compile(r'\]\(<?([^)>#]+)(?:#[^)]*)?>?\)')
+# GitBook writes page mentions as [title](page.md "mention")
+LINK_TITLE_PATTERN = re.compile(r'\s+"[^"]*"$')
+
+
+class LinkResolutionIndex:
+    """
+    Resolves the relative links of a GitBook tree by path arithmetic.
+
+    The file listing and SUMMARY.md are read once per tree; afterwards every link is
+    resolved with posixpath instead of a filesystem call per link, and identical links
+    from the same directory are memoized. The resolved targets of every file are recorded,
+    so dangling links (missing targets, pages not published in SUMMARY.md, targets outside
+    the tree) can be reported afterwards. Results are identical to resolve_relative_link as
+    long as the tree contains no symbolic links.
+    """
+
+    def __init__(
+        self,
+        root_dir: Union[str, Path],
+        base_url: str = 'https://docs.vngcloud.vn/vng-cloud-document/vn',
+        base_dir_pattern: str = r'^.*?/data/(?:vngcloud_docs|English)',
+        record_links: bool = True
+    ):
+        """
+        Build the index of a GitBook tree.
+
+        Args:
+            root_dir: Root directory of the GitBook tree (containing SUMMARY.md)
+            base_url: Base URL for absolute links
+            base_dir_pattern: Pattern to match base directory
+            record_links: Whether to record resolved targets for the dangling link report
+                          (disable when nothing calls pop_links, so the records do not pile up)
+        """
+        self.root_dir = Path(root_dir)
+        self.base_url = base_url
+        self.base_dir_pattern = base_dir_pattern
+        self.record_links = record_links
+        self._base_dir_regex = re.compile(base_dir_pattern)
+        self._abs_root = os.path.abspath(root_dir)
+        self._real_root = os.path.realpath(root_dir)
+
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = {''}
+        for dir_path, dir_names, file_names in os.walk(self._abs_root):
+            relative_dir = os.path.relpath(dir_path, self._abs_root).replace(os.sep, '/')
+            relative_dir = '' if relative_dir == '.' else relative_dir
+            for name in dir_names:
+                self.dirs.add(posixpath.join(relative_dir, name))
+            for name in file_names:
+                self.files.add(posixpath.join(relative_dir, name))
+
+        self.summary_pages: Optional[Set[str]] = None
+        summary_path = self.root_dir / 'SUMMARY.md'
+        if summary_path.exists():
+            self.summary_pages = {
+                posixpath.normpath(target.strip())
+                for target in SUMMARY_LINK_PATTERN.findall(read_file_content(summary_path))
+            }
+
+        self._parents: Dict[str, Optional[str]] = {}
+        self._resolved: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._links: Dict[str, List[str]] = {}
+
+    def _real_parent(self, file_path: str) -> Optional[str]:
+        """Real path of a file's directory if the file lies inside the tree, else None."""
+        parent = os.path.dirname(os.path.abspath(file_path))
+        if parent == self._abs_root:
+            return self._real_root
+        if parent.startswith(self._abs_root + os.sep):
+            return self._real_root + parent[len(self._abs_root):].replace(os.sep, '/')
+        return None
+
+    def _target_key(self, absolute_path: str) -> str:
+        """Target relative to the tree root, or the absolute path for targets outside the tree."""
+        if absolute_path == self._real_root:
+            return ''
+        if absolute_path.startswith(self._real_root + '/'):
+            return absolute_path[len(self._real_root) + 1:]
+        return absolute_path
+
+    def resolve(self, relative_path: str, anchor: Optional[str], file_path: Union[str, Path]) -> str:
+        """
+        Resolve the target of a relative link to an absolute URL and record it for the report.
+
+        Args:
+            relative_path: Link target relative to the current file
+            anchor: Optional anchor ("#section") of the link
+            file_path: Path of the current file
+
+        Returns:
+            str: Absolute link target including the anchor
+        """
+        file_path = str(file_path)
+        parent = self._parents.get(file_path, False)
+        if parent is False:
+            parent = self._parents[file_path] = self._real_parent(file_path)
+        if parent is None:
+            return resolve_relative_link(relative_path, anchor, file_path, self.base_url, self.base_dir_pattern)
+
+        resolved = self._resolved.get((parent, relative_path))
+        if resolved is None:
+            absolute_path = posixpath.normpath(posixpath.join(parent, relative_path))
+            url = self._base_dir_regex.sub(self.base_url, absolute_path)
+            if url.endswith("/README.md"):
+                url = url.removesuffix("/README.md")
+            else:
+                url = url.removesuffix('.md')
+            resolved = (url, self._target_key(absolute_path))
+            self._resolved[(parent, relative_path)] = resolved
+
+        url, target = resolved
+        if self.record_links:
+            self._links.setdefault(file_path, []).append(target)
+        return f"{url}{anchor or ''}"
+
+    def pop_links(self, file_path: Union[str, Path]) -> List[str]:
+        """
+        Return and forget the link targets recorded for a file.
+
+        Args:
+            file_path: Path of the converted file
+
+        Returns:
+            List[str]: Targets relative to the tree root (absolute paths for targets outside it)
+        """
+        return self._links.pop(str(file_path), [])
+
+    def link_problem(self, target: str) -> Optional[str]:
+        """
+        Check a recorded link target.
+
+        Args:
+            target: Target as returned by pop_links()
+
+        Returns:
+            Optional[str]: 'outside', 'missing' or 'unlisted' (not published in SUMMARY.md), or None
+        """
+        target = LINK_TITLE_PATTERN.sub('', target)
+        if target.startswith('/'):
+            return 'outside'
+        if target not in self.files and target not in self.dirs:
+            return 'missing'
+        if (self.summary_pages is not None and target.endswith('.md') and target != 'SUMMARY.md'
+                and target not in self.summary_pages):
+            return 'unlisted'
+        return None
+
+    def dangling_links(self, links_by_source: Dict[str, List[str]]) -> List[Dict[str, str]]:
+        """
+        Report the dangling links of a set of files.
+
+        Args:
+            links_by_source: Recorded targets per source file
+
+        Returns:
+            List[Dict[str, str]]: One entry per dangling link with source, target and problem
+        """
+        report = []
+        for source, targets in links_by_source.items():
+            for target in dict.fromkeys(targets):
+                problem = self.link_problem(target)
+                if problem:
+                    report.append({"source": source, "target": target, "problem": problem})
+        return report
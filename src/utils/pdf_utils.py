@@ -0,0 +1,143 @@
+import re
+from pathlib import Path
+from typing import Union, List, Dict, Optional
+
+import fitz
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+TABLE_SEPARATOR_PATTERN = re.compile(r'^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$')
+
+
+def get_page_count(pdf_path: Union[str, Path]) -> int:
+    """
+    Get the number of pages of a PDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        int: Number of pages
+    """
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def split_pdf(pdf_path: Union[str, Path], output_dir: Union[str, Path], pages_per_shard: int) -> List[Dict]:
+    """
+    Split a PDF into page-range shards.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_dir: Directory to save the shard PDFs
+        pages_per_shard: Maximum number of pages per shard
+
+    Returns:
+        List[Dict]: Shards in page order, each with 'path', 'start_page' and 'end_page' (1-based, inclusive)
+    """
+    pdf_path = Path(pdf_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = []
+    with fitz.open(pdf_path) as doc:
+        for index, start in enumerate(range(0, doc.page_count, pages_per_shard)):
+            end = min(start + pages_per_shard, doc.page_count) - 1
+            shard_path = output_dir / f"{pdf_path.stem}.part{index:04d}.pdf"
+            with fitz.open() as shard:
+                shard.insert_pdf(doc, from_page=start, to_page=end)
+                shard.save(shard_path, garbage=3, deflate=True)
+            shards.append({
+                'path': shard_path,
+                'start_page': start + 1,
+                'end_page': end + 1
+            })
+    return shards
+
+
+def _is_table_line(line: str) -> bool:
+    """Check whether a markdown line is a pipe-table row."""
+    return line.lstrip().startswith('|')
+
+
+def _count_columns(row: str) -> int:
+    """Count the cells of a markdown pipe-table row."""
+    return len(row.strip().strip('|').split('|'))
+
+
+def _last_heading(lines: List[str]) -> Optional[str]:
+    """Return the text of the last heading in a list of markdown lines."""
+    for line in reversed(lines):
+        match = HEADING_PATTERN.match(line)
+        if match:
+            return match.group(2)
+    return None
+
+
+def _strip_blank_edges(lines: List[str]) -> List[str]:
+    """Remove leading and trailing blank lines."""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return lines[start:end]
+
+
+def stitch_markdown(parts: List[str]) -> str:
+    """
+    Stitch markdown converted from consecutive page-range shards back into one document.
+
+    Repairs the artifacts a shard boundary introduces:
+    - a table continuing on the next shard is re-joined; the continuation's separator row
+      is dropped and its header row kept as a body row, unless it repeats the table header
+    - a heading repeated at the start of a shard (running header) is dropped
+
+    Args:
+        parts: Markdown of each shard, in page order
+
+    Returns:
+        str: The stitched markdown document
+    """
+    stitched: List[str] = []
+
+    for part in parts:
+        lines = _strip_blank_edges(part.split('\n'))
+        if not lines:
+            continue
+        if not stitched:
+            stitched.extend(lines)
+            continue
+
+        previous_line = stitched[-1]
+        continues_table = (
+            _is_table_line(previous_line)
+            and len(lines) >= 2
+            and _is_table_line(lines[0])
+            and TABLE_SEPARATOR_PATTERN.match(lines[1].strip())
+            and _count_columns(lines[0]) == _count_columns(previous_line)
+        )
+
+        if continues_table:
+            # Find the header of the table the previous shard ended with
+            table_header = None
+            for i in range(len(stitched) - 1, 0, -1):
+                if not _is_table_line(stitched[i - 1]):
+                    break
+                if TABLE_SEPARATOR_PATTERN.match(stitched[i].strip()):
+                    table_header = stitched[i - 1]
+                    break
+            repeated_header = table_header is not None and lines[0].strip() == table_header.strip()
+            body = lines[2:] if repeated_header else [lines[0]] + lines[2:]
+            stitched.extend(body)
+            continue
+
+        first_heading = HEADING_PATTERN.match(lines[0])
+        if first_heading and first_heading.group(2) == _last_heading(stitched):
+            lines = _strip_blank_edges(lines[1:])
+            if not lines:
+                continue
+
+        stitched.append('')
+        stitched.extend(lines)
+
+    return '\n'.join(stitched) + '\n'
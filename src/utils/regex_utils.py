@@ -1,22 +1,66 @@
+import os
 import re
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Callable
 from bs4 import BeautifulSoup
 
-# Common regex patterns
-RELATIVE_LINK_PATTERN = r'\]\(((?!http|mailto:|<)[^)#]+)(#[^\)]*)?\)'
-GITBOOK_HINT_PATTERN = r'\{% hint style=".*?" %\}\n(.*?)\n\{% endhint %\}'
-HTML_TABLE_PATTERN = r"<table.*?</table>"
-FIGURE_IMAGE_PATTERN = r'<figure>\s*<img\s+src=["\'](?:\.\./)*\.gitbook/assets/([^"\']+)["\'].*?>\s*(?:<figcaption>.*?</figcaption>)?\s*</figure>'
-EMPTY_ANCHOR_PATTERN = r'<a\s+href="[^"]*"\s+id="[^"]*"></a>'
-GITBOOK_IMAGE_PATTERN = r'\[\]\(<(?:\.\./)*\.gitbook/assets/([^>]+)>\)'
-MARK_TAG_PATTERN = r'<mark[^>]*>(.*?)</mark>'
-SPACE_ENTITIES_PATTERN = r'&#x20;|&#xA0;|&nbsp;| '
+from .table_utils import html_table_to_markdown
+
+# Common regex patterns (compiled once at import)
+RELATIVE_LINK_PATTERN = re.compile(r'\]\(((?!http|mailto:|<)[^)#]+)(#[^\)]*)?\)')
+GITBOOK_HINT_PATTERN = re.compile(r'\{% hint style=".*?" %\}\n(.*?)\n\{% endhint %\}', re.DOTALL)
+HTML_TABLE_PATTERN = re.compile(r"<table.*?</table>", re.DOTALL)
+FIGURE_IMAGE_PATTERN = re.compile(r'<figure>\s*<img\s+src=["\'](?:\.\./)*\.gitbook/assets/([^"\']+)["\'].*?>\s*(?:<figcaption>.*?</figcaption>)?\s*</figure>')
+EMPTY_ANCHOR_PATTERN = re.compile(r'<a\s+href="[^"]*"\s+id="[^"]*"></a>')
+GITBOOK_IMAGE_PATTERN = re.compile(r'\[\]\(<(?:\.\./)*\.gitbook/assets/([^>]+)>\)')
+MARK_TAG_PATTERN = re.compile(r'<mark[^>]*>(.*?)</mark>', re.DOTALL)
+MARK_OPEN_PATTERN = re.compile(r'<mark[^>]*>')
+SPACE_ENTITIES_PATTERN = re.compile(r'&#x20;|&#xA0;|&nbsp;| ')
+
+@lru_cache(maxsize=65536)
+def _resolve_link_target(parent_dir: str, relative_path: str, base_url: str, base_dir_pattern: str) -> str:
+    """Resolve a link target of a directory to an absolute URL (memoized: files of one directory share their links)."""
+    absolute_path = (Path(parent_dir) / relative_path).resolve()
+    absolute_path = re.sub(base_dir_pattern, base_url, str(absolute_path))
+    
+    if absolute_path.endswith("/README.md"):
+        return absolute_path.removesuffix("/README.md")
+    return absolute_path.removesuffix('.md')
+
+def resolve_relative_link(
+    relative_path: str,
+    anchor: Optional[str],
+    file_path: str,
+    base_url: str = 'https://docs.vngcloud.vn/vng-cloud-document/vn',
+    base_dir_pattern: str = r'^.*?/data/(?:vngcloud_docs|English)'
+) -> str:
+    """
+    Resolve the target of a relative markdown link to an absolute URL.
+    
+    Resolved targets are memoized per directory, so the filesystem is queried once per
+    distinct link instead of once per occurrence.
+    
+    Args:
+        relative_path: Link target relative to the current file
+        anchor: Optional anchor ("#section") of the link
+        file_path: Path of the current file
+        base_url: Base URL for absolute links
+        base_dir_pattern: Pattern to match base directory
+        
+    Returns:
+        str: Absolute link target including the anchor
+    """
+    # Keyed by the absolute directory so a later change of working directory cannot return stale targets
+    target = _resolve_link_target(os.path.abspath(Path(file_path).parent), relative_path, base_url, base_dir_pattern)
+    return f"{target}{anchor or ''}"
 
 def convert_relative_links(
     content: str, 
     file_path: str, 
     base_url: str = 'https://docs.vngcloud.vn/vng-cloud-document/vn',
-    base_dir_pattern: str = r'^.*?/data/(?:vngcloud_docs|English)'
+    base_dir_pattern: str = r'^.*?/data/(?:vngcloud_docs|English)',
+    link_index=None
 ) -> str:
     """
     Convert relative links to absolute URLs.
@@ -26,26 +70,19 @@ def convert_relative_links(
         file_path: Path of the current file
         base_url: Base URL for absolute links
         base_dir_pattern: Pattern to match base directory
+        link_index: Optional LinkResolutionIndex of the GitBook tree (resolves links without
+                    filesystem calls; base_url and base_dir_pattern are then taken from the index)
         
     Returns:
         str: Content with converted links
     """
     def replace_link(match: re.Match) -> str:
         relative_path, anchor = match.groups()
-        anchor = anchor or ""
-        
-        from pathlib import Path
-        absolute_path = (Path(file_path).parent / relative_path).resolve()
-        absolute_path = re.sub(base_dir_pattern, base_url, str(absolute_path))
-        
-        if absolute_path.endswith("/README.md"):
-            absolute_path = absolute_path.removesuffix("/README.md")
-        else:
-            absolute_path = absolute_path.removesuffix('.md')
-            
-        return f"]({absolute_path}{anchor})"
-    
-    return re.sub(RELATIVE_LINK_PATTERN, replace_link, content)
+        if link_index is not None:
+            return f"]({link_index.resolve(relative_path, anchor, file_path)})"
+        return f"]({resolve_relative_link(relative_path, anchor, file_path, base_url, base_dir_pattern)})"
+    
+    return RELATIVE_LINK_PATTERN.sub(replace_link, content)
 
 def convert_html_elements(html: str, tag_processors: Dict[str, Callable] = None) -> str:
     """
@@ -83,27 +120,22 @@ def convert_html_table(html: str) -> str:
     Returns:
         str: Markdown table
     """
-    soup = BeautifulSoup(html, 'html.parser')
-    table = soup.find('table')
-    if not table:
-        return ""
-    
-    # Extract headers
-    headers = [th.text.strip() for th in table.find_all('th')]
-    if not headers:
-        return ""
-    
-    # Create table structure
-    header_row = "| " + " | ".join(headers) + " |"
-    separator = "| " + " | ".join(["---"] * len(headers)) + " |"
-    
-    # Convert rows
-    rows = []
-    for tr in table.find_all('tr')[1:]:
-        row_data = [convert_html_elements(str(td)) for td in tr.find_all('td')]
-        rows.append("| " + " | ".join(row_data) + " |")
-    
-    return "\n".join([header_row, separator] + rows)
+    return html_table_to_markdown(html)
+
+def hint_to_blockquote(hint_content: str) -> str:
+    """
+    Render the content of a GitBook hint block as a markdown blockquote.
+    
+    Args:
+        hint_content: Content between the hint tags
+        
+    Returns:
+        str: Blockquote lines
+    """
+    return "\n".join(
+        "> " + line if line.strip() else ">" 
+        for line in hint_content.strip().split("\n")
+    )
 
 def convert_gitbook_hints(content: str) -> str:
     """
@@ -115,14 +147,20 @@ def convert_gitbook_hints(content: str) -> str:
     Returns:
         str: Content with converted hints
     """
-    def replace_hint(match: re.Match) -> str:
-        hint_content = match.group(1).strip()
-        return "\n".join(
-            "> " + line if line.strip() else ">" 
-            for line in hint_content.split("\n")
-        )
+    return GITBOOK_HINT_PATTERN.sub(lambda m: hint_to_blockquote(m.group(1)), content)
+
+def gitbook_image_markdown(asset_name: str, assets_base_url: str) -> str:
+    """
+    Build the markdown image for a GitBook asset.
     
-    return re.sub(GITBOOK_HINT_PATTERN, replace_hint, content, flags=re.DOTALL)
+    Args:
+        asset_name: File name of the asset in .gitbook/assets
+        assets_base_url: Base URL for assets
+        
+    Returns:
+        str: Markdown image pointing to the raw asset
+    """
+    return f"![Image]({assets_base_url}/{asset_name.strip().replace(' ', '%20')}?raw=true)"
 
 def convert_images(
     content: str, 
@@ -139,18 +177,10 @@ def convert_images(
         str: Content with converted image references
     """
     # Convert figure/image tags
-    content = re.sub(
-        FIGURE_IMAGE_PATTERN,
-        lambda m: f"![Image]({assets_base_url}/{m.group(1).strip().replace(' ', '%20')}?raw=true)",
-        content
-    )
+    content = FIGURE_IMAGE_PATTERN.sub(lambda m: gitbook_image_markdown(m.group(1), assets_base_url), content)
     
     # Convert image references
-    content = re.sub(
-        GITBOOK_IMAGE_PATTERN,
-        lambda m: f"![Image]({assets_base_url}/{m.group(1).strip().replace(' ', '%20')}?raw=true)",
-        content
-    )
+    content = GITBOOK_IMAGE_PATTERN.sub(lambda m: gitbook_image_markdown(m.group(1), assets_base_url), content)
     
     return content
 
@@ -165,12 +195,12 @@ def clean_markdown(content: str) -> str:
         str: Cleaned markdown content
     """
     # Remove empty anchors
-    content = re.sub(EMPTY_ANCHOR_PATTERN, '', content)
+    content = EMPTY_ANCHOR_PATTERN.sub('', content)
     
     # Convert mark tags to bold
-    content = re.sub(MARK_TAG_PATTERN, r'**\1**', content, flags=re.DOTALL)
+    content = MARK_TAG_PATTERN.sub(r'**\1**', content)
     
     # Normalize spaces
-    content = re.sub(SPACE_ENTITIES_PATTERN, ' ', content)
+    content = SPACE_ENTITIES_PATTERN.sub(' ', content)
     
     return content
@@ -0,0 +1,112 @@
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Hashable
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _hash_feature(feature: str, bits: int) -> int:
+    """Hash a feature to an unsigned integer of the given bit width."""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=bits // 8).digest(), 'little')
+
+
+def simhash(text: str, bits: int = 64, shingle_size: int = 3) -> int:
+    """
+    Compute the SimHash fingerprint of a text.
+
+    Features are overlapping word shingles weighted by their frequency, so texts that differ
+    only in a few words (e.g. a version selector or print-view header) get fingerprints within
+    a small Hamming distance.
+
+    Args:
+        text: Text to fingerprint
+        bits: Fingerprint size in bits (multiple of 8)
+        shingle_size: Number of consecutive words per feature
+
+    Returns:
+        int: The fingerprint
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < shingle_size:
+        features = Counter([' '.join(tokens)]) if tokens else Counter()
+    else:
+        features = Counter(' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+
+    weights = [0] * bits
+    for feature, weight in features.items():
+        value = _hash_feature(feature, bits)
+        for bit in range(bits):
+            weights[bit] += weight if value >> bit & 1 else -weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Return the number of differing bits of two fingerprints."""
+    return bin(first ^ second).count('1')
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup for SimHash fingerprints.
+
+    Fingerprints are split into max_distance + 1 bands: two fingerprints within max_distance bits
+    share at least one identical band (pigeonhole principle), so a lookup only compares the
+    candidates of its bands instead of every stored fingerprint.
+    """
+
+    def __init__(self, max_distance: int = 3, bits: int = 64):
+        """
+        Initialize the index.
+
+        Args:
+            max_distance: Maximum Hamming distance of near-duplicates
+            bits: Fingerprint size in bits
+        """
+        self.max_distance = max_distance
+        self.bits = bits
+        num_bands = max_distance + 1
+        band_size = -(-bits // num_bands)
+        self._bands: List[Tuple[int, int]] = [
+            (start, (1 << min(band_size, bits - start)) - 1) for start in range(0, bits, band_size)
+        ]
+        self._tables: List[Dict[int, List[Tuple[int, Hashable]]]] = [{} for _ in self._bands]
+        self._count = 0
+
+    def find(self, fingerprint: int) -> Optional[Tuple[Hashable, int]]:
+        """
+        Find a stored near-duplicate of a fingerprint.
+
+        Args:
+            fingerprint: Fingerprint to look up
+
+        Returns:
+            Optional[Tuple[Hashable, int]]: Key and Hamming distance of the closest match, or None
+        """
+        best = None
+        for (start, mask), table in zip(self._bands, self._tables):
+            for candidate, key in table.get(fingerprint >> start & mask, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+        return best
+
+    def add(self, key: Hashable, fingerprint: int) -> None:
+        """
+        Store a fingerprint.
+
+        Args:
+            key: Identifier returned by find() (e.g. the page URL)
+            fingerprint: Fingerprint of the page
+        """
+        for (start, mask), table in zip(self._bands, self._tables):
+            table.setdefault(fingerprint >> start & mask, []).append((fingerprint, key))
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,81 @@
+import gzip
+import re
+import zlib
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple
+
+from defusedxml import ElementTree
+from defusedxml.common import DefusedXmlException
+
+ROBOTS_SITEMAP_PATTERN = re.compile(r'^\s*sitemap\s*:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+
+
+def parse_robots_sitemaps(robots_txt: str) -> List[str]:
+    """
+    Extract the sitemap URLs declared in a robots.txt file.
+
+    Args:
+        robots_txt: Content of robots.txt
+
+    Returns:
+        List[str]: Sitemap URLs in declaration order
+    """
+    return ROBOTS_SITEMAP_PATTERN.findall(robots_txt)
+
+
+def normalize_lastmod(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a sitemap <lastmod> value (W3C datetime) to an ISO 8601 UTC timestamp.
+
+    Args:
+        value: Raw lastmod value, e.g. "2024-05-01" or "2024-05-01T10:00:00+07:00"
+
+    Returns:
+        Optional[str]: Normalized timestamp comparable as a string, or None if missing or unparsable
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(data: bytes) -> Tuple[List[Dict[str, Optional[str]]], List[str]]:
+    """
+    Parse a sitemap or sitemap index (plain or gzip-compressed).
+
+    Args:
+        data: Raw sitemap content
+
+    Returns:
+        Tuple[List[Dict[str, Optional[str]]], List[str]]: Page entries ('loc' and normalized 'lastmod')
+        and the URLs of nested sitemaps (for sitemap indexes)
+    """
+    try:
+        if data[:2] == b'\x1f\x8b':
+            data = gzip.decompress(data)
+        root = ElementTree.fromstring(data)
+    except (OSError, EOFError, zlib.error, ElementTree.ParseError, DefusedXmlException) as e:
+        print(f"⚠️ Invalid sitemap: {e}")
+        return [], []
+
+    entries = []
+    sitemaps = []
+    for element in root:
+        fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+        if not fields.get('loc'):
+            continue
+        if _local_name(element.tag) == 'sitemap':
+            sitemaps.append(fields['loc'])
+        elif _local_name(element.tag) == 'url':
+            entries.append({'loc': fields['loc'], 'lastmod': normalize_lastmod(fields.get('lastmod'))})
+    return entries, sitemaps
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+# Cell children that start a new line (" <br> ") in the markdown cell
+BLOCK_TAGS = {'p', 'div', 'pre', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'dl', 'dt', 'dd', 'figure', 'section'}
+LIST_TAGS = {'ul', 'ol'}
+MAX_SPAN = 1000
+CELL_BREAK = ' <br> '
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace (cells of a markdown table must stay on one line)."""
+    return ' '.join(text.split())
+
+
+def _span(cell: etree._Element, name: str) -> int:
+    """Read a rowspan/colspan attribute, tolerating missing or invalid values."""
+    value = (cell.get(name) or '1').strip()
+    return min(int(value), MAX_SPAN) if value.isdigit() and int(value) > 0 else 1
+
+
+class _CellRenderer:
+    """Renders the content of one table cell to a single markdown line in one walk of its subtree."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.pieces: List[str] = []
+        self.prefix = ''
+
+    def flush(self) -> None:
+        """End the current line (the list marker is only written on the first line of an item)."""
+        text = _normalize(' '.join(self.pieces))
+        if text:
+            self.lines.append(self.prefix + text)
+            self.prefix = ''
+        self.pieces.clear()
+
+    def add_text(self, text: Optional[str]) -> None:
+        if text and not text.isspace():
+            self.pieces.append(text)
+
+    def render_list(self, element: etree._Element) -> None:
+        """Render list items as "- item" lines; nested lists become lines of their own."""
+        self.flush()
+        for item in element:
+            if not isinstance(item.tag, str):
+                continue
+            if item.tag == 'li':
+                self.prefix = '- '
+            self.walk(item)
+            self.flush()
+            self.prefix = ''
+
+    def render_table(self, element: etree._Element) -> None:
+        """Render a nested table one row per line."""
+        self.flush()
+        for row in table_rows(element):
+            cells = [render_cell(cell) for cell in row if isinstance(cell.tag, str) and cell.tag in ('td', 'th')]
+            text = ', '.join(cell for cell in cells if cell)
+            if text:
+                self.lines.append(text)
+
+    def visit(self, element: etree._Element) -> None:
+        """Render one child element followed by its tail text."""
+        tag = element.tag if isinstance(element.tag, str) else None
+        if tag in ('strong', 'b'):
+            text = _normalize(element.text_content())
+            if text:
+                self.pieces.append(f"**{text}**")
+        elif tag == 'code':
+            text = _normalize(element.text_content())
+            if text:
+                self.pieces.append(f"`{text}`")
+        elif tag == 'a':
+            self.pieces.append(f"[{_normalize(element.text_content())}]({element.get('href', '#')})")
+        elif tag == 'img':
+            self.add_text(element.get('alt'))
+        elif tag == 'br':
+            self.flush()
+        elif tag in LIST_TAGS:
+            self.render_list(element)
+        elif tag == 'table':
+            self.render_table(element)
+        elif tag in BLOCK_TAGS:
+            self.flush()
+            self.walk(element)
+            self.flush()
+        elif tag is not None:
+            self.walk(element)
+        self.add_text(element.tail)
+
+    def walk(self, element: etree._Element) -> None:
+        self.add_text(element.text)
+        for child in element:
+            self.visit(child)
+
+
+def render_cell(cell: etree._Element) -> str:
+    """
+    Render a table cell as one markdown line.
+
+    Bold text, inline code and links keep their markdown form, lists become "- item"
+    entries and paragraphs, line breaks and list items are separated by " <br> ".
+
+    Args:
+        cell: <td> or <th> element
+
+    Returns:
+        str: Cell content with "|" escaped
+    """
+    renderer = _CellRenderer()
+    renderer.walk(cell)
+    renderer.flush()
+    return CELL_BREAK.join(renderer.lines).replace('|', '\\|')
+
+
+def table_rows(table: etree._Element) -> List[etree._Element]:
+    """Return the rows of a table in document order, excluding rows of nested tables."""
+    return table.xpath('./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr')
+
+
+def table_grid(table: etree._Element) -> List[List[str]]:
+    """
+    Render the cells of a table into a rectangular grid.
+
+    Cells spanning several rows or columns (rowspan/colspan) are repeated in every
+    position they cover, so each markdown row is self-contained.
+
+    Args:
+        table: <table> element
+
+    Returns:
+        List[List[str]]: Rendered rows, padded to the same width
+    """
+    grid = []
+    pending: Dict[int, Tuple[str, int]] = {}  # column -> (text, rows still covered)
+
+    def take_pending(column: int, row: List[str]) -> None:
+        text, remaining = pending.pop(column)
+        row.append(text)
+        if remaining > 1:
+            pending[column] = (text, remaining - 1)
+
+    for tr in table_rows(table):
+        row: List[str] = []
+        for cell in tr:
+            if not isinstance(cell.tag, str) or cell.tag not in ('td', 'th'):
+                continue
+            while len(row) in pending:
+                take_pending(len(row), row)
+            text = render_cell(cell)
+            rowspan = _span(cell, 'rowspan')
+            for _ in range(_span(cell, 'colspan')):
+                if rowspan > 1:
+                    pending[len(row)] = (text, rowspan - 1)
+                row.append(text)
+        while pending and len(row) <= max(pending):
+            if len(row) in pending:
+                take_pending(len(row), row)
+            else:
+                row.append('')
+        grid.append(row)
+
+    width = max((len(row) for row in grid), default=0)
+    return [row + [''] * (width - len(row)) for row in grid]
+
+
+def html_table_to_markdown(html: str) -> str:
+    """
+    Convert an HTML table to a markdown pipe table with a single parse.
+
+    The first row is used as the header row (GitBook tables with hidden headers
+    get an empty header).
+
+    Args:
+        html: HTML containing a <table> element
+
+    Returns:
+        str: Markdown table, or an empty string if there is no table or it has no cells
+    """
+    if not html or not html.strip():
+        return ""
+    try:
+        fragment = lxml.html.fragment_fromstring(html, create_parent='div')
+    except etree.ParserError:
+        return ""
+    table = fragment.find('.//table')
+    if table is None:
+        return ""
+
+    grid = table_grid(table)
+    if not grid or not grid[0]:
+        return ""
+
+    header_row = "| " + " | ".join(grid[0]) + " |"
+    separator = "| " + " | ".join(["---"] * len(grid[0])) + " |"
+    rows = ["| " + " | ".join(row) + " |" for row in grid[1:]]
+    return "\n".join([header_row, separator] + rows)